@@ -1,13 +1,18 @@
 """Infoblox Adapter for Infoblox integration with SSoT plugin."""
+import asyncio
 import ipaddress
 import re
+from itertools import chain
 
 from diffsync import DiffSync
 from diffsync.enum import DiffSyncFlags
 from nautobot.extras.plugins.exceptions import PluginImproperlyConfigured
+from requests.exceptions import HTTPError
 from nautobot_ssot_infoblox.constant import PLUGIN_CFG
+from nautobot_ssot_infoblox.utils.async_client import AsyncInfobloxApi
 from nautobot_ssot_infoblox.utils.client import get_default_ext_attrs, get_dns_name
 from nautobot_ssot_infoblox.utils.diffsync import get_ext_attr_dict, build_vlan_map
+from nautobot_ssot_infoblox.utils.write_queue import WriteQueue
 from nautobot_ssot_infoblox.diffsync.models.infoblox import (
     InfobloxAggregate,
     InfobloxIPAddress,
@@ -17,6 +22,83 @@ from nautobot_ssot_infoblox.diffsync.models.infoblox import (
 )
 
 
+def fill_default_ext_attrs(models: list, attrs: set):
+    """Add every Extensibility Attribute seen during a paged load to the models that don't define it.
+
+    This produces the same result as building the models with `get_default_ext_attrs` over the full list of records,
+    without having to keep all records in memory before the models can be created.
+
+    Args:
+        models (list): DiffSync models created from the loaded pages.
+        attrs (set): Names of all Extensibility Attributes found on the loaded records.
+    """
+    for model in models:
+        for attr in attrs:
+            model.ext_attrs.setdefault(attr, None)
+
+
+def log_subnet_error(job, err: HTTPError, prefix: str = None):
+    """Warn that the Networks, or those within `prefix`, could not be loaded because Infoblox returned an error.
+
+    Args:
+        job (object): Job to log to.
+        err (HTTPError): Error returned by Infoblox.
+        prefix (str): Network prefix - '10.220.0.0/22'
+    """
+    job.log_warning(
+        message=f"Unable to load Networks{f' within {prefix}' if prefix else ''} from Infoblox. {err.response.text}"
+    )
+
+
+def iter_subnet_pages(job, conn, prefix: str = None):
+    """Iterate over the pages of Networks, or those within `prefix`, ending with a warning if Infoblox returns an error.
+
+    Like `InfobloxApi.get_all_subnets`, an error doesn't abort the load. The Networks of the pages read before it are
+    still loaded.
+
+    Args:
+        job (object): Job to log to.
+        conn (InfobloxApi): Client used to load the data.
+        prefix (str): Network prefix - '10.220.0.0/22'
+    """
+    try:
+        yield from conn.iter_subnets(prefix=prefix)
+    except HTTPError as err:
+        log_subnet_error(job=job, err=err, prefix=prefix)
+
+
+def log_retry_stats(job, conn):
+    """Report the requests that had to be retried because the Infoblox grid master was busy.
+
+    Args:
+        job (object): Job to log to.
+        conn (InfobloxApi): Client used to load the data.
+    """
+    stats = getattr(conn, "retry_stats", {})
+    if stats.get("retries"):
+        job.log_warning(
+            message=f"Retried {stats['retries']} Infoblox requests ({stats['throttled']} throttled, "
+            f"{stats['unavailable']} unavailable, {stats['connection_errors']} connection errors) "
+            f"and waited {stats['wait_seconds']:.1f} seconds.",
+        )
+
+
+def flush_write_queue(job, write_queue):
+    """Send the writes still queued at the end of a sync and report how they were batched.
+
+    Args:
+        job (object): Job to log to.
+        write_queue (WriteQueue): Queue of the adapter that was synced to.
+    """
+    write_queue.flush()
+    stats = write_queue.stats
+    if stats["requests"] or stats["failed"]:
+        job.log_info(
+            message=f"Sent {stats['operations']} changes to Infoblox in {stats['requests']} requests, "
+            f"{stats['failed']} changes failed.",
+        )
+
+
 class InfobloxAdapter(DiffSync):
     """DiffSync adapter using requests to communicate to Infoblox server."""
 
@@ -40,41 +122,65 @@ class InfobloxAdapter(DiffSync):
         self.sync = sync
         self.conn = conn
         self.subnets = []
+        self.subnet_utilization = {}
 
         if self.conn in [None, False]:
             self.job.log_failure(
                 message="Improperly configured settings for communicating to Infoblox. Please validate accuracy."
             )
             raise PluginImproperlyConfigured
+        self.write_queue = WriteQueue(conn=conn, job=job, batch_size=PLUGIN_CFG.get("infoblox_write_batch_size", 100))
+
+    def load_prefixes(self, containers=None, subnets=None):
+        """Load InfobloxNetwork DiffSync model.
 
-    def load_prefixes(self):
-        """Load InfobloxNetwork DiffSync model."""
-        if PLUGIN_CFG.get("import_subnets"):
-            subnets = []
-            for prefix in PLUGIN_CFG["import_subnets"]:
-                subnets.extend(self.conn.get_all_subnets(prefix=prefix))
-            all_networks = subnets
+        Args:
+            containers (iterable): Pages of Network Containers already fetched, fetched from Infoblox if not passed.
+            subnets (iterable): Pages of Networks already fetched, fetched from Infoblox if not passed.
+        """
+        if subnets is not None:
+            containers = containers or []
+        elif PLUGIN_CFG.get("import_subnets"):
+            containers = []
+            subnets = chain.from_iterable(
+                iter_subnet_pages(job=self.job, conn=self.conn, prefix=prefix)
+                for prefix in PLUGIN_CFG["import_subnets"]
+            )
         else:
             # Need to load containers here to prevent duplicates when syncing back to Infoblox
-            containers = self.conn.get_network_containers()
-            subnets = self.conn.get_all_subnets()
-            all_networks = containers + subnets
-        self.subnets = [(x["network"], x["network_view"]) for x in subnets]
-        default_ext_attrs = get_default_ext_attrs(review_list=all_networks)
-        for _pf in all_networks:
-            pf_ext_attrs = get_ext_attr_dict(extattrs=_pf.get("extattrs", {}))
-            new_pf = self.prefix(
-                network=_pf["network"],
-                description=_pf.get("comment", ""),
-                status=_pf.get("status", "active"),
-                ext_attrs={**default_ext_attrs, **pf_ext_attrs},
-                vlans=build_vlan_map(vlans=_pf["vlans"]) if _pf.get("vlans") else {},
-            )
-            self.add(new_pf)
+            containers = self.conn.iter_network_containers()
+            subnets = iter_subnet_pages(job=self.job, conn=self.conn)
+        loaded, ext_attr_names = [], set()
+        for is_subnet, pages in ((False, containers), (True, subnets)):
+            for page in pages:
+                for _pf in page:
+                    if is_subnet:
+                        self.subnets.append((_pf["network"], _pf["network_view"]))
+                        self.subnet_utilization[(_pf["network"], _pf["network_view"])] = _pf.get("utilization")
+                    pf_ext_attrs = get_ext_attr_dict(extattrs=_pf.get("extattrs", {}))
+                    ext_attr_names.update(pf_ext_attrs)
+                    new_pf = self.prefix(
+                        network=_pf["network"],
+                        description=_pf.get("comment", ""),
+                        status=_pf.get("status", "active"),
+                        ext_attrs=pf_ext_attrs,
+                        vlans=build_vlan_map(vlans=_pf["vlans"]) if _pf.get("vlans") else {},
+                    )
+                    self.add(new_pf)
+                    loaded.append(new_pf)
+        fill_default_ext_attrs(models=loaded, attrs=ext_attr_names)
+
+    def load_ipaddresses(self, ipaddrs=None):
+        """Load InfobloxIPAddress DiffSync model.
 
-    def load_ipaddresses(self):
-        """Load InfobloxIPAddress DiffSync model."""
-        ipaddrs = self.conn.get_all_ipv4address_networks(prefixes=self.subnets)
+        Args:
+            ipaddrs (list): IP addresses already fetched, fetched from Infoblox for the loaded subnets if not passed.
+        """
+        if ipaddrs is None:
+            ipaddrs = self.conn.get_all_ipv4address_networks(prefixes=self.subnets, utilization=self.subnet_utilization)
+        if self.job.kwargs.get("debug"):
+            for stat in self.conn.ipv4_batch_stats:
+                self.job.log_debug(message=f"IP Address batch: {stat}")
         default_ext_attrs = get_default_ext_attrs(review_list=ipaddrs)
         for _ip in ipaddrs:
             _, prefix_length = _ip["network"].split("/")
@@ -88,14 +194,20 @@ class InfobloxAdapter(DiffSync):
                 prefix_length=prefix_length,
                 dns_name=dns_name,
                 status=self.conn.get_ipaddr_status(_ip),
-                description=_ip["comment"],
+                description=_ip.get("comment", ""),
                 ext_attrs={**default_ext_attrs, **ip_ext_attrs},
+                ref=self.conn.get_ipaddr_ref(_ip),
             )
             self.add(new_ip)
 
-    def load_vlanviews(self):
-        """Load InfobloxVLANView DiffSync model."""
-        vlanviews = self.conn.get_vlanviews()
+    def load_vlanviews(self, vlanviews=None):
+        """Load InfobloxVLANView DiffSync model.
+
+        Args:
+            vlanviews (list): VLAN Views already fetched, fetched from Infoblox if not passed.
+        """
+        if vlanviews is None:
+            vlanviews = self.conn.get_vlanviews()
         default_ext_attrs = get_default_ext_attrs(review_list=vlanviews)
         for _vv in vlanviews:
             vv_ext_attrs = get_ext_attr_dict(extattrs=_vv.get("extattrs", {}))
@@ -106,48 +218,117 @@ class InfobloxAdapter(DiffSync):
             )
             self.add(new_vv)
 
-    def load_vlans(self):
-        """Load InfobloxVlan DiffSync model."""
-        vlans = self.conn.get_vlans()
-        default_ext_attrs = get_default_ext_attrs(review_list=vlans)
-        for _vlan in vlans:
-            vlan_ext_attrs = get_ext_attr_dict(extattrs=_vlan.get("extattrs", {}))
-            vlan_group = re.search(r"(?:.+\:)(\S+)(?:\/\S+\/.+)", _vlan["_ref"])
-            new_vlan = self.vlan(
-                name=_vlan["name"],
-                vid=_vlan["id"],
-                status=_vlan["status"],
-                vlangroup=vlan_group.group(1) if vlan_group else "",
-                description=_vlan["comment"] if _vlan.get("comment") else "",
-                ext_attrs={**default_ext_attrs, **vlan_ext_attrs},
+    def load_vlans(self, vlans=None):
+        """Load InfobloxVlan DiffSync model.
+
+        Args:
+            vlans (iterable): Pages of VLANs already fetched, fetched from Infoblox if not passed.
+        """
+        loaded, ext_attr_names = [], set()
+        for page in self.conn.iter_vlans() if vlans is None else vlans:
+            for _vlan in page:
+                vlan_ext_attrs = get_ext_attr_dict(extattrs=_vlan.get("extattrs", {}))
+                ext_attr_names.update(vlan_ext_attrs)
+                vlan_group = re.search(r"(?:.+\:)(\S+)(?:\/\S+\/.+)", _vlan["_ref"])
+                new_vlan = self.vlan(
+                    name=_vlan["name"],
+                    vid=_vlan["id"],
+                    status=_vlan["status"],
+                    vlangroup=vlan_group.group(1) if vlan_group else "",
+                    description=_vlan["comment"] if _vlan.get("comment") else "",
+                    ext_attrs=vlan_ext_attrs,
+                )
+                self.add(new_vlan)
+                loaded.append(new_vlan)
+        fill_default_ext_attrs(models=loaded, attrs=ext_attr_names)
+
+    async def fetch_all(self, import_objects: set) -> dict:
+        """Fetch the data of all objects to import from Infoblox concurrently in a single event loop.
+
+        Networks and Network Containers, VLAN Views and VLANs are read at the same time, IP addresses as soon as the
+        Networks they belong to are known.
+
+        Args:
+            import_objects (set): Names of the objects to import, as used in `infoblox_import_objects`.
+
+        Returns:
+            dict: Keyword arguments for each `load_*` method, keyed by object name.
+        """
+        aconn = AsyncInfobloxApi(conn=self.conn)
+
+        async def fetch_subnets(prefix=None):
+            try:
+                return await aconn.get_subnets(prefix=prefix)
+            except HTTPError as err:
+                log_subnet_error(job=self.job, err=err, prefix=prefix)
+                return []
+
+        async def fetch_prefixes():
+            if PLUGIN_CFG.get("import_subnets"):
+                containers = []
+                pages = await asyncio.gather(*[fetch_subnets(prefix=prefix) for prefix in PLUGIN_CFG["import_subnets"]])
+                subnets = list(chain.from_iterable(pages))
+            else:
+                containers, subnets = await asyncio.gather(aconn.get_network_containers(), fetch_subnets())
+            ipaddrs = []
+            if "ip_addresses" in import_objects:
+                ipaddrs = await aconn.get_all_ipv4address_networks(
+                    prefixes=[(_pf["network"], _pf["network_view"]) for _pf in subnets],
+                    utilization={(_pf["network"], _pf["network_view"]): _pf.get("utilization") for _pf in subnets},
+                )
+            return {"containers": [containers], "subnets": [subnets]}, {"ipaddrs": ipaddrs}
+
+        async def fetch_none():
+            return None
+
+        try:
+            prefixes, vlanviews, vlans = await asyncio.gather(
+                fetch_prefixes() if "subnets" in import_objects else fetch_none(),
+                aconn.get_vlanviews() if "vlan_views" in import_objects else fetch_none(),
+                aconn.get_vlans() if "vlans" in import_objects else fetch_none(),
             )
-            self.add(new_vlan)
+        finally:
+            aconn.close()
+        fetched = {}
+        if prefixes is not None:
+            fetched["subnets"], fetched["ip_addresses"] = prefixes
+        elif "ip_addresses" in import_objects:
+            fetched["ip_addresses"] = {"ipaddrs": []}
+        if vlanviews is not None:
+            fetched["vlan_views"] = {"vlanviews": vlanviews}
+        if vlans is not None:
+            fetched["vlans"] = {"vlans": [vlans]}
+        return fetched
 
     def load(self):
         """Load all models by calling other methods."""
         if "infoblox_import_objects" in PLUGIN_CFG:
-            if PLUGIN_CFG["infoblox_import_objects"].get("subnets"):
-                self.load_prefixes()
-            if PLUGIN_CFG["infoblox_import_objects"].get("ip_addresses"):
-                self.load_ipaddresses()
-            if PLUGIN_CFG["infoblox_import_objects"].get("vlan_views"):
-                self.load_vlanviews()
-            if PLUGIN_CFG["infoblox_import_objects"].get("vlans"):
-                self.load_vlans()
+            import_objects = {name for name, enabled in PLUGIN_CFG["infoblox_import_objects"].items() if enabled}
         else:
             self.job.log_info(
                 message="The `infoblox_import_objects` setting was not found so all objects will be imported."
             )
-            self.load_prefixes()
-            self.load_ipaddresses()
-            self.load_vlanviews()
-            self.load_vlans()
+            import_objects = {"subnets", "ip_addresses", "vlan_views", "vlans"}
+        fetched = {}
+        if PLUGIN_CFG.get("infoblox_async_load"):
+            fetched = asyncio.run(self.fetch_all(import_objects))
+        if "subnets" in import_objects:
+            self.load_prefixes(**fetched.get("subnets", {}))
+        if "ip_addresses" in import_objects:
+            self.load_ipaddresses(**fetched.get("ip_addresses", {}))
+        if "vlan_views" in import_objects:
+            self.load_vlanviews(**fetched.get("vlan_views", {}))
+        if "vlans" in import_objects:
+            self.load_vlans(**fetched.get("vlans", {}))
         for obj in ["prefix", "ipaddress", "vlangroup", "vlan"]:
-            if obj in self.dict():
-                self.job.log(message=f"Loaded {len(self.dict()[obj])} {obj} from Infoblox.")
+            loaded = len(self.get_all(obj))
+            if loaded:
+                self.job.log(message=f"Loaded {loaded} {obj} from Infoblox.")
+        log_retry_stats(job=self.job, conn=self.conn)
 
     def sync_complete(self, source, diff, flags=DiffSyncFlags.NONE, logger=None):
-        """Add tags and custom fields to synced objects."""
+        """Send the queued writes to Infoblox and add tags and custom fields to synced objects."""
+        flush_write_queue(job=self.job, write_queue=self.write_queue)
         source.tag_involved_objects(target=self)
 
 
@@ -176,18 +357,27 @@ class InfobloxAggregateAdapter(DiffSync):
                 message="Improperly configured settings for communicating to Infoblox. Please validate accuracy."
             )
             raise PluginImproperlyConfigured
+        self.write_queue = WriteQueue(conn=conn, job=job, batch_size=PLUGIN_CFG.get("infoblox_write_batch_size", 100))
 
     def load(self):
         """Load aggregate models."""
-        containers = self.conn.get_network_containers()
-        default_ext_attrs = get_default_ext_attrs(review_list=containers)
-        for container in containers:
-            network = ipaddress.ip_network(container["network"])
-            container_ext_attrs = get_ext_attr_dict(extattrs=container.get("extattrs", {}))
-            if network.is_private and container["network"] in ["10.0.0.0/8", "172.16.0.0/12", "192.168.0.0/16"]:
-                new_aggregate = self.aggregate(
-                    network=container["network"],
-                    description=container["comment"] if container.get("comment") else "",
-                    ext_attrs={**default_ext_attrs, **container_ext_attrs},
-                )
-                self.add(new_aggregate)
+        loaded, ext_attr_names = [], set()
+        for page in self.conn.iter_network_containers():
+            for container in page:
+                network = ipaddress.ip_network(container["network"])
+                container_ext_attrs = get_ext_attr_dict(extattrs=container.get("extattrs", {}))
+                ext_attr_names.update(container_ext_attrs)
+                if network.is_private and container["network"] in ["10.0.0.0/8", "172.16.0.0/12", "192.168.0.0/16"]:
+                    new_aggregate = self.aggregate(
+                        network=container["network"],
+                        description=container["comment"] if container.get("comment") else "",
+                        ext_attrs=container_ext_attrs,
+                    )
+                    self.add(new_aggregate)
+                    loaded.append(new_aggregate)
+        fill_default_ext_attrs(models=loaded, attrs=ext_attr_names)
+        log_retry_stats(job=self.job, conn=self.conn)
+
+    def sync_complete(self, source, diff, flags=DiffSyncFlags.NONE, logger=None):
+        """Send the queued writes to Infoblox."""
+        flush_write_queue(job=self.job, write_queue=self.write_queue)
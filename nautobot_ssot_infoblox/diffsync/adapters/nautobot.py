@@ -1,15 +1,18 @@
 """Nautobot Adapter for Infoblox integration with SSoT plugin."""
 from collections import defaultdict
+import copy
 import datetime
+from functools import cached_property, partial
 from itertools import chain
 from diffsync import DiffSync
 from diffsync.exceptions import ObjectAlreadyExists, ObjectNotFound
 from django.contrib.contenttypes.models import ContentType
-from nautobot.dcim.models import Site
-from nautobot.extras.choices import CustomFieldTypeChoices
-from nautobot.extras.models import Relationship, Status, Tag, CustomField
-from nautobot.ipam.models import Aggregate, IPAddress, Prefix, Role, VLAN, VLANGroup
-from nautobot.tenancy.models import Tenant
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from nautobot.extras.choices import CustomFieldTypeChoices, ObjectChangeActionChoices
+from nautobot.extras.models import CustomField, RelationshipAssociation, Tag
+from nautobot.ipam.models import Aggregate, IPAddress, Prefix, RIR, VLAN, VLANGroup
 from nautobot_ssot_infoblox.diffsync.models import (
     NautobotAggregate,
     NautobotNetwork,
@@ -17,16 +20,178 @@ from nautobot_ssot_infoblox.diffsync.models import (
     NautobotVlanGroup,
     NautobotVlan,
 )
-from nautobot_ssot_infoblox.constant import TAG_COLOR
-from nautobot_ssot_infoblox.utils.diffsync import nautobot_vlan_status, get_default_custom_fields
-from nautobot_ssot_infoblox.utils.nautobot import build_vlan_map_from_relations, get_prefix_vlans
+from nautobot_ssot_infoblox.constant import PLUGIN_CFG, TAG_COLOR
+from nautobot_ssot_infoblox.utils.diffsync import (
+    create_tag_sync_from_infoblox,
+    get_default_custom_fields,
+    nautobot_vlan_status,
+)
+from nautobot_ssot_infoblox.utils.nautobot import (
+    CustomFieldRegistry,
+    LookupCache,
+    build_vlan_map_from_relations,
+    bulk_add_tag,
+    bulk_record_changes,
+    bulk_set_custom_field,
+    chunked,
+    get_prefix_vlan_map,
+    set_related_objects,
+    write_with_savepoints,
+)
+from nautobot_ssot_infoblox.utils.prefix_index import PrefixIndex
+
+
+# Fields not checked by the clean() of the synced models, changes to them alone are validated without calling it.
+CLEAN_UNCHECKED_FIELDS = {"description", "_custom_field_data", "status", "tenant"}
 
 
-class NautobotMixin:
+class NautobotMixin:  # pylint: disable=too-many-instance-attributes
     """Add specific objects onto Nautobot objects to provide information on sync status with Infoblox."""
 
+    @cached_property
+    def sync_tag(self):
+        """Return the Tag applied to objects created from Infoblox, looked up once per sync."""
+        return create_tag_sync_from_infoblox()
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the LookupCache of the adapter, its maps are exposed as attributes."""
+        super().__init__(*args, **kwargs)
+        self.lookup_cache = LookupCache()
+        maps = self.lookup_cache.maps
+        self.relationship_map = maps["relationship_map"]
+        self.status_map = maps["status_map"]
+        self.site_map = maps["site_map"]
+        self.tenant_map = maps["tenant_map"]
+        self.role_map = maps["role_map"]
+        self.vrf_map = maps["vrf_map"]
+        self.prefix_map = maps["prefix_map"]
+        self.ipaddr_map = maps["ipaddr_map"]
+        self.vlangroup_map = maps["vlangroup_map"]
+        self.vlan_map = maps["vlan_map"]
+
+    def bulk_create_objects(self, model, objects: list, tag=None, prefetch: list = (), **kwargs) -> list:
+        """Insert objects in one transaction per `apply_chunk_size` objects, returning the objects inserted.
+
+        An object failing to insert is skipped with a warning, the rest of its chunk is inserted. The objects inserted
+        are tagged with `tag`, then their creation is logged.
+
+        Args:
+            model (Model): Model of the objects.
+            objects (list): Unsaved objects to insert.
+            tag (Tag): Tag applied to the objects inserted, if any.
+            prefetch (list): Relations read to log the creation of the objects, see `bulk_record_changes`.
+            kwargs (dict): Keyword arguments of `bulk_create`, e.g. `batch_size`.
+        """
+        created = []
+        for chunk in chunked(objects, self.apply_chunk_size):
+            with transaction.atomic():
+                failed = write_with_savepoints(partial(model.objects.bulk_create, **kwargs), chunk)
+                failed_ids = {obj.id for obj, _ in failed}
+                inserted = [obj for obj in chunk if obj.id not in failed_ids]
+                if tag is not None:
+                    bulk_add_tag(model, [obj.id for obj in inserted], tag)
+                bulk_record_changes(inserted, ObjectChangeActionChoices.ACTION_CREATE, prefetch=prefetch)
+            for obj, err in failed:
+                self.job.log_warning(message=f"Unable to create {model._meta.verbose_name} {obj}. {err}")
+            created.extend(inserted)
+        return created
+
+    def queue_update(self, queryset, obj, attrs: dict):
+        """Queue the update of a Nautobot object, saved along with the others of its model by `bulk_update_objects`.
+
+        Args:
+            queryset (QuerySet): QuerySet the objects of the model are fetched from.
+            obj (DiffSyncModel): DiffSync model updated, applying `attrs` to its Nautobot object in `update_object`.
+            attrs (dict): Attributes to update.
+        """
+        self.objects_to_update.setdefault(queryset.model, (queryset, []))[1].append((obj, attrs))
+
+    def bulk_update_objects(self):
+        """Fetch, update, validate and save the queued updates with a few queries per chunk of objects.
+
+        Every chunk of `apply_chunk_size` objects is saved in one transaction. Only the fields changed are validated
+        and saved, see `validate_update`, then their changes are logged. Objects failing validation or to save are
+        skipped with a warning.
+        """
+        for model, (queryset, updates) in self.objects_to_update.items():
+            self.job.log_info(message=f"Performing bulk update of {len(updates)} {model._meta.verbose_name_plural}.")
+            for batch in chunked(updates, self.apply_chunk_size):
+                with transaction.atomic():
+                    self.bulk_update_batch(model, queryset, batch)
+        self.objects_to_update.clear()
+
+    def bulk_update_batch(self, model, queryset, batch: list):  # pylint: disable=too-many-locals
+        """Apply, validate and save a chunk of the queued updates of a model, see `bulk_update_objects`."""
+        fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+        auto_now = [field.name for field in fields if getattr(field, "auto_now", False)]
+        instances = queryset.in_bulk([obj.pk for obj, _ in batch])
+        changes, updated_fields = [], set()
+        for obj, attrs in batch:
+            instance = instances.get(obj.pk)
+            if instance is None:
+                self.job.log_warning(message=f"Unable to find {model._meta.verbose_name} {obj} to update.")
+                continue
+            before = {field.name: copy.copy(getattr(instance, field.attname)) for field in fields}
+            obj.update_object(instance, attrs)
+            changed = [field.name for field in fields if getattr(instance, field.attname) != before[field.name]]
+            if changed:
+                changes.append((instance, changed, before.get("_custom_field_data", {})))
+                updated_fields.update(changed)
+        # Objects related by the foreign keys changed are fetched once for the chunk, for validation and change logging.
+        set_related_objects([instance for instance, _, _ in changes], updated_fields)
+        updated = []
+        for instance, changed, custom_field_data in changes:
+            try:
+                self.validate_update(instance, changed, custom_field_data)
+            except ValidationError as err:
+                self.job.log_warning(message=f"Unable to update {model._meta.verbose_name} {instance}. {err}")
+                continue
+            updated.append(instance)
+        if updated:
+            now = timezone.now()
+            for instance in updated:
+                for name in auto_now:
+                    setattr(instance, name, now)
+            failed = write_with_savepoints(
+                partial(model.objects.bulk_update, fields=[*updated_fields, *auto_now]), updated
+            )
+            for instance, err in failed:
+                self.job.log_warning(message=f"Unable to update {model._meta.verbose_name} {instance}. {err}")
+            failed_ids = {instance.pk for instance, _ in failed}
+            bulk_record_changes(
+                [instance for instance in updated if instance.pk not in failed_ids],
+                ObjectChangeActionChoices.ACTION_UPDATE,
+            )
+
+    def validate_update(self, instance, changed: list, custom_field_data: dict):
+        """Validate the fields changed on an object as `validated_save()` does, without a query per object if possible.
+
+        Related objects are set from the lookup maps loaded from the database, so their existence isn't checked again.
+        The model's `clean()` only runs when fields other than `CLEAN_UNCHECKED_FIELDS` changed, otherwise the Custom
+        Field values changed are validated against the `CustomFieldRegistry`.
+
+        Args:
+            instance (Model): Updated object.
+            changed (list): Names of the fields changed.
+            custom_field_data (dict): Custom Field data of the object before the update.
+
+        Raises:
+            ValidationError: A changed value is invalid.
+        """
+        unchanged = [field.name for field in instance._meta.concrete_fields if field.name not in changed]
+        instance.clean_fields(exclude=unchanged + [field.name for field in instance._meta.fields if field.is_relation])
+        if not CLEAN_UNCHECKED_FIELDS.issuperset(changed):
+            instance.clean()
+        elif "_custom_field_data" in changed:
+            names = [name for name, value in instance.custom_field_data.items() if custom_field_data.get(name) != value]
+            self.custom_field_registry.clean(instance, names=names)
+        instance.validate_unique(exclude=unchanged)
+
     def tag_involved_objects(self, target):
-        """Tag all objects that were successfully synced to the target."""
+        """Tag all objects that were successfully synced to the target.
+
+        The tag and sync date are written in bulk, objects already tagged and stamped with today's date are skipped.
+        """
         # The ssot-synced-to-infoblox tag *should* have been created automatically during plugin installation
         # (see nautobot_ssot_infoblox/signals.py) but maybe a user deleted it inadvertently, so be safe:
         tag, _ = Tag.objects.get_or_create(
@@ -45,39 +210,21 @@ class NautobotMixin:
                 "label": "Last synced to Infoblox on",
             },
         )
-        for model in [Aggregate, IPAddress, Prefix]:
-            custom_field.content_types.add(ContentType.objects.get_for_model(model))
+        custom_field.content_types.add(*ContentType.objects.get_for_models(Aggregate, IPAddress, Prefix).values())
 
-        for modelname in ["ipaddress", "prefix"]:
+        today = datetime.date.today().isoformat()
+        for modelname, model in [("ipaddress", IPAddress), ("prefix", Prefix)]:
+            pks = []
             for local_instance in self.get_all(modelname):
-                unique_id = local_instance.get_unique_id()
                 # Verify that the object now has a counterpart in the target DiffSync
                 try:
-                    target.get(modelname, unique_id)
+                    target.get(modelname, local_instance.get_unique_id())
                 except ObjectNotFound:
                     continue
+                pks.append(local_instance.pk)
 
-                self.tag_object(modelname, unique_id, tag, custom_field)
-
-    def tag_object(self, modelname, unique_id, tag, custom_field):
-        """Apply the given tag and custom field to the identified object."""
-        model_instance = self.get(modelname, unique_id)
-        today = datetime.date.today().isoformat()
-
-        def _tag_object(nautobot_object):
-            """Apply custom field and tag to object, if applicable."""
-            if hasattr(nautobot_object, "tags"):
-                nautobot_object.tags.add(tag)
-            if hasattr(nautobot_object, "cf"):
-                nautobot_object.cf[custom_field.name] = today
-            nautobot_object.validated_save()
-
-        if modelname == "aggregate":
-            _tag_object(Aggregate.objects.get(pk=model_instance.pk))
-        elif modelname == "ipaddress":
-            _tag_object(IPAddress.objects.get(pk=model_instance.pk))
-        elif modelname == "prefix":
-            _tag_object(Prefix.objects.get(pk=model_instance.pk))
+            bulk_add_tag(model, pks, tag)
+            bulk_set_custom_field(model, pks, custom_field.name, today)
 
 
 class NautobotAdapter(NautobotMixin, DiffSync):  # pylint: disable=too-many-instance-attributes
@@ -90,17 +237,6 @@ class NautobotAdapter(NautobotMixin, DiffSync):  # pylint: disable=too-many-inst
 
     top_level = ["vlangroup", "vlan", "prefix", "ipaddress"]
 
-    status_map = {}
-    site_map = {}
-    relationship_map = {}
-    tenant_map = {}
-    vrf_map = {}
-    prefix_map = {}
-    role_map = {}
-    ipaddr_map = {}
-    vlan_map = {}
-    vlangroup_map = {}
-
     def __init__(self, *args, job=None, sync=None, **kwargs):
         """Initialize Nautobot.
 
@@ -112,35 +248,75 @@ class NautobotAdapter(NautobotMixin, DiffSync):  # pylint: disable=too-many-inst
         self.job = job
         self.sync = sync
         self.objects_to_create = defaultdict(list)
+        self.objects_to_update = {}
+        self.prefix_index = PrefixIndex()
+        self.chunk_size = PLUGIN_CFG.get("nautobot_load_chunk_size", 2000)
+        self.apply_chunk_size = PLUGIN_CFG.get("nautobot_apply_chunk_size", 1000)
+        self.custom_field_registry = CustomFieldRegistry()
 
     def sync_complete(self, source: DiffSync, *args, **kwargs):
         """Process object creations/updates using bulk operations.
 
+        Created VLANs, Prefixes and IP Addresses are tagged as synced from Infoblox with one insert per chunk once
+        they exist. Prefix -> VLAN Relationship Associations are inserted once their Prefixes exist. Updates are saved
+        last, so Prefixes can be related to VLANs created by this sync. The lookup maps are released afterwards.
+
+        Objects are written in one transaction per `nautobot_apply_chunk_size` objects, an object failing to save is
+        skipped with a warning without rolling back the rest of its chunk.
+
         Args:
             source (DiffSync): Source DiffSync adapter data.
         """
         if len(self.objects_to_create["vlangroups"]) > 0:
             self.job.log_info(message="Performing bulk create of VLAN Groups in Nautobot")
-            VLANGroup.objects.bulk_create(self.objects_to_create["vlangroups"], batch_size=250)
+            self.bulk_create_objects(VLANGroup, self.objects_to_create["vlangroups"], batch_size=250)
         if len(self.objects_to_create["vlans"]) > 0:
             self.job.log_info(message="Performing bulk create of VLANs in Nautobot.")
-            VLAN.objects.bulk_create(self.objects_to_create["vlans"], batch_size=500)
+            self.bulk_create_objects(VLAN, self.objects_to_create["vlans"], tag=self.sync_tag, batch_size=500)
         if len(self.objects_to_create["prefixes"]) > 0:
             self.job.log_info(message="Performing bulk create of Prefixes in Nautobot")
-            Prefix.objects.bulk_create(self.objects_to_create["prefixes"], batch_size=500)
+            prefixes = self.bulk_create_objects(
+                Prefix, self.objects_to_create["prefixes"], tag=self.sync_tag, batch_size=500
+            )
+            created = {prefix.id for prefix in prefixes}
+            prefix_vlans = [assoc for assoc in self.objects_to_create["prefix_vlans"] if assoc.source_id in created]
+            if prefix_vlans:
+                self.job.log_info(message="Performing bulk create of Prefix -> VLAN Relationships in Nautobot")
+                self.bulk_create_objects(RelationshipAssociation, prefix_vlans, batch_size=1000, ignore_conflicts=True)
         if len(self.objects_to_create["ipaddrs"]) > 0:
             self.job.log_info(message="Performing bulk create of IP Addresses in Nautobot")
-            IPAddress.objects.bulk_create(self.objects_to_create["ipaddrs"], batch_size=1000)
+            self.bulk_create_objects(
+                IPAddress,
+                self.objects_to_create["ipaddrs"],
+                tag=self.sync_tag,
+                prefetch=["nat_outside_list"],
+                batch_size=1000,
+            )
+        self.bulk_update_objects()
+        self.objects_to_create.clear()
+        self.lookup_cache.clear()
+        self.prefix_index = PrefixIndex()
 
     def load_prefixes(self):
         """Load Prefixes from Nautobot."""
-        all_prefixes = list(chain(Prefix.objects.all(), Aggregate.objects.all()))
+        all_prefixes = chain(
+            Prefix.objects.select_related("status")
+            .only("id", "network", "prefix_length", "description", "status__slug", "_custom_field_data")
+            .iterator(chunk_size=self.chunk_size),
+            Aggregate.objects.only("id", "network", "prefix_length", "description", "_custom_field_data").iterator(
+                chunk_size=self.chunk_size
+            ),
+        )
         default_cfs = get_default_custom_fields(cf_contenttype=ContentType.objects.get_for_model(Prefix))
+        prefix_vlans = get_prefix_vlan_map()
         for prefix in all_prefixes:
             self.prefix_map[str(prefix.prefix)] = prefix.id
+            if isinstance(prefix, Prefix):
+                # Indexed to find the parent Prefix of IP addresses in load_ipaddresses
+                self.prefix_index.add(str(prefix.prefix), (str(prefix), prefix.prefix_length, prefix.status.slug))
             if "ssot-synced-to-infoblox" in prefix.custom_field_data:
                 prefix.custom_field_data.pop("ssot-synced-to-infoblox")
-            current_vlans = get_prefix_vlans(prefix=prefix)
+            current_vlans = prefix_vlans.get(prefix.id, [])
             _prefix = self.prefix(
                 network=str(prefix.prefix),
                 description=prefix.description,
@@ -155,23 +331,29 @@ class NautobotAdapter(NautobotMixin, DiffSync):  # pylint: disable=too-many-inst
                 self.job.log_warning(_prefix, message=f"Found duplicate prefix: {prefix.prefix}.")
 
     def load_ipaddresses(self):
-        """Load IP Addresses from Nautobot."""
+        """Load IP Addresses from Nautobot, their parent Prefix is found among the Prefixes loaded by load_prefixes."""
         default_cfs = get_default_custom_fields(cf_contenttype=ContentType.objects.get_for_model(IPAddress))
-        for ipaddr in IPAddress.objects.all():
+        ipaddrs = (
+            IPAddress.objects.select_related("status")
+            .only("id", "host", "prefix_length", "dns_name", "description", "status__name", "_custom_field_data")
+            .iterator(chunk_size=self.chunk_size)
+        )
+        for ipaddr in ipaddrs:
             self.ipaddr_map[str(ipaddr.address)] = ipaddr.id
             addr = ipaddr.host
-            # the last Prefix is the most specific and is assumed the one the IP address resides in
-            prefix = Prefix.objects.net_contains(addr).last()
+            # the most specific Prefix loaded is assumed the one the IP address resides in
+            parent = self.prefix_index.longest_match(addr)
 
             # The IP address must have a parent prefix
-            if not prefix:
+            if not parent:
                 self.job.log_warning(
                     ipaddr, message=f"IP Address {addr} does not have a parent prefix and will not be synced."
                 )
                 continue
+            prefix, prefix_length, prefix_status = parent
             # IP address must be part of a prefix that is not a container
             # This means the IP cannot be associated with an IPv4 Network within Infoblox
-            if prefix.status.slug == "container":
+            if prefix_status == "container":
                 self.job.log_warning(
                     ipaddr,
                     message=f"IP Address {addr}'s parent prefix is a container. The parent prefix status must not be 'container'.",
@@ -182,9 +364,9 @@ class NautobotAdapter(NautobotMixin, DiffSync):  # pylint: disable=too-many-inst
                 ipaddr.custom_field_data.pop("ssot-synced-to-infoblox")
             _ip = self.ipaddress(
                 address=addr,
-                prefix=str(prefix),
+                prefix=prefix,
                 status=ipaddr.status.name if ipaddr.status else None,
-                prefix_length=prefix.prefix_length if prefix else ipaddr.prefix_length,
+                prefix_length=prefix_length,
                 dns_name=ipaddr.dns_name,
                 description=ipaddr.description,
                 ext_attrs={**default_cfs, **ipaddr.custom_field_data},
@@ -198,7 +380,10 @@ class NautobotAdapter(NautobotMixin, DiffSync):  # pylint: disable=too-many-inst
     def load_vlangroups(self):
         """Load VLAN Groups from Nautobot."""
         default_cfs = get_default_custom_fields(cf_contenttype=ContentType.objects.get_for_model(VLANGroup))
-        for grp in VLANGroup.objects.all():
+        groups = VLANGroup.objects.only("id", "name", "description", "_custom_field_data").iterator(
+            chunk_size=self.chunk_size
+        )
+        for grp in groups:
             self.vlangroup_map[grp.name] = grp.id
             if "ssot-synced-to-infoblox" in grp.custom_field_data:
                 grp.custom_field_data.pop("ssot-synced-to-infoblox")
@@ -215,7 +400,13 @@ class NautobotAdapter(NautobotMixin, DiffSync):  # pylint: disable=too-many-inst
         default_cfs = get_default_custom_fields(cf_contenttype=ContentType.objects.get_for_model(VLAN))
         # To ensure we are only dealing with VLANs imported from Infoblox we need to filter to those with a
         # VLAN Group assigned to match how Infoblox requires a VLAN View to be associated to VLANs.
-        for vlan in VLAN.objects.filter(group__isnull=False):
+        vlans = (
+            VLAN.objects.filter(group__isnull=False)
+            .select_related("group", "status")
+            .only("id", "vid", "name", "description", "group__name", "status__name", "_custom_field_data")
+            .iterator(chunk_size=self.chunk_size)
+        )
+        for vlan in vlans:
             if vlan.group.name not in self.vlan_map:
                 self.vlan_map[vlan.group.name] = {}
             self.vlan_map[vlan.group.name][vlan.vid] = vlan.id
@@ -234,23 +425,19 @@ class NautobotAdapter(NautobotMixin, DiffSync):  # pylint: disable=too-many-inst
 
     def load(self):
         """Load models with data from Nautobot."""
-        self.relationship_map = {r.name: r.id for r in Relationship.objects.only("id", "name")}
-        self.status_map = {s.slug: s.id for s in Status.objects.only("id", "slug")}
-        self.site_map = {s.name: s.id for s in Site.objects.only("id", "name")}
-        self.tenant_map = {t.name: t.id for t in Tenant.objects.only("id", "name")}
-        self.role_map = {r.name: r.id for r in Role.objects.only("id", "name")}
+        self.lookup_cache.load()
         self.load_prefixes()
-        if "prefix" in self.dict():
-            self.job.log(message=f"Loaded {len(self.dict()['prefix'])} prefixes from Nautobot.")
+        if self.get_all("prefix"):
+            self.job.log(message=f"Loaded {len(self.get_all('prefix'))} prefixes from Nautobot.")
         self.load_ipaddresses()
-        if "ipaddress" in self.dict():
-            self.job.log(message=f"Loaded {len(self.dict()['ipaddress'])} IP addresses from Nautobot.")
+        if self.get_all("ipaddress"):
+            self.job.log(message=f"Loaded {len(self.get_all('ipaddress'))} IP addresses from Nautobot.")
         self.load_vlangroups()
-        if "vlangroup" in self.dict():
-            self.job.log(message=f"Loaded {len(self.dict()['vlangroup'])} VLAN Groups from Nautobot.")
+        if self.get_all("vlangroup"):
+            self.job.log(message=f"Loaded {len(self.get_all('vlangroup'))} VLAN Groups from Nautobot.")
         self.load_vlans()
-        if "vlan" in self.dict():
-            self.job.log(message=f"Loaded {len(self.dict()['vlan'])} VLANs from Nautobot.")
+        if self.get_all("vlan"):
+            self.job.log(message=f"Loaded {len(self.get_all('vlan'))} VLANs from Nautobot.")
 
 
 class NautobotAggregateAdapter(NautobotMixin, DiffSync):
@@ -270,12 +457,74 @@ class NautobotAggregateAdapter(NautobotMixin, DiffSync):
         super().__init__(*args, **kwargs)
         self.job = job
         self.sync = sync
+        self.objects_to_create = defaultdict(list)
+        self.objects_to_update = {}
+        self.chunk_size = PLUGIN_CFG.get("nautobot_load_chunk_size", 2000)
+        self.apply_chunk_size = PLUGIN_CFG.get("nautobot_apply_chunk_size", 1000)
+        self.custom_field_registry = CustomFieldRegistry()
+
+    @cached_property
+    def rir(self):
+        """Return the RIR of Aggregates created from Infoblox, looked up once per sync."""
+        rir, _ = RIR.objects.get_or_create(name="RFC1918", slug="rfc1918", is_private=True)
+        return rir
+
+    def clean_aggregates(self, aggregates: list) -> list:
+        """Validate Aggregates to create like their full_clean(), returning the valid ones.
+
+        The Aggregates are checked for overlaps against the existing ones, fetched with one query, and each other
+        instead of with two queries each. An invalid Aggregate is skipped with a warning.
+
+        Args:
+            aggregates (list): Unsaved Aggregates to validate.
+        """
+        networks = [aggregate.prefix for aggregate in Aggregate.objects.only("network", "prefix_length")]
+        valid = []
+        for aggregate in aggregates:
+            try:
+                aggregate.clean_fields(exclude=[field.name for field in aggregate._meta.fields if field.is_relation])
+                self.custom_field_registry.clean(aggregate, names=list(aggregate.custom_field_data))
+                aggregate.prefix = aggregate.prefix.cidr
+                if aggregate.prefix.prefixlen == 0:
+                    raise ValidationError({"prefix": "Cannot create aggregate with /0 mask."})
+                for network in networks:
+                    if aggregate.prefix in network or network in aggregate.prefix:
+                        raise ValidationError(
+                            {"prefix": f"Aggregates cannot overlap. {aggregate.prefix} overlaps {network}."}
+                        )
+            except ValidationError as err:
+                self.job.log_warning(message=f"Unable to create aggregate {aggregate}. {err}")
+                continue
+            networks.append(aggregate.prefix)
+            valid.append(aggregate)
+        return valid
+
+    def sync_complete(self, source: DiffSync, *args, **kwargs):
+        """Save the created and updated Aggregates in bulk, then release the lookup maps.
+
+        Created Aggregates are validated by `clean_aggregates` then tagged as synced from Infoblox.
+
+        Args:
+            source (DiffSync): Source DiffSync adapter data.
+        """
+        if len(self.objects_to_create["aggregates"]) > 0:
+            self.job.log_info(message="Performing bulk create of Aggregates in Nautobot.")
+            aggregates = self.clean_aggregates(self.objects_to_create["aggregates"])
+            self.bulk_create_objects(Aggregate, aggregates, tag=self.sync_tag, batch_size=500)
+        self.bulk_update_objects()
+        self.objects_to_create.clear()
+        self.lookup_cache.clear()
 
     def load(self):
         """Load aggregate models from Nautobot."""
-        for aggregate in Aggregate.objects.all():
+        # Tenant is the only object linked to Aggregates from their Extensibility Attributes.
+        self.lookup_cache.load(names=["tenant_map"])
+        aggregates = Aggregate.objects.only(
+            "id", "network", "prefix_length", "description", "tenant_id", "_custom_field_data"
+        ).iterator(chunk_size=self.chunk_size)
+        for aggregate in aggregates:
             # Reset CustomFields for Nautobot objects to blank if they failed to get linked originally.
-            if aggregate.tenant is None:
+            if aggregate.tenant_id is None:
                 aggregate.custom_field_data["tenant"] = ""
 
             _aggregate = self.aggregate(
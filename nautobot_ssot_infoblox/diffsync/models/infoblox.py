@@ -1,5 +1,6 @@
 """Infoblox Models for Infoblox integration with SSoT plugin."""
-from requests.exceptions import HTTPError
+from typing import Optional
+
 from nautobot_ssot_infoblox.diffsync.models.base import Aggregate, Network, IPAddress, Vlan, VlanView
 
 
@@ -9,20 +10,21 @@ class InfobloxNetwork(Network):
     @classmethod
     def create(cls, diffsync, ids, attrs):
         """Create Network object in Infoblox."""
-        status = attrs.get("status")
-        try:
-            if status != "container":
-                diffsync.conn.create_network(prefix=ids["network"], comment=attrs.get("description", ""))
-            else:
-                diffsync.conn.create_network_container(prefix=ids["network"], comment=attrs.get("description", ""))
-        except HTTPError as err:
-            diffsync.job.log_warning(f"Failed to create {ids['network']} due to {err.response.text}")
+        network_type = "networkcontainer" if attrs.get("status") == "container" else "network"
+        diffsync.write_queue.add(
+            item=diffsync.conn.network_request(
+                "POST", prefix=ids["network"], comment=attrs.get("description", ""), network_type=network_type
+            ),
+            label=f"create {ids['network']}",
+        )
         return super().create(ids=ids, diffsync=diffsync, attrs=attrs)
 
     def update(self, attrs):
         """Update Network object in Infoblox."""
-        self.diffsync.conn.update_network(
-            prefix=self.get_identifiers()["network"], comment=attrs.get("description", "")
+        prefix = self.get_identifiers()["network"]
+        self.diffsync.write_queue.add(
+            item=self.diffsync.conn.network_request("PUT", prefix=prefix, comment=attrs.get("description", "")),
+            label=f"update {prefix}",
         )
         return super().update(attrs)
 
@@ -60,6 +62,8 @@ class InfobloxVLAN(Vlan):
 class InfobloxIPAddress(IPAddress):
     """Infoblox implementation of the VLAN Model."""
 
+    ref: Optional[str] = None
+
     @classmethod
     def create(cls, diffsync, ids, attrs):
         """Create either a host record or fixed address (Not implemented).
@@ -67,7 +71,10 @@ class InfobloxIPAddress(IPAddress):
         This requires the IP Address to either have a DNS name
         """
         if attrs["dns_name"]:
-            diffsync.conn.create_host_record(attrs["dns_name"], ids["address"])
+            diffsync.write_queue.add(
+                item=diffsync.conn.host_record_request(attrs["dns_name"], ids["address"]),
+                label=f"create host record {attrs['dns_name']} for {ids['address']}",
+            )
         return super().create(ids=ids, diffsync=diffsync, attrs=attrs)
 
     def update(self, attrs):
@@ -78,7 +85,11 @@ class InfobloxIPAddress(IPAddress):
         if attrs.get("dns_name"):
             json.update({"name": attrs["dns_name"]})
         if json:
-            self.diffsync.conn.update_ipaddress(ip_address=self.get_identifiers()["address"], data=json)
+            address = self.get_identifiers()["address"]
+            self.diffsync.write_queue.add(
+                item=self.diffsync.conn.ipaddress_request(ip_address=address, data=json, ref=self.ref),
+                label=f"update IP address {address}",
+            )
         return super().update(attrs)
 
     # def delete(self):
@@ -93,19 +104,36 @@ class InfobloxAggregate(Aggregate):
     @classmethod
     def create(cls, diffsync, ids, attrs):
         """Create Network Container object in Infoblox."""
-        diffsync.conn.create_network_container(
-            prefix=ids["network"], comment=attrs["description"] if attrs.get("description") else ""
+        diffsync.write_queue.add(
+            item=diffsync.conn.network_request(
+                "POST",
+                prefix=ids["network"],
+                comment=attrs["description"] if attrs.get("description") else "",
+                network_type="networkcontainer",
+            ),
+            label=f"create {ids['network']}",
         )
         return super().create(ids=ids, diffsync=diffsync, attrs=attrs)
 
     def update(self, attrs):
         """Update Network Container object in Infoblox."""
-        self.diffsync.conn.update_network_container(
-            prefix=self.get_identifiers()["network"], comment=attrs["description"] if attrs.get("description") else ""
+        prefix = self.get_identifiers()["network"]
+        self.diffsync.write_queue.add(
+            item=self.diffsync.conn.network_request(
+                "PUT",
+                prefix=prefix,
+                comment=attrs["description"] if attrs.get("description") else "",
+                network_type="networkcontainer",
+            ),
+            label=f"update {prefix}",
         )
         return super().update(attrs)
 
     def delete(self):
         """Delete Network Container object in Infoblox."""
-        self.diffsync.conn.delete_network_container(self.get_identifiers()["network"])
+        prefix = self.get_identifiers()["network"]
+        self.diffsync.write_queue.add(
+            item=self.diffsync.conn.network_request("DELETE", prefix=prefix, network_type="networkcontainer"),
+            label=f"delete {prefix}",
+        )
         return super().delete()
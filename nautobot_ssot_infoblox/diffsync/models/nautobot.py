@@ -2,12 +2,10 @@
 import ipaddress
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
 from django.utils.text import slugify
-from nautobot.extras.choices import CustomFieldTypeChoices
 from nautobot.extras.models import RelationshipAssociation as OrmRelationshipAssociation
-from nautobot.extras.models import CustomField as OrmCF
 from nautobot.ipam.choices import IPAddressRoleChoices
-from nautobot.ipam.models import RIR
 from nautobot.ipam.models import Aggregate as OrmAggregate
 from nautobot.ipam.models import IPAddress as OrmIPAddress
 from nautobot.ipam.models import Prefix as OrmPrefix
@@ -15,10 +13,28 @@ from nautobot.ipam.models import VLAN as OrmVlan
 from nautobot.ipam.models import VLANGroup as OrmVlanGroup
 from nautobot_ssot_infoblox.constant import PLUGIN_CFG
 from nautobot_ssot_infoblox.diffsync.models.base import Aggregate, Network, IPAddress, Vlan, VlanView
-from nautobot_ssot_infoblox.utils.diffsync import create_tag_sync_from_infoblox
 from nautobot_ssot_infoblox.utils.nautobot import get_prefix_vlans
 
 
+def set_custom_fields(diffsync, obj: object, extattrs: dict):
+    """Store Extensibility Attributes as the values of Custom Fields of the same name, ensuring those exist.
+
+    Args:
+        diffsync (object): DiffSync Job
+        obj (object): The object that's being created or updated and needs processing.
+        extattrs (dict): The Extensibility Attributes to be stored in the Custom Fields of passed `obj`.
+    """
+    names = [attr for attr, attr_value in extattrs.items() if attr_value]
+    custom_fields = diffsync.custom_field_registry.ensure(names=names, model=type(obj))
+    for attr in names:
+        if attr in custom_fields:
+            obj.custom_field_data.update({attr: str(extattrs[attr])})
+        else:
+            diffsync.job.log_warning(
+                message=f"Unable to create Custom Field {attr} for {obj} found in Extensibility Attributes, its slug is already used."
+            )
+
+
 def process_ext_attrs(diffsync, obj: object, extattrs: dict):
     """Process Extensibility Attributes into Custom Fields or link to found objects.
 
@@ -38,7 +54,7 @@ def process_ext_attrs(diffsync, obj: object, extattrs: dict):
                     )
             if attr.lower() == "vrf":
                 try:
-                    obj.vrf = diffsync.vrf_map[attr_value]
+                    obj.vrf_id = diffsync.vrf_map[attr_value]
                 except KeyError as err:
                     diffsync.job.log_warning(
                         message=f"Unable to find VRF {attr_value} for {obj} found in Extensibility Attributes '{attr}'. {err}"
@@ -48,7 +64,7 @@ def process_ext_attrs(diffsync, obj: object, extattrs: dict):
                     obj.role = attr_value.lower()
                 else:
                     try:
-                        obj.role = diffsync.role_map[attr_value]
+                        obj.role_id = diffsync.role_map[attr_value]
                     except KeyError as err:
                         diffsync.job.log_warning(
                             message=f"Unable to find Role {attr_value} for {obj} found in Extensibility Attributes '{attr}'. {err}"
@@ -56,20 +72,12 @@ def process_ext_attrs(diffsync, obj: object, extattrs: dict):
 
             if attr.lower() in ["tenant", "dept", "department"]:
                 try:
-                    obj.tenant = diffsync.tenant_map[attr_value]
+                    obj.tenant_id = diffsync.tenant_map[attr_value]
                 except KeyError as err:
                     diffsync.job.log_warning(
                         message=f"Unable to find Tenant {attr_value} for {obj} found in Extensibility Attributes '{attr}'. {err}"
                     )
-            _cf_dict = {
-                "name": attr,
-                "slug": slugify(attr),
-                "type": CustomFieldTypeChoices.TYPE_TEXT,
-                "label": attr,
-            }
-            field, _ = OrmCF.objects.get_or_create(name=_cf_dict["name"], defaults=_cf_dict)
-            field.content_types.add(ContentType.objects.get_for_model(type(obj)).id)
-            obj.custom_field_data.update({_cf_dict["name"]: str(attr_value)})
+    set_custom_fields(diffsync, obj, extattrs)
 
 
 class NautobotNetwork(Network):
@@ -90,6 +98,8 @@ class NautobotNetwork(Network):
         )
         if attrs.get("vlans"):
             relation = diffsync.relationship_map["Prefix -> VLAN"]
+            prefix_type = ContentType.objects.get_for_model(OrmPrefix)
+            vlan_type = ContentType.objects.get_for_model(OrmVlan)
             for _, _vlan in attrs["vlans"].items():
                 index = 0
                 try:
@@ -97,12 +107,14 @@ class NautobotNetwork(Network):
                     if found_vlan:
                         if index == 0:
                             _prefix.vlan_id = found_vlan
-                        OrmRelationshipAssociation.objects.get_or_create(
-                            relationship_id=relation,
-                            source_type=ContentType.objects.get_for_model(OrmPrefix),
-                            source_id=_prefix.id,
-                            destination_type=ContentType.objects.get_for_model(OrmVlan),
-                            destination_id=found_vlan,
+                        diffsync.objects_to_create["prefix_vlans"].append(
+                            OrmRelationshipAssociation(
+                                relationship_id=relation,
+                                source_type=prefix_type,
+                                source_id=_prefix.id,
+                                destination_type=vlan_type,
+                                destination_id=found_vlan,
+                            )
                         )
                     index += 1
                 except KeyError as err:
@@ -112,14 +124,20 @@ class NautobotNetwork(Network):
 
         if attrs.get("ext_attrs"):
             process_ext_attrs(diffsync=diffsync, obj=_prefix, extattrs=attrs["ext_attrs"])
-        _prefix.tags.add(create_tag_sync_from_infoblox())
         diffsync.objects_to_create["prefixes"].append(_prefix)
         diffsync.prefix_map[ids["network"]] = _prefix.id
         return super().create(ids=ids, diffsync=diffsync, attrs=attrs)
 
-    def update(self, attrs):  # pylint: disable=too-many-branches
-        """Update Prefix object in Nautobot."""
-        _pf = OrmPrefix.objects.get(id=self.pk)
+    def update(self, attrs):
+        """Update Prefix object in Nautobot, saved in bulk by the adapter's `sync_complete`."""
+        queryset = OrmPrefix.objects.select_related(
+            "site", "location", "vrf", "tenant", "vlan", "status", "role"
+        ).prefetch_related("tags")
+        self.diffsync.queue_update(queryset, self, attrs)
+        return super().update(attrs)
+
+    def update_object(self, _pf: OrmPrefix, attrs: dict):  # pylint: disable=too-many-branches
+        """Apply updated attributes to a Prefix object without saving it."""
         if self.diffsync.job.kwargs.get("debug"):
             self.diffsync.job.log_debug(message=f"Attempting to update Prefix {_pf.prefix} with {attrs}.")
         if "description" in attrs:
@@ -133,43 +151,50 @@ class NautobotNetwork(Network):
                 )
         if "ext_attrs" in attrs:
             process_ext_attrs(diffsync=self.diffsync, obj=_pf, extattrs=attrs["ext_attrs"])
-        if "vlans" in attrs:  # pylint: disable=too-many-nested-blocks
-            current_vlans = get_prefix_vlans(prefix=_pf)
-            if len(current_vlans) < len(attrs["vlans"]):
-                for _, item in attrs["vlans"].items():
-                    try:
-                        vlan = OrmVlan.objects.get(vid=item["vid"], name=item["name"], group__name=item["group"])
-                        if vlan not in current_vlans:
-                            if self.diffsync.job.kwargs.get("debug"):
-                                self.diffsync.job.log_debug(message=f"Adding VLAN {vlan.vid} to {_pf.prefix}.")
-                            OrmRelationshipAssociation.objects.get_or_create(
-                                relationship_id=self.diffsync.relationship_map["Prefix -> VLAN"],
-                                source_type=ContentType.objects.get_for_model(OrmPrefix),
-                                source_id=_pf.id,
-                                destination_type=ContentType.objects.get_for_model(OrmVlan),
-                                destination_id=vlan.id,
-                            )
-                    except OrmVlan.DoesNotExist:
+        if "vlans" in attrs:
+            try:
+                # A savepoint, so a failing write doesn't roll back the other updates saved in the same transaction.
+                with transaction.atomic():
+                    self.update_vlans(_pf, attrs["vlans"])
+            except DatabaseError as err:
+                self.diffsync.job.log_warning(message=f"Unable to update the VLANs of Prefix {_pf.prefix}. {err}")
+
+    def update_vlans(self, _pf: OrmPrefix, vlans: dict):  # pylint: disable=too-many-nested-blocks
+        """Add and remove the Prefix -> VLAN Relationship Associations of a Prefix to match `vlans`."""
+        current_vlans = get_prefix_vlans(prefix=_pf)
+        if len(current_vlans) < len(vlans):
+            for _, item in vlans.items():
+                try:
+                    vlan = OrmVlan.objects.get(vid=item["vid"], name=item["name"], group__name=item["group"])
+                    if vlan not in current_vlans:
                         if self.diffsync.job.kwargs.get("debug"):
-                            self.diffsync.job.log_debug(
-                                message=f"Unable to find VLAN {item['vid']} {item['name']} in {item['group']} to assign to prefix {_pf.prefix}."
-                            )
-                            continue
-            else:
-                for vlan in current_vlans:
-                    if vlan.vid not in attrs["vlans"]:
-                        del_vlan = OrmRelationshipAssociation.objects.get(
+                            self.diffsync.job.log_debug(message=f"Adding VLAN {vlan.vid} to {_pf.prefix}.")
+                        OrmRelationshipAssociation.objects.get_or_create(
                             relationship_id=self.diffsync.relationship_map["Prefix -> VLAN"],
                             source_type=ContentType.objects.get_for_model(OrmPrefix),
                             source_id=_pf.id,
                             destination_type=ContentType.objects.get_for_model(OrmVlan),
                             destination_id=vlan.id,
                         )
-                        if self.diffsync.job.kwargs.get("debug"):
-                            self.diffsync.job.log_debug(message=f"Removing VLAN {vlan.vid} from {_pf.prefix}.")
-                        del_vlan.delete()
-        _pf.validated_save()
-        return super().update(attrs)
+                except OrmVlan.DoesNotExist:
+                    if self.diffsync.job.kwargs.get("debug"):
+                        self.diffsync.job.log_debug(
+                            message=f"Unable to find VLAN {item['vid']} {item['name']} in {item['group']} to assign to prefix {_pf.prefix}."
+                        )
+                        continue
+        else:
+            for vlan in current_vlans:
+                if vlan.vid not in vlans:
+                    del_vlan = OrmRelationshipAssociation.objects.get(
+                        relationship_id=self.diffsync.relationship_map["Prefix -> VLAN"],
+                        source_type=ContentType.objects.get_for_model(OrmPrefix),
+                        source_id=_pf.id,
+                        destination_type=ContentType.objects.get_for_model(OrmVlan),
+                        destination_id=vlan.id,
+                    )
+                    if self.diffsync.job.kwargs.get("debug"):
+                        self.diffsync.job.log_debug(message=f"Removing VLAN {vlan.vid} from {_pf.prefix}.")
+                    del_vlan.delete()
 
     # def delete(self):
     #     """Delete Prefix object in Nautobot."""
@@ -196,7 +221,6 @@ class NautobotIPAddress(IPAddress):
             description=attrs.get("description", ""),
             dns_name=attrs.get("dns_name", ""),
         )
-        _ip.tags.add(create_tag_sync_from_infoblox())
         if attrs.get("ext_attrs"):
             process_ext_attrs(diffsync=diffsync, obj=_ip, extattrs=attrs["ext_attrs"])
         try:
@@ -210,8 +234,15 @@ class NautobotIPAddress(IPAddress):
             return None
 
     def update(self, attrs):
-        """Update IPAddress object in Nautobot."""
-        _ipaddr = OrmIPAddress.objects.get(id=self.pk)
+        """Update IPAddress object in Nautobot, saved in bulk by the adapter's `sync_complete`."""
+        queryset = OrmIPAddress.objects.select_related(
+            "status", "tenant", "vrf", "nat_inside", "assigned_object_type"
+        ).prefetch_related("tags", "nat_outside_list", "assigned_object")
+        self.diffsync.queue_update(queryset, self, attrs)
+        return super().update(attrs)
+
+    def update_object(self, _ipaddr: OrmIPAddress, attrs: dict):
+        """Apply updated attributes to an IPAddress object without saving it."""
         if attrs.get("status"):
             try:
                 status = self.diffsync.status_map[slugify(attrs["status"])]
@@ -224,12 +255,6 @@ class NautobotIPAddress(IPAddress):
             _ipaddr.dns_name = attrs["dns_name"]
         if "ext_attrs" in attrs:
             process_ext_attrs(diffsync=self.diffsync, obj=_ipaddr, extattrs=attrs["ext_attrs"])
-        try:
-            _ipaddr.validated_save()
-            return super().update(attrs)
-        except ValidationError as err:
-            self.diffsync.job.log_warning(message=f"Error with updating IP Address {self.address}. {err}")
-            return None
 
     # def delete(self):
     #     """Delete IPAddress object in Nautobot."""
@@ -286,7 +311,6 @@ class NautobotVlan(Vlan):
         )
         if "ext_attrs" in attrs:
             process_ext_attrs(diffsync=diffsync, obj=_vlan, extattrs=attrs["ext_attrs"])
-        _vlan.tags.add(create_tag_sync_from_infoblox())
         try:
             diffsync.objects_to_create["vlans"].append(_vlan)
             if ids["vlangroup"] not in diffsync.vlan_map:
@@ -308,23 +332,24 @@ class NautobotVlan(Vlan):
         return statuses[status]
 
     def update(self, attrs):
-        """Update VLAN object in Nautobot."""
-        _vlan = OrmVlan.objects.get(id=self.pk)
+        """Update VLAN object in Nautobot, saved in bulk by the adapter's `sync_complete`."""
+        queryset = OrmVlan.objects.select_related(
+            "site", "location", "group", "tenant", "status", "role"
+        ).prefetch_related("tags")
+        self.diffsync.queue_update(queryset, self, attrs)
+        return super().update(attrs)
+
+    def update_object(self, _vlan: OrmVlan, attrs: dict):
+        """Apply updated attributes to a VLAN object without saving it."""
         if attrs.get("status"):
             _vlan.status_id = self.diffsync.status_map[self.get_vlan_status(attrs["status"])]
         if attrs.get("description"):
             _vlan.description = attrs["description"]
         if "ext_attrs" in attrs:
             process_ext_attrs(diffsync=self.diffsync, obj=_vlan, extattrs=attrs["ext_attrs"])
-        if not _vlan.group.site and _vlan.site:
-            _vlan.group.site = _vlan.site
+        if _vlan.group and not _vlan.group.site_id and _vlan.site_id:
+            _vlan.group.site_id = _vlan.site_id
             _vlan.group.validated_save()
-        try:
-            _vlan.validated_save()
-        except ValidationError as err:
-            self.diffsync.job.log_warning(message=f"Unable to update VLAN {_vlan.name} {_vlan.vid}. {err}")
-            return None
-        return super().update(attrs)
 
     def delete(self):
         """Delete VLAN object in Nautobot."""
@@ -339,28 +364,30 @@ class NautobotAggregate(Aggregate):
 
     @classmethod
     def create(cls, diffsync, ids, attrs):
-        """Create Aggregate object in Nautobot."""
-        rir, _ = RIR.objects.get_or_create(name="RFC1918", slug="rfc1918", is_private=True)
+        """Create Aggregate object in Nautobot, saved in bulk by the adapter's `sync_complete`."""
         _aggregate = OrmAggregate(
             prefix=ids["network"],
-            rir=rir,
+            rir=diffsync.rir,
             description=attrs["description"] if attrs.get("description") else "",
         )
         if "ext_attrs" in attrs["ext_attrs"]:
             process_ext_attrs(diffsync=diffsync, obj=_aggregate, extattrs=attrs["ext_attrs"])
-        _aggregate.tags.add(create_tag_sync_from_infoblox())
-        _aggregate.validated_save()
+        diffsync.objects_to_create["aggregates"].append(_aggregate)
         return super().create(ids=ids, diffsync=diffsync, attrs=attrs)
 
     def update(self, attrs):
-        """Update Aggregate object in Nautobot."""
-        _aggregate = OrmAggregate.objects.get(id=self.pk)
+        """Update Aggregate object in Nautobot, saved in bulk by the adapter's `sync_complete`."""
+        self.diffsync.queue_update(
+            OrmAggregate.objects.select_related("rir", "tenant").prefetch_related("tags"), self, attrs
+        )
+        return super().update(attrs)
+
+    def update_object(self, _aggregate: OrmAggregate, attrs: dict):
+        """Apply updated attributes to an Aggregate object without saving it."""
         if attrs.get("description"):
             _aggregate.description = attrs["description"]
         if "ext_attrs" in attrs["ext_attrs"]:
             process_ext_attrs(diffsync=self.diffsync, obj=_aggregate, extattrs=attrs["ext_attrs"])
-        _aggregate.validated_save()
-        return super().update(attrs)
 
     # def delete(self):
     #     """Delete Aggregate object in Nautobot."""
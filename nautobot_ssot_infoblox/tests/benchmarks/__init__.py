@@ -0,0 +1,4 @@
+"""Performance benchmarks for the Infoblox SSoT plugin.
+
+Benchmark modules are named `bench_*.py` so they are not collected by the regular test run, use `invoke benchmark`.
+"""
@@ -0,0 +1,135 @@
+"""Benchmarks of loading the Infoblox DiffSync adapters from a synthetic grid.
+
+Run with `invoke benchmark`, or a single scenario with
+`invoke benchmark --label nautobot_ssot_infoblox.tests.benchmarks.bench_infoblox_adapters.InfobloxAdapterBenchmark.test_infoblox_adapter_large`.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+
+from nautobot_ssot_infoblox.constant import PLUGIN_CFG
+from nautobot_ssot_infoblox.diffsync.adapters.infoblox import InfobloxAdapter, InfobloxAggregateAdapter
+from nautobot_ssot_infoblox.tests.benchmarks.harness import measure, write_results
+from nautobot_ssot_infoblox.tests.benchmarks.wapi import FakeWapi, SyntheticGrid
+from nautobot_ssot_infoblox.utils.client import InfobloxApi
+
+SCENARIOS = {
+    # 20 networks, 400 IP addresses
+    "small": {
+        "network_views": 1,
+        "containers": 2,
+        "subnets_per_container": 10,
+        "ips_per_subnet": 20,
+        "vlans": 50,
+        "extattrs": 3,
+    },
+    # 1,000 networks, 50,000 IP addresses
+    "medium": {
+        "network_views": 2,
+        "containers": 10,
+        "subnets_per_container": 50,
+        "ips_per_subnet": 50,
+        "vlans": 500,
+        "extattrs": 5,
+    },
+    # 10,000 networks, 500,000 IP addresses
+    "large": {
+        "network_views": 4,
+        "containers": 20,
+        "subnets_per_container": 125,
+        "ips_per_subnet": 50,
+        "vlans": 1000,
+        "extattrs": 5,
+    },
+}
+IMPORT_ALL = {"infoblox_import_objects": {"subnets": True, "ip_addresses": True, "vlan_views": True, "vlans": True}}
+
+
+class InfobloxAdapterBenchmark(unittest.TestCase):
+    """Measure wall time, memory and WAPI calls of `InfobloxAdapter.load` and `InfobloxAggregateAdapter.load`."""
+
+    results = []
+
+    @classmethod
+    def tearDownClass(cls):
+        """Write the results of all benchmarks run."""
+        if cls.results:
+            print(f"\nBenchmark results written to {write_results('infoblox_adapters', cls.results)}")
+
+    def run_load(self, adapter_class, scenario: str, **options) -> dict:
+        """Load an adapter from the synthetic grid of a scenario and record the measurements."""
+        grid = SyntheticGrid(**SCENARIOS[scenario])
+        last = {}
+
+        def setup():
+            conn = InfobloxApi(
+                url="https://wapi.benchmark.invalid",
+                username="benchmark",
+                password="benchmark",  # nosec
+                verify_ssl=False,
+                auth_cache_ttl=0,
+            )
+            wapi = FakeWapi(grid=grid)
+            conn.session.mount("https://", wapi)
+            cache.delete(conn._ipv4_usage_history_key())  # pylint: disable=protected-access
+            return adapter_class(job=MagicMock(kwargs={}), sync=None, conn=conn), wapi
+
+        def load(state):
+            adapter, wapi = state
+            with patch.dict(PLUGIN_CFG, {**IMPORT_ALL, "import_subnets": None, **options}):
+                adapter.load()
+            last.update(
+                loaded={name: len(adapter.get_all(name)) for name in adapter.top_level},
+                calls=dict(wapi.calls),
+            )
+
+        metrics = measure(load, setup=setup)
+        result = {
+            "adapter": adapter_class.__name__,
+            "scenario": scenario,
+            "params": grid.params,
+            "options": options,
+            "records": grid.counts(),
+            "loaded": last["loaded"],
+            "api_calls": sum(last["calls"].values()),
+            "api_calls_by_endpoint": last["calls"],
+            **metrics,
+        }
+        self.results.append(result)
+        print(f"\n{adapter_class.__name__} {scenario} {options or ''}: {metrics}")
+        return result
+
+    def assert_infoblox_adapter_loaded(self, result):
+        """Validate every generated object was loaded."""
+        records = result["records"]
+        self.assertEqual(result["loaded"]["prefix"], records["network"] + records["networkcontainer"])
+        self.assertEqual(result["loaded"]["ipaddress"], records["ipv4address"])
+        self.assertEqual(result["loaded"]["vlangroup"], records["vlanview"])
+        self.assertEqual(result["loaded"]["vlan"], records["vlan"])
+
+    def test_infoblox_adapter_small(self):
+        """Benchmark InfobloxAdapter.load on the small grid."""
+        self.assert_infoblox_adapter_loaded(self.run_load(InfobloxAdapter, "small"))
+
+    def test_infoblox_adapter_medium(self):
+        """Benchmark InfobloxAdapter.load on the medium grid."""
+        self.assert_infoblox_adapter_loaded(self.run_load(InfobloxAdapter, "medium"))
+
+    def test_infoblox_adapter_medium_async(self):
+        """Benchmark InfobloxAdapter.load on the medium grid with the concurrent load."""
+        self.assert_infoblox_adapter_loaded(self.run_load(InfobloxAdapter, "medium", infoblox_async_load=True))
+
+    def test_infoblox_adapter_large(self):
+        """Benchmark InfobloxAdapter.load on the large grid."""
+        self.assert_infoblox_adapter_loaded(self.run_load(InfobloxAdapter, "large"))
+
+    def test_aggregate_adapter_small(self):
+        """Benchmark InfobloxAggregateAdapter.load on the small grid."""
+        result = self.run_load(InfobloxAggregateAdapter, "small")
+        self.assertEqual(result["loaded"]["aggregate"], 3)
+
+    def test_aggregate_adapter_large(self):
+        """Benchmark InfobloxAggregateAdapter.load on the large grid."""
+        result = self.run_load(InfobloxAggregateAdapter, "large")
+        self.assertEqual(result["loaded"]["aggregate"], 3)
@@ -0,0 +1,185 @@
+"""Benchmarks of loading the Nautobot DiffSync adapter and writing its models against a seeded database.
+
+Run with `invoke benchmark`, or a single scenario with
+`invoke benchmark --label nautobot_ssot_infoblox.tests.benchmarks.bench_nautobot_adapter.NautobotAdapterBenchmark.test_medium`.
+No Infoblox is needed, only the database of the development environment.
+"""
+from unittest.mock import MagicMock
+
+from django.db import transaction
+from django.test import TestCase
+
+from nautobot_ssot_infoblox.diffsync.adapters.nautobot import NautobotAdapter
+from nautobot_ssot_infoblox.tests.benchmarks.harness import count_queries, measure, write_results
+from nautobot_ssot_infoblox.tests.benchmarks.seed import SeededNautobot, create_items, ext_attrs
+
+SCENARIOS = {
+    # 22 prefixes, 400 IP addresses, 50 VLANs
+    "small": {
+        "seed": {
+            "containers": 2,
+            "subnets_per_container": 10,
+            "ips_per_subnet": 20,
+            "vlan_groups": 1,
+            "vlans_per_group": 50,
+            "custom_fields": 3,
+        },
+        "writes": {"vlangroup": 2, "vlan": 50, "prefix": 20, "ipaddress": 200},
+    },
+    # 510 prefixes, 10,000 IP addresses, 1,000 VLANs
+    "medium": {
+        "seed": {
+            "containers": 10,
+            "subnets_per_container": 50,
+            "ips_per_subnet": 20,
+            "vlan_groups": 5,
+            "vlans_per_group": 200,
+            "custom_fields": 5,
+        },
+        "writes": {"vlangroup": 5, "vlan": 500, "prefix": 500, "ipaddress": 5000},
+    },
+    # 5,020 prefixes, 200,000 IP addresses, 10,000 VLANs
+    "large": {
+        "seed": {
+            "containers": 20,
+            "subnets_per_container": 250,
+            "ips_per_subnet": 40,
+            "vlan_groups": 10,
+            "vlans_per_group": 1000,
+            "custom_fields": 5,
+        },
+        "writes": {"vlangroup": 10, "vlan": 2000, "prefix": 2000, "ipaddress": 20000},
+    },
+}
+LOADED_MODELS = {
+    "load_prefixes": "prefix",
+    "load_ipaddresses": "ipaddress",
+    "load_vlangroups": "vlangroup",
+    "load_vlans": "vlan",
+}
+LOADERS = list(LOADED_MODELS)
+
+
+class NautobotAdapterBenchmark(TestCase):
+    """Measure wall time, memory and SQL queries of `NautobotAdapter` loaders, model creates and model updates."""
+
+    results = []
+
+    @classmethod
+    def tearDownClass(cls):
+        """Write the results of all benchmarks run."""
+        super().tearDownClass()
+        if cls.results:
+            print(f"\nBenchmark results written to {write_results('nautobot_adapter', cls.results)}")
+
+    @staticmethod
+    def adapter(loaders=()) -> NautobotAdapter:
+        """Return a new NautobotAdapter with the given loaders already run."""
+        adapter = NautobotAdapter(job=MagicMock(kwargs={}), sync=None)
+        for loader in loaders:
+            getattr(adapter, loader)()
+        return adapter
+
+    @staticmethod
+    def loaded_adapter() -> NautobotAdapter:
+        """Return a new NautobotAdapter loaded from the database, ready to write to it."""
+        adapter = NautobotAdapter(job=MagicMock(kwargs={}), sync=None)
+        adapter.load()
+        return adapter
+
+    def record(self, scenario: str, operation: str, func, setup, objects: int, **extra) -> dict:
+        """Measure a benchmarked operation and record its result."""
+        metrics = measure(func, setup=setup)
+        result = {
+            "scenario": scenario,
+            "operation": operation,
+            "objects": objects,
+            **extra,
+            **metrics,
+            "queries": count_queries(func, setup=setup),
+            "objects_per_second": round(objects / metrics["wall_seconds_min"], 1)
+            if metrics["wall_seconds_min"]
+            else None,
+        }
+        self.results.append(result)
+        print(f"\n{scenario} {operation}: {objects} objects, {result['queries']} queries, {metrics}")
+        return result
+
+    def run_loaders(self, scenario: str, seeded: dict):
+        """Benchmark the whole load, then every loader on an adapter with the loaders before it already run."""
+        loaded = {}
+
+        def load(adapter):
+            adapter.load()
+            loaded.update({name: len(adapter.get_all(name)) for name in adapter.top_level})
+
+        self.record(
+            scenario, "load", load, setup=self.adapter, objects=sum(seeded[name] for name in LOADED_MODELS.values())
+        )
+        self.assertEqual(loaded["prefix"], seeded["prefix"])
+        self.assertEqual(loaded["ipaddress"], seeded["ipaddress"])
+        self.assertEqual(loaded["vlangroup"], seeded["vlangroup"])
+        self.assertEqual(loaded["vlan"], seeded["vlan"])
+
+        for idx, loader in enumerate(LOADERS):
+            self.record(
+                scenario,
+                loader,
+                lambda adapter, loader=loader: getattr(adapter, loader)(),
+                setup=lambda idx=idx: self.adapter(LOADERS[:idx]),
+                objects=seeded[LOADED_MODELS[loader]],
+            )
+
+    def run_creates(self, scenario: str, writes: dict, num_attrs: int):
+        """Benchmark creating new objects of every model through the DiffSync models and `sync_complete`."""
+        vlan = self.adapter(["load_vlans"]).get_all("vlan")[0]
+        for model, count in writes.items():
+            items = create_items(model, count, num_attrs, {"vid": vlan.vid, "name": vlan.name, "group": vlan.vlangroup})
+
+            def create(adapter, items=items):
+                with transaction.atomic():
+                    for item_model, ids, attrs in items:
+                        getattr(adapter, item_model).create(diffsync=adapter, ids=ids, attrs=attrs)
+                    adapter.sync_complete(source=None)
+                    transaction.set_rollback(True)
+
+            self.record(scenario, f"create {model}", create, setup=self.loaded_adapter, objects=count, model=model)
+
+    def run_updates(self, scenario: str, writes: dict, num_attrs: int):
+        """Benchmark updating the description and Extensibility Attributes of loaded objects of every model."""
+        loaded = self.loaded_adapter()
+        for model, count in writes.items():
+            if model == "vlangroup":
+                # NautobotVlanGroup.update only processes Extensibility Attributes and never saves the VLAN Group.
+                continue
+
+            def update(adapter, model=model, count=count):
+                with transaction.atomic():
+                    for idx, obj in enumerate(adapter.get_all(model)[:count]):
+                        obj.update({"description": f"Updated {idx}", "ext_attrs": ext_attrs(num_attrs, idx)})
+                    adapter.sync_complete(source=None)
+                    transaction.set_rollback(True)
+
+            objects = min(count, len(loaded.get_all(model)))
+            self.record(scenario, f"update {model}", update, setup=self.loaded_adapter, objects=objects, model=model)
+
+    def run_scenario(self, scenario: str):
+        """Seed the database for a scenario and run every benchmark against it."""
+        config = SCENARIOS[scenario]
+        seeded = SeededNautobot(**config["seed"]).seed()
+        num_attrs = config["seed"]["custom_fields"]
+        self.run_loaders(scenario, seeded)
+        self.run_creates(scenario, config["writes"], num_attrs)
+        self.run_updates(scenario, config["writes"], num_attrs)
+
+    def test_small(self):
+        """Benchmark the NautobotAdapter against the small seeded database."""
+        self.run_scenario("small")
+
+    def test_medium(self):
+        """Benchmark the NautobotAdapter against the medium seeded database."""
+        self.run_scenario("medium")
+
+    def test_large(self):
+        """Benchmark the NautobotAdapter against the large seeded database."""
+        self.run_scenario("large")
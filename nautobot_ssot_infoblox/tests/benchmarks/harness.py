@@ -0,0 +1,90 @@
+"""Measurement and reporting helpers shared by the benchmarks."""
+import gc
+import json
+import os
+import platform
+import resource
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from django.db import connection
+
+RESULTS_DIR = os.environ.get("NAUTOBOT_SSOT_INFOBLOX_BENCHMARK_DIR", "benchmark-results")
+REPEAT = int(os.environ.get("NAUTOBOT_SSOT_INFOBLOX_BENCHMARK_REPEAT", "3"))
+
+
+def peak_rss_kb() -> int:
+    """Return the peak resident set size of the process so far in KiB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(func, setup=None, repeat: int = REPEAT) -> dict:
+    """Measure the wall time and memory use of a function.
+
+    The function is timed `repeat` times, then run once more under tracemalloc to find the peak Python heap use, as
+    tracing slows it down. `setup` is called before every run and its result passed to `func`.
+
+    Returns:
+        dict: Fastest and mean wall time in seconds, peak traced memory in bytes and the process peak RSS in KiB.
+    """
+    times = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        gc.collect()
+        start = time.perf_counter()
+        func(state)
+        times.append(time.perf_counter() - start)
+    state = setup() if setup else None
+    gc.collect()
+    tracemalloc.start()
+    func(state)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "wall_seconds_min": round(min(times), 4),
+        "wall_seconds_mean": round(sum(times) / len(times), 4),
+        "traced_peak_bytes": traced_peak,
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def count_queries(func, setup=None) -> int:
+    """Run a function once more and return the number of SQL queries it made.
+
+    Queries are counted by a database execute wrapper rather than captured, which is capped at 9000 queries.
+    """
+    executed = []
+
+    def counter(execute, sql, params, many, context):  # pylint: disable=too-many-arguments
+        executed.append(None)
+        return execute(sql, params, many, context)
+
+    state = setup() if setup else None
+    with connection.execute_wrapper(counter):
+        func(state)
+    return len(executed)
+
+
+def write_results(name: str, results: list) -> str:
+    """Write benchmark results to `<RESULTS_DIR>/<name>-<timestamp>.json` so runs can be compared.
+
+    Returns:
+        str: Path of the file written.
+    """
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    now = datetime.now(timezone.utc)
+    path = os.path.join(RESULTS_DIR, f"{name}-{now.strftime('%Y%m%dT%H%M%S')}.json")
+    with open(path, "w", encoding="utf-8") as results_file:
+        json.dump(
+            {
+                "benchmark": name,
+                "timestamp": now.isoformat(),
+                "python": platform.python_version(),
+                "repeat": REPEAT,
+                "results": results,
+            },
+            results_file,
+            indent=2,
+        )
+    return path
@@ -0,0 +1,233 @@
+"""Synthetic Nautobot IPAM data seeded into the test database and the DiffSync objects written to it."""
+import ipaddress
+
+from django.contrib.contenttypes.models import ContentType
+from django.utils.text import slugify
+from nautobot.extras.choices import CustomFieldTypeChoices
+from nautobot.extras.models import CustomField, Relationship, RelationshipAssociation, Status
+from nautobot.ipam.models import VLAN, IPAddress, Prefix, VLANGroup
+
+BATCH_SIZE = 1000
+WRITE_BASE = int(ipaddress.ip_address("100.64.0.0"))
+
+
+def ext_attrs(num: int, seed: int) -> dict:
+    """Return `num` Extensibility Attributes as loaded by the Infoblox adapter."""
+    return {f"attribute_{idx}": f"changed-{(seed + idx) % 7}" for idx in range(num)}
+
+
+def create_items(model: str, count: int, num_attrs: int, vlan: dict) -> list:
+    """Return the DiffSync `(model, ids, attrs)` of `count` new objects of a model.
+
+    New VLANs go into a new VLAN Group so they do not clash with the seeded ones, new Prefixes are related to the
+    seeded `vlan`.
+    """
+    if model == "vlangroup":
+        return [
+            ("vlangroup", {"name": f"New VLANs {idx}"}, {"description": "", "ext_attrs": ext_attrs(num_attrs, idx)})
+            for idx in range(count)
+        ]
+    if model == "vlan":
+        return [("vlangroup", {"name": "New VLANs"}, {"description": "", "ext_attrs": {}})] + [
+            (
+                "vlan",
+                {"vid": idx % 4094 + 1, "name": f"New VLAN{idx}", "vlangroup": "New VLANs"},
+                {"status": "ASSIGNED", "description": "", "ext_attrs": ext_attrs(num_attrs, idx)},
+            )
+            for idx in range(min(count, 4094))
+        ]
+    if model == "prefix":
+        return [
+            (
+                "prefix",
+                {"network": str(ipaddress.ip_network((WRITE_BASE + idx * 256, 24)))},
+                {
+                    "description": "New network",
+                    "status": "active",
+                    "ext_attrs": ext_attrs(num_attrs, idx),
+                    "vlans": {vlan["vid"]: vlan},
+                },
+            )
+            for idx in range(count)
+        ]
+    return [
+        (
+            "ipaddress",
+            {"address": str(ipaddress.ip_address(WRITE_BASE + idx)), "prefix": "100.64.0.0/10", "prefix_length": 10},
+            {
+                "description": "New address",
+                "dns_name": f"new-{idx}.example.com",
+                "status": "Active",
+                "ext_attrs": ext_attrs(num_attrs, idx),
+            },
+        )
+        for idx in range(count)
+    ]
+
+
+def custom_field_data(num: int, seed: int) -> dict:
+    """Return the values of `num` seeded custom fields."""
+    return {f"attribute_{idx}": f"value-{(seed + idx) % 7}" for idx in range(num)}
+
+
+class SeededNautobot:  # pylint: disable=too-many-instance-attributes
+    """Seed the database with the Nautobot objects of a given size loaded by `NautobotAdapter`.
+
+    Every container is a /16 Prefix with the `container` status holding `subnets_per_container` active /24 Prefixes,
+    each with `ips_per_subnet` IP Addresses and a Prefix -> VLAN RelationshipAssociation to one of the `vlans_per_group`
+    VLANs of the `vlan_groups` VLAN Groups. Every object gets values for `custom_fields` text Custom Fields.
+    """
+
+    def __init__(
+        self,
+        *,
+        containers: int = 2,
+        subnets_per_container: int = 10,
+        ips_per_subnet: int = 20,
+        vlan_groups: int = 1,
+        vlans_per_group: int = 50,
+        custom_fields: int = 3,
+    ):  # pylint: disable=too-many-arguments
+        """Initialize SeededNautobot."""
+        self.params = {
+            "containers": containers,
+            "subnets_per_container": min(subnets_per_container, 256),
+            "ips_per_subnet": min(ips_per_subnet, 254),
+            "vlan_groups": vlan_groups,
+            "vlans_per_group": min(vlans_per_group, 4094),
+            "custom_fields": custom_fields,
+        }
+        self.status_active = self._status("Active", VLAN, Prefix, IPAddress)
+        self.status_container = self._status("Container", Prefix)
+        self._status("SLAAC", IPAddress)
+        self.vlans = []
+        self.subnets = []
+
+    def seed(self):
+        """Insert the objects, returning the number created per model."""
+        self._seed_custom_fields()
+        self._seed_vlans()
+        self._seed_prefixes()
+        self._seed_ipaddresses()
+        self._seed_relationship_associations()
+        return self.counts()
+
+    def counts(self) -> dict:
+        """Return the number of objects seeded per model."""
+        params = self.params
+        subnets = params["containers"] * params["subnets_per_container"]
+        return {
+            "customfield": params["custom_fields"],
+            "vlangroup": params["vlan_groups"],
+            "vlan": params["vlan_groups"] * params["vlans_per_group"],
+            "prefix": params["containers"] + subnets,
+            "ipaddress": subnets * params["ips_per_subnet"],
+            "relationshipassociation": subnets if params["vlans_per_group"] else 0,
+        }
+
+    @staticmethod
+    def _status(name: str, *models) -> Status:
+        """Return a Status, creating it if missing as Nautobot's data migrations are undone by test database flushes."""
+        status, _ = Status.objects.get_or_create(slug=slugify(name), defaults={"name": name})
+        status.content_types.add(*ContentType.objects.get_for_models(*models).values())
+        return status
+
+    def _seed_custom_fields(self):
+        content_types = ContentType.objects.get_for_models(Prefix, IPAddress, VLAN, VLANGroup).values()
+        for idx in range(self.params["custom_fields"]):
+            field, _ = CustomField.objects.get_or_create(
+                name=f"attribute_{idx}",
+                defaults={
+                    "slug": f"attribute_{idx}",
+                    "type": CustomFieldTypeChoices.TYPE_TEXT,
+                    "label": f"Attribute {idx}",
+                },
+            )
+            field.content_types.add(*content_types)
+
+    def _seed_vlans(self):
+        num = self.params["custom_fields"]
+        groups = [
+            VLANGroup(
+                name=f"Benchmark VLANs {idx}",
+                slug=slugify(f"Benchmark VLANs {idx}"),
+                _custom_field_data=custom_field_data(num, idx),
+            )
+            for idx in range(self.params["vlan_groups"])
+        ]
+        VLANGroup.objects.bulk_create(groups, batch_size=BATCH_SIZE)
+        self.vlans = [
+            VLAN(
+                vid=vid,
+                name=f"VLAN{vid}",
+                group=group,
+                status=self.status_active,
+                _custom_field_data=custom_field_data(num, vid),
+            )
+            for group in groups
+            for vid in range(1, self.params["vlans_per_group"] + 1)
+        ]
+        VLAN.objects.bulk_create(self.vlans, batch_size=BATCH_SIZE)
+
+    def _seed_prefixes(self):
+        num = self.params["custom_fields"]
+        base = int(ipaddress.ip_address("10.0.0.0"))
+        prefixes = []
+        for container_idx in range(self.params["containers"]):
+            container = ipaddress.ip_network((base + container_idx * 2**16, 16))
+            prefixes.append(
+                Prefix(
+                    prefix=str(container),
+                    status=self.status_container,
+                    _custom_field_data=custom_field_data(num, container_idx),
+                )
+            )
+            for subnet in list(container.subnets(new_prefix=24))[: self.params["subnets_per_container"]]:
+                self.subnets.append(
+                    Prefix(
+                        prefix=str(subnet),
+                        status=self.status_active,
+                        description=f"Network {subnet}",
+                        _custom_field_data=custom_field_data(num, int(subnet.network_address)),
+                    )
+                )
+        Prefix.objects.bulk_create(prefixes + self.subnets, batch_size=BATCH_SIZE)
+
+    def _seed_ipaddresses(self):
+        num = self.params["custom_fields"]
+        batch = []
+        for subnet in self.subnets:
+            network = ipaddress.ip_network(subnet.prefix)
+            for host in list(network.hosts())[: self.params["ips_per_subnet"]]:
+                batch.append(
+                    IPAddress(
+                        address=f"{host}/{network.prefixlen}",
+                        status=self.status_active,
+                        dns_name=f"host-{str(host).replace('.', '-')}.example.com",
+                        _custom_field_data=custom_field_data(num, int(host)),
+                    )
+                )
+                if len(batch) >= BATCH_SIZE:
+                    IPAddress.objects.bulk_create(batch)
+                    batch = []
+        IPAddress.objects.bulk_create(batch)
+
+    def _seed_relationship_associations(self):
+        if not self.vlans:
+            return
+        relationship = Relationship.objects.get(slug="prefix_to_vlan")
+        prefix_type = ContentType.objects.get_for_model(Prefix)
+        vlan_type = ContentType.objects.get_for_model(VLAN)
+        RelationshipAssociation.objects.bulk_create(
+            [
+                RelationshipAssociation(
+                    relationship=relationship,
+                    source_type=prefix_type,
+                    source_id=subnet.id,
+                    destination_type=vlan_type,
+                    destination_id=self.vlans[idx % len(self.vlans)].id,
+                )
+                for idx, subnet in enumerate(self.subnets)
+            ],
+            batch_size=BATCH_SIZE,
+        )
@@ -0,0 +1,245 @@
+"""Synthetic Infoblox grid data served through an in-process WAPI stub."""
+import ipaddress
+import json
+import time
+from collections import Counter
+from itertools import count
+from urllib.parse import parse_qs, urlsplit
+
+from requests import Response
+from requests.adapters import BaseAdapter
+
+RFC1918_CONTAINERS = ["10.0.0.0/8", "172.16.0.0/12", "192.168.0.0/16"]
+
+
+def ext_attrs(num: int, seed: int) -> dict:
+    """Return `num` Extensibility Attributes in WAPI format."""
+    return {f"Attribute {idx}": {"value": f"value-{(seed + idx) % 7}"} for idx in range(num)}
+
+
+class SyntheticGrid:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """Generate the WAPI records of an Infoblox grid of a given size.
+
+    Every network view gets `containers` /16 network containers, each holding `subnets_per_container` /24 networks
+    with `ips_per_subnet` used IP addresses, and a VLAN view with `vlans` VLANs. Prefixes are unique across views as
+    the DiffSync models are keyed on the prefix alone.
+    """
+
+    def __init__(
+        self,
+        *,
+        network_views: int = 1,
+        containers: int = 2,
+        subnets_per_container: int = 10,
+        ips_per_subnet: int = 20,
+        vlans: int = 50,
+        extattrs: int = 3,
+        rfc1918_containers: bool = True,
+    ):  # pylint: disable=too-many-arguments
+        """Initialize SyntheticGrid and generate its records."""
+        self.params = {
+            "network_views": network_views,
+            "containers": containers,
+            "subnets_per_container": min(subnets_per_container, 256),
+            "ips_per_subnet": min(ips_per_subnet, 254),
+            "vlans": min(vlans, 4094),
+            "extattrs": extattrs,
+        }
+        self.networks, self.containers, self.vlanviews, self.vlans = [], [], [], []
+        self.ipaddrs = {}
+        self._refs = count()
+        if rfc1918_containers:
+            for network in RFC1918_CONTAINERS:
+                self.containers.append(self._container(network, "default", next(self._refs)))
+        for view_idx in range(network_views):
+            self._add_view(view_idx)
+
+    def _add_view(self, view_idx: int):
+        view = "default" if view_idx == 0 else f"view-{view_idx}"
+        base = int(ipaddress.ip_address("10.0.0.0"))
+        for container_idx in range(self.params["containers"]):
+            block = view_idx * self.params["containers"] + container_idx
+            container = ipaddress.ip_network((base + block * 2**16, 16))
+            self.containers.append(self._container(str(container), view, next(self._refs)))
+            for subnet in list(container.subnets(new_prefix=24))[: self.params["subnets_per_container"]]:
+                self._add_network(subnet, view, next(self._refs))
+        self._add_vlans(view, view_idx)
+
+    def _container(self, network: str, view: str, ref: int) -> dict:
+        return {
+            "_ref": f"networkcontainer/ZG5zLm5ldHdvcmtfY29udGFpbmVy{ref}:{network}/{view}",
+            "network": network,
+            "network_view": view,
+            "comment": f"Container {network}",
+            "extattrs": ext_attrs(self.params["extattrs"], ref),
+        }
+
+    def _add_network(self, subnet, view: str, ref: int):
+        network = str(subnet)
+        vid = ref % self.params["vlans"] + 1 if self.params["vlans"] else None
+        self.networks.append(
+            {
+                "_ref": f"network/ZG5zLm5ldHdvcmsk{ref}:{network}/{view}",
+                "network": network,
+                "network_view": view,
+                "comment": f"Network {network}",
+                "extattrs": ext_attrs(self.params["extattrs"], ref),
+                "vlans": [
+                    {"vlan": f"vlan/ZG5zLnZsYW4k{vid}:{view}-vlans/VLAN{vid}/{vid}", "id": vid, "name": f"VLAN{vid}"}
+                ]
+                if vid
+                else [],
+                "utilization": round(self.params["ips_per_subnet"] * 100 / 256),
+                "rir_organization": "",
+                "rir": "NONE",
+            }
+        )
+        addrs = []
+        for host in list(subnet.hosts())[: self.params["ips_per_subnet"]]:
+            address = str(host)
+            addrs.append(
+                {
+                    "_ref": f"ipv4address/Li5pcHY0X2FkZHJlc3Mk{address}:{address}",
+                    "ip_address": address,
+                    "network": network,
+                    "network_view": view,
+                    "names": [f"host-{address.replace('.', '-')}.example.com"],
+                    "objects": [f"record:host/ZG5zLmhvc3Qk{address}:host-{address.replace('.', '-')}.example.com/"],
+                    "status": "USED",
+                    "types": ["HOST"],
+                    "usage": ["DNS"],
+                    "mac_address": "",
+                    "comment": "",
+                    "extattrs": ext_attrs(self.params["extattrs"], int(host)),
+                }
+            )
+        self.ipaddrs[(network, view)] = addrs
+
+    def _add_vlans(self, view: str, view_idx: int):
+        vlanview = f"{view}-vlans"
+        self.vlanviews.append(
+            {
+                "_ref": f"vlanview/ZG5zLnZsYW5fdmlldyQ{view_idx}:{vlanview}/1/4094",
+                "name": vlanview,
+                "comment": "",
+                "start_vlan_id": 1,
+                "end_vlan_id": 4094,
+                "extattrs": ext_attrs(self.params["extattrs"], view_idx),
+            }
+        )
+        for vid in range(1, self.params["vlans"] + 1):
+            self.vlans.append(
+                {
+                    "_ref": f"vlan/ZG5zLnZsYW4k{view_idx}.{vid}:{vlanview}/VLAN{vid}/{vid}",
+                    "id": vid,
+                    "name": f"VLAN{vid}",
+                    "status": "ASSIGNED",
+                    "comment": "",
+                    "contact": "",
+                    "department": "",
+                    "reserved": False,
+                    "extattrs": ext_attrs(self.params["extattrs"], vid),
+                }
+            )
+
+    def counts(self) -> dict:
+        """Return the number of records generated per object type."""
+        return {
+            "networkcontainer": len(self.containers),
+            "network": len(self.networks),
+            "ipv4address": sum(len(addrs) for addrs in self.ipaddrs.values()),
+            "vlanview": len(self.vlanviews),
+            "vlan": len(self.vlans),
+        }
+
+
+def project(record: dict, return_fields: str) -> dict:
+    """Return the fields of a record requested with `_return_fields`, WAPI always returns `_ref`."""
+    if not return_fields:
+        return record
+    fields = set(return_fields.split(",")) | {"_ref"}
+    return {key: value for key, value in record.items() if key in fields}
+
+
+class FakeWapi(BaseAdapter):
+    """Transport adapter answering WAPI reads from a `SyntheticGrid`, counting every call.
+
+    Supports server-side paging, `_return_fields` projection and multi-object `request` queries of `ipv4address`,
+    the calls made when loading the Infoblox adapters. `latency` seconds are added to every call.
+    """
+
+    def __init__(self, grid: SyntheticGrid, latency: float = 0.0):
+        """Initialize FakeWapi."""
+        super().__init__()
+        self.grid = grid
+        self.latency = latency
+        self.calls = Counter()
+        self._pages = {}
+        self._page_ids = count()
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        """Answer a WAPI request."""
+        if self.latency:
+            time.sleep(self.latency)
+        url = urlsplit(request.url)
+        object_type = url.path.rsplit("/", 1)[-1]
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        self.calls[f"{request.method} {object_type}"] += 1
+        if request.method == "POST" and object_type == "request":
+            payload = [
+                self._query(query["object"], {**query.get("data", {}), **query.get("args", {})})
+                for query in json.loads(request.body)
+            ]
+        elif request.method == "GET" and object_type in ("network", "networkcontainer", "vlan", "vlanview"):
+            payload = self._read(object_type, params)
+        else:
+            return self._response(request, {"Error": f"{request.method} {object_type} is not supported"}, 400)
+        return self._response(request, payload)
+
+    def close(self):
+        """Nothing to close."""
+
+    def _records(self, object_type: str) -> list:
+        return {
+            "network": self.grid.networks,
+            "networkcontainer": self.grid.containers,
+            "vlan": self.grid.vlans,
+            "vlanview": self.grid.vlanviews,
+        }[object_type]
+
+    def _read(self, object_type: str, params: dict):
+        if "_page_id" in params:
+            records, return_fields, page_size = self._pages.pop(params["_page_id"])
+        else:
+            records = [
+                record
+                for record in self._records(object_type)
+                if all(record.get(key) == value for key, value in params.items() if not key.startswith("_"))
+            ]
+            return_fields = params.get("_return_fields")
+            if not params.get("_paging"):
+                return [project(record, return_fields) for record in records]
+            page_size = int(params.get("_max_results", 1000))
+        page = {"result": [project(record, return_fields) for record in records[:page_size]]}
+        if len(records) > page_size:
+            page_id = str(next(self._page_ids))
+            self._pages[page_id] = (records[page_size:], return_fields, page_size)
+            page["next_page_id"] = page_id
+        return page
+
+    def _query(self, object_type: str, data: dict) -> list:
+        if object_type != "ipv4address":
+            return []
+        addrs = self.grid.ipaddrs.get((data.get("network"), data.get("network_view")), [])
+        return [project(addr, data.get("_return_fields")) for addr in addrs[: int(data.get("_max_results", 1000))]]
+
+    @staticmethod
+    def _response(request, payload, status_code: int = 200) -> Response:
+        response = Response()
+        response.status_code = status_code
+        response.url = request.url
+        response.request = request
+        response.headers["Content-Type"] = "application/json"
+        response._content = json.dumps(payload).encode()  # pylint: disable=protected-access
+        response.cookies.set("ibapauth", "ip=127.0.0.1,client=API,user=benchmark")
+        return response
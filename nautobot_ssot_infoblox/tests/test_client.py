@@ -3,15 +3,18 @@
 # pylint: disable=too-many-public-methods
 from collections import namedtuple
 from os import path
+import json
 
 import unittest
 from unittest.mock import patch
 import pytest
+from django.core.cache import cache
 from requests.models import HTTPError
 import requests_mock
 
 # from requests_mock.mocker import mock
-from nautobot_ssot_infoblox.utils.client import InvalidUrlScheme, get_dns_name
+from nautobot_ssot_infoblox.utils import client
+from nautobot_ssot_infoblox.utils.client import InvalidUrlScheme, get_dns_name, get_return_fields
 from nautobot_ssot_infoblox.tests.fixtures_infoblox import (
     get_ptr_record_by_name,
     localhost_client_infoblox,
@@ -58,6 +61,8 @@ class TestInfobloxTest(unittest.TestCase):
 
     def setUp(self) -> None:
         self.infoblox_client = localhost_client_infoblox(LOCALHOST)
+        cache.delete(self.infoblox_client._ipv4_usage_history_key())
+        cache.delete(self.infoblox_client._auth_cookie_key())
 
     def test_urlparse_without_protocol(self):
         """Test urlparse returns HTTPS when only URL sent."""
@@ -92,6 +97,22 @@ class TestInfobloxTest(unittest.TestCase):
             results = get_dns_name(possible_fqdn=fqdn)
             self.assertEqual(results, expected)
 
+    def test_get_return_fields(self):
+        """Test configured return fields replace the defaults of an object type, keeping the required fields."""
+        return_fields = get_return_fields({"vlan": "name, description", "ipv4address": ["comment"]})
+        self.assertEqual(return_fields["vlan"], "id,name,status,description")
+        self.assertEqual(return_fields["ipv4address"], "ip_address,network,names,usage,comment")
+        self.assertEqual(return_fields["network"], "network,network_view,comment,extattrs,vlans,utilization")
+
+    def test_iter_vlans_uses_configured_return_fields(self):
+        """Test VLANs are queried with the return fields configured for the client."""
+        self.infoblox_client.return_fields = get_return_fields({"vlan": []})
+        with requests_mock.Mocker() as req:
+            req.get(f"{LOCALHOST}/vlan", json={"result": []})
+            self.infoblox_client.get_vlans()
+
+        self.assertEqual(req.last_request.qs["_return_fields"], ["id,name,status"])
+
     def test_request_success_generic(self):
         """Test generic _request with OK status."""
         with requests_mock.Mocker() as req:
@@ -116,6 +137,141 @@ class TestInfobloxTest(unittest.TestCase):
             resp = self.infoblox_client._request("GET", "test_url")
         self.assertEqual(resp.status_code, 200)
 
+    def test_request_reuses_session_and_cookie(self):
+        """Test requests share one session and only the first call uses basic auth."""
+        with requests_mock.Mocker() as req:
+            req.get(f"{LOCALHOST}/test_url", cookies={"ibapauth": "mock-cookie"})
+            self.infoblox_client._request("GET", "test_url")
+            self.infoblox_client._request("GET", "test_url")
+        first, second = req.request_history
+        self.assertIn("Authorization", first.headers)
+        self.assertNotIn("Authorization", second.headers)
+        self.assertIn("ibapauth=mock-cookie", second.headers["Cookie"])
+        self.assertEqual(self.infoblox_client.cookie, {"ibapauth": "mock-cookie"})
+
+    def test_request_reuses_cached_cookie_in_new_client(self):
+        """Test a new client reuses the ibapauth cookie cached encrypted by a previous one instead of logging in."""
+        with requests_mock.Mocker() as req:
+            req.get(f"{LOCALHOST}/test_url", cookies={"ibapauth": "mock-cookie"})
+            self.infoblox_client._request("GET", "test_url")
+            localhost_client_infoblox(LOCALHOST)._request("GET", "test_url")
+
+        self.assertNotIn(b"mock-cookie", cache.get(self.infoblox_client._auth_cookie_key()))
+        first, second = req.request_history
+        self.assertIn("Authorization", first.headers)
+        self.assertNotIn("Authorization", second.headers)
+        self.assertIn("ibapauth=mock-cookie", second.headers["Cookie"])
+
+    def test_request_logs_in_again_on_rejected_cookie(self):
+        """Test an expired ibapauth cookie is dropped and the request is sent again with basic auth."""
+        self.infoblox_client._set_cached_auth_cookie("expired-cookie")
+        with requests_mock.Mocker() as req:
+            req.get(
+                f"{LOCALHOST}/test_url",
+                [{"status_code": 401}, {"status_code": 200, "cookies": {"ibapauth": "new-cookie"}}],
+            )
+            resp = self.infoblox_client._request("GET", "test_url")
+
+        self.assertEqual(resp.status_code, 200)
+        first, second = req.request_history
+        self.assertIn("ibapauth=expired-cookie", first.headers["Cookie"])
+        self.assertIn("Authorization", second.headers)
+        self.assertEqual(self.infoblox_client.cookie, {"ibapauth": "new-cookie"})
+        self.assertEqual(self.infoblox_client._get_cached_auth_cookie(), {"ibapauth": "new-cookie"})
+
+    def test_session_connection_pool_size(self):
+        """Test the session mounts an HTTPS adapter with the requested pool size."""
+        infoblox_client = client.InfobloxApi(  # nosec
+            url=LOCALHOST, username="test-user", password="test-password", verify_ssl=False, pool_size=25
+        )
+        adapter = infoblox_client.session.get_adapter(LOCALHOST)
+        self.assertEqual(adapter._pool_maxsize, 25)
+
+    @patch("nautobot_ssot_infoblox.utils.client.time.sleep")
+    def test_request_retries_throttled_get(self, mock_sleep):
+        """Test a throttled GET is retried after the delay requested with Retry-After."""
+        with requests_mock.Mocker() as req:
+            req.get(
+                f"{LOCALHOST}/test_url",
+                [{"status_code": 429, "headers": {"Retry-After": "2"}}, {"status_code": 503}, {"status_code": 200}],
+            )
+            resp = self.infoblox_client._request("GET", "test_url")
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(req.call_count, 3)
+        self.assertEqual(mock_sleep.call_args_list[0].args, (2.0,))
+        self.assertEqual(self.infoblox_client.retry_stats["retries"], 2)
+        self.assertEqual(self.infoblox_client.retry_stats["throttled"], 1)
+        self.assertEqual(self.infoblox_client.retry_stats["unavailable"], 1)
+
+    @patch("nautobot_ssot_infoblox.utils.client.time.sleep")
+    def test_request_retries_read_only_multi_object_request(self, mock_sleep):
+        """Test a multi-object request that only reads is retried while a create is not."""
+        read = json.dumps([{"method": "GET", "object": "ipv4address", "data": {}}])
+        create = json.dumps([{"method": "POST", "object": "network", "data": {"network": "10.0.0.0/24"}}])
+        with requests_mock.Mocker() as req:
+            req.post(f"{LOCALHOST}/request", [{"status_code": 503}, {"status_code": 201, "json": [[]]}])
+            resp = self.infoblox_client._request("POST", "request", data=read)
+            self.assertEqual(resp.status_code, 201)
+            req.post(f"{LOCALHOST}/request", [{"status_code": 503}, {"status_code": 201, "json": [[]]}])
+            with pytest.raises(HTTPError):
+                self.infoblox_client._request("POST", "request", data=create)
+
+        self.assertEqual(req.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 1)
+
+    @patch("nautobot_ssot_infoblox.utils.client.time.sleep")
+    def test_request_does_not_retry_writes(self, mock_sleep):
+        """Test updates and deletes are not retried as they may have been applied before failing."""
+        for method in ["PUT", "DELETE"]:
+            with requests_mock.Mocker() as req:
+                req.register_uri(method, f"{LOCALHOST}/network/1", [{"status_code": 503}, {"status_code": 200}])
+                with pytest.raises(HTTPError):
+                    self.infoblox_client._request(method, "network/1")
+
+            self.assertEqual(req.call_count, 1)
+        mock_sleep.assert_not_called()
+
+    @patch("nautobot_ssot_infoblox.utils.client.time.sleep")
+    def test_request_retry_budget_exhausted(self, mock_sleep):
+        """Test retries stop once the elapsed time budget would be exceeded."""
+        self.infoblox_client.retry_max_elapsed = 5
+        with requests_mock.Mocker() as req:
+            req.get(f"{LOCALHOST}/test_url", status_code=503, headers={"Retry-After": "10"})
+            with pytest.raises(HTTPError) as err:
+                self.infoblox_client._request("GET", "test_url")
+
+        self.assertEqual(err.value.response.status_code, 503)
+        self.assertEqual(req.call_count, 1)
+        mock_sleep.assert_not_called()
+
+    def test_json_logs_truncated_payload_at_debug(self):
+        """Test responses are decoded once and logged at DEBUG with an object count, truncated."""
+        self.infoblox_client.log_payload_size = 20
+        payload = [{"_ref": f"network/{idx}", "network": f"10.0.{idx}.0/24"} for idx in range(10)]
+        with requests_mock.Mocker() as req:
+            req.get(f"{LOCALHOST}/network", json=payload)
+            response = self.infoblox_client._request("GET", "network")
+            with self.assertLogs(client.logger, level="DEBUG") as logs:
+                self.assertEqual(self.infoblox_client._json(response), payload)
+
+        self.assertEqual(len(logs.records), 1)
+        message = logs.records[0].getMessage()
+        self.assertTrue(message.startswith("GET /"))
+        self.assertIn("/network returned 10 objects: [{'_ref': 'network/0... (", message)
+        self.assertTrue(message.endswith("characters truncated)"))
+
+    @patch("nautobot_ssot_infoblox.utils.client.repr", create=True)
+    def test_json_skips_formatting_without_debug(self, mock_repr):
+        """Test payloads are not formatted when DEBUG logging is disabled."""
+        with requests_mock.Mocker() as req:
+            req.get(f"{LOCALHOST}/network", json=[{"network": "10.0.0.0/24"}])
+            response = self.infoblox_client._request("GET", "network")
+            with patch.object(client.logger, "isEnabledFor", return_value=False):
+                self.infoblox_client._json(response)
+
+        mock_repr.assert_not_called()
+
     def test_get_all_ipv4_address_networks_success(self):
         """Test get_all_ipv4_address_networks success."""
         mock_prefix = "10.220.0.100/31"
@@ -187,6 +343,47 @@ class TestInfobloxTest(unittest.TestCase):
             resp = self.infoblox_client.get_all_ipv4address_networks(prefixes=prefixes)
         self.assertEqual(resp, get_all_ipv4address_networks_bulk()[0])
 
+    def test_get_all_ipv4_address_networks_concurrent_matches_sequential(self):
+        """Test fetching IP address batches with a thread pool returns the same result as the sequential path."""
+        prefixes = [(f"10.0.{octet}.0/23", "default") for octet in range(0, 16, 2)]
+        mock_uri = "request"
+
+        def ipaddrs_by_prefix(request, context):
+            context.status_code = 201
+            return [[{"ip_address": query["data"]["network"]} for query in request.json()]]
+
+        concurrent_client = client.InfobloxApi(  # nosec
+            url=LOCALHOST, username="test-user", password="test-password", verify_ssl=False, request_workers=4
+        )
+        with requests_mock.Mocker() as req:
+            req.post(f"{LOCALHOST}/{mock_uri}", json=ipaddrs_by_prefix)
+            sequential = self.infoblox_client.get_all_ipv4address_networks(prefixes=prefixes)
+            concurrent = concurrent_client.get_all_ipv4address_networks(prefixes=prefixes)
+
+        self.assertEqual(len(sequential), len(prefixes))
+        self.assertEqual(concurrent, sequential)
+
+    def test_get_all_ipv4_address_networks_merges_every_query(self):
+        """Test the results of every query in a batch are returned and used to plan the next run."""
+        prefixes = [("10.0.0.0/24", "default"), ("10.0.1.0/24", "default"), ("10.0.4.0/22", "default")]
+        mock_uri = "request"
+
+        def ipaddrs_by_prefix(request, context):
+            context.status_code = 201
+            return [[{"ip_address": query["data"]["network"]}] for query in request.json()]
+
+        with requests_mock.Mocker() as req:
+            req.post(f"{LOCALHOST}/{mock_uri}", json=ipaddrs_by_prefix)
+            first_run = self.infoblox_client.get_all_ipv4address_networks(prefixes=prefixes)
+            self.assertEqual(req.call_count, 2)
+            second_run = self.infoblox_client.get_all_ipv4address_networks(prefixes=prefixes)
+            self.assertEqual(req.call_count, 3)
+
+        self.assertEqual([x["ip_address"] for x in first_run], [x[0] for x in prefixes])
+        self.assertEqual(second_run, first_run)
+        self.assertEqual(req.request_history[-1].json()[2]["args"]["_max_results"], 1024)
+        self.assertEqual(self.infoblox_client.ipv4_batch_stats[0]["returned"], 3)
+
     def test_get_host_record_by_name_success(self):
         """Test get_host_by_record success."""
         mock_fqdn = "test.fqdn.com"
@@ -382,6 +579,124 @@ class TestInfobloxTest(unittest.TestCase):
 
         self.assertEqual(response, [])
 
+    def test_iter_subnets_follows_pages(self):
+        """Test iter_subnets requests the next page until no next_page_id is returned."""
+        subnets = get_all_subnets()["result"]
+        mock_uri = "network"
+
+        with requests_mock.Mocker() as req:
+            req.get(
+                f"{LOCALHOST}/{mock_uri}",
+                [
+                    {"json": {"result": subnets[:1], "next_page_id": "mock-page-2"}, "status_code": 200},
+                    {"json": {"result": subnets[1:]}, "status_code": 200},
+                ],
+            )
+            pages = list(self.infoblox_client.iter_subnets())
+
+        self.assertEqual(pages, [subnets[:1], subnets[1:]])
+        first, second = req.request_history
+        self.assertEqual(first.qs["_paging"], ["1"])
+        self.assertEqual(first.qs["_max_results"], [str(self.infoblox_client.page_size)])
+        self.assertEqual(second.qs, {"_page_id": ["mock-page-2"]})
+
+    def test_get_network_containers_paged(self):
+        """Test get_network_containers joins all pages and marks them as containers."""
+        mock_uri = "networkcontainer"
+        page1 = [{"network": "10.0.0.0/8", "network_view": "default"}]
+        page2 = [{"network": "172.16.0.0/12", "network_view": "default"}]
+
+        with requests_mock.Mocker() as req:
+            req.get(
+                f"{LOCALHOST}/{mock_uri}",
+                [
+                    {"json": {"result": page1, "next_page_id": "mock-page-2"}, "status_code": 200},
+                    {"json": {"result": page2}, "status_code": 200},
+                ],
+            )
+            resp = self.infoblox_client.get_network_containers()
+
+        self.assertEqual([x["network"] for x in resp], ["10.0.0.0/8", "172.16.0.0/12"])
+        self.assertTrue(all(x["status"] == "container" for x in resp))
+
+    def test_update_network_uses_ref_index_from_load(self):
+        """Test network and container _refs seen while loading are reused without another lookup."""
+        net_ref = "network/ZG5zLm5ldHdvcmskMTAuMC4wLjAvMjQvMA:10.0.0.0/24/default"
+        container_ref = "networkcontainer/ZG5zLm5ldHdvcmtfY29udGFpbmVyJDEwLjAuMC4wLzgvMA:10.0.0.0/8/default"
+        with requests_mock.Mocker() as req:
+            req.get(f"{LOCALHOST}/network", json={"result": [{"_ref": net_ref, "network": "10.0.0.0/24"}]})
+            req.get(
+                f"{LOCALHOST}/networkcontainer", json={"result": [{"_ref": container_ref, "network": "10.0.0.0/8"}]}
+            )
+            req.put(f"{LOCALHOST}/{net_ref}", json=net_ref)
+            req.delete(f"{LOCALHOST}/{container_ref}", json=container_ref)
+            self.infoblox_client.get_all_subnets()
+            self.infoblox_client.get_network_containers()
+            lookups = req.call_count
+            updated = self.infoblox_client.update_network(prefix="10.0.0.0/24", comment="updated")
+            deleted = self.infoblox_client.delete_network_container(prefix="10.0.0.0/8")
+
+        self.assertEqual(updated, {"updated": net_ref})
+        self.assertEqual(deleted, {"deleted": container_ref})
+        self.assertEqual(req.call_count, lookups + 2)
+        self.assertNotIn("10.0.0.0/8", self.infoblox_client._refs["networkcontainer"])
+
+    def test_get_network_container_ref_falls_back_to_query(self):
+        """Test a _ref missing from the index is looked up with a filtered query and then remembered."""
+        container_ref = "networkcontainer/ZG5zLm5ldHdvcmtfY29udGFpbmVyJDEwLjAuMC4wLzgvMA:10.0.0.0/8/default"
+        with requests_mock.Mocker() as req:
+            req.get(f"{LOCALHOST}/networkcontainer", json=[{"_ref": container_ref, "network": "10.0.0.0/8"}])
+            self.assertEqual(self.infoblox_client._get_network_container_ref("10.0.0.0/8"), container_ref)
+            self.assertEqual(self.infoblox_client._get_network_container_ref("10.0.0.0/8"), container_ref)
+
+        self.assertEqual(req.call_count, 1)
+        self.assertEqual(req.last_request.qs, {"network": ["10.0.0.0/8"]})
+
+    def test_multi_request_sends_items_and_indexes_refs(self):
+        """Test multi_request sends all items in one request and keeps the _ref index current."""
+        net_ref = "network/ZG5zLm5ldHdvcmskMTAuMC4wLjAvMjQvMA:10.0.0.0/24/default"
+        container_ref = "networkcontainer/ZG5zLm5ldHdvcmtfY29udGFpbmVyJDEwLjAuMC4wLzgvMA:10.0.0.0/8/default"
+        self.infoblox_client._refs["networkcontainer"]["10.0.0.0/8"] = container_ref
+        items = [
+            self.infoblox_client.network_request("POST", prefix="10.0.0.0/24", comment="new"),
+            self.infoblox_client.network_request("DELETE", prefix="10.0.0.0/8", network_type="networkcontainer"),
+        ]
+        with requests_mock.Mocker() as req:
+            req.post(f"{LOCALHOST}/request", json=[net_ref, container_ref])
+            resp = self.infoblox_client.multi_request(items)
+
+        self.assertEqual(resp, [net_ref, container_ref])
+        self.assertEqual(req.call_count, 1)
+        self.assertEqual(
+            req.last_request.json(),
+            [
+                {"method": "POST", "object": "network", "data": {"network": "10.0.0.0/24", "comment": "new"}},
+                {"method": "DELETE", "object": container_ref},
+            ],
+        )
+        self.assertEqual(self.infoblox_client._refs, {"network": {"10.0.0.0/24": net_ref}, "networkcontainer": {}})
+
+    def test_get_ipaddr_ref_prefers_host_record(self):
+        """Test get_ipaddr_ref picks the host record or fixed address of an ipv4address record."""
+        host_ref = "record:host/ZG5zLmhvc3QkLl9kZWZhdWx0LnRlc3QudGVzdGRldmljZTE:testdevice1.test/default"
+        fixed_ref = "fixedaddress/ZG5zLmZpeGVkX2FkZHJlc3MkMTAuMjIwLjAuMy4wLi4:10.220.0.3/default"
+        lease_ref = "lease/ZG5zLmxlYXNlJC8xMC4yMjAuMC4zLzAvMA:10.220.0.3/default"
+        self.assertEqual(self.infoblox_client.get_ipaddr_ref({"objects": [lease_ref, fixed_ref, host_ref]}), host_ref)
+        self.assertEqual(self.infoblox_client.get_ipaddr_ref({"objects": [lease_ref, fixed_ref]}), fixed_ref)
+        self.assertIsNone(self.infoblox_client.get_ipaddr_ref({"objects": [lease_ref]}))
+
+    def test_update_ipaddress_with_ref_skips_search(self):
+        """Test update_ipaddress goes straight to the passed _ref and only searches without one."""
+        fixed_ref = "fixedaddress/ZG5zLmZpeGVkX2FkZHJlc3MkMTAuMjIwLjAuMy4wLi4:10.220.0.3/default"
+        with requests_mock.Mocker() as req:
+            req.get(f"{LOCALHOST}/search", json=[{"_ref": fixed_ref}])
+            req.put(f"{LOCALHOST}/{fixed_ref}", json=fixed_ref)
+            self.infoblox_client.update_ipaddress(ip_address="10.220.0.3", ref=fixed_ref, data={"comment": "new"})
+            self.assertEqual([request.method for request in req.request_history], ["PUT"])
+            self.infoblox_client.update_ipaddress(ip_address="10.220.0.3", data={"comment": "new"})
+
+        self.assertEqual([request.method for request in req.request_history], ["PUT", "GET", "PUT"])
+
     def test_get_authoritative_zone_success(self):
         """Test get_authoritative_zone success."""
         mock_response = get_authoritative_zone()
@@ -0,0 +1,50 @@
+"""Unit tests for the Infoblox DiffSync adapter."""
+import unittest
+from unittest.mock import MagicMock, patch
+
+from requests.exceptions import HTTPError
+
+from nautobot_ssot_infoblox.constant import PLUGIN_CFG
+from nautobot_ssot_infoblox.diffsync.adapters.infoblox import InfobloxAdapter
+
+CONTAINERS = [{"network": "10.0.0.0/16", "network_view": "default"}]
+SUBNETS = [{"network": "10.0.0.0/24", "network_view": "default"}]
+
+
+def failing_pages(*pages):
+    """Yield `pages` then raise an HTTPError like a failed WAPI read."""
+    yield from pages
+    raise HTTPError(response=MagicMock(text="Error: network not found"))
+
+
+class TestInfobloxAdapter(unittest.TestCase):
+    """Test InfobloxAdapter."""
+
+    def setUp(self):
+        """Set up an adapter over a mocked client."""
+        self.job = MagicMock(kwargs={})
+        self.conn = MagicMock()
+        self.adapter = InfobloxAdapter(job=self.job, sync=None, conn=self.conn)
+
+    def test_load_prefixes_logs_errors_loading_subnets(self):
+        """Validate an error reading Networks is logged and the Prefixes loaded until then are kept."""
+        self.conn.iter_network_containers.return_value = [CONTAINERS]
+        self.conn.iter_subnets.side_effect = lambda prefix=None: failing_pages(SUBNETS)
+        with patch.dict(PLUGIN_CFG, {"import_subnets": None}):
+            self.adapter.load_prefixes()
+        self.assertEqual(sorted(pf.network for pf in self.adapter.get_all("prefix")), ["10.0.0.0/16", "10.0.0.0/24"])
+        self.job.log_warning.assert_called_once_with(
+            message="Unable to load Networks from Infoblox. Error: network not found"
+        )
+
+    def test_load_prefixes_continues_after_failed_import_subnet(self):
+        """Validate an error reading the Networks of one of `import_subnets` doesn't prevent loading the others."""
+        self.conn.iter_subnets.side_effect = lambda prefix=None: (
+            failing_pages() if prefix == "10.1.0.0/16" else iter([SUBNETS])
+        )
+        with patch.dict(PLUGIN_CFG, {"import_subnets": ["10.1.0.0/16", "10.0.0.0/16"]}):
+            self.adapter.load_prefixes()
+        self.assertEqual([pf.network for pf in self.adapter.get_all("prefix")], ["10.0.0.0/24"])
+        self.job.log_warning.assert_called_once_with(
+            message="Unable to load Networks within 10.1.0.0/16 from Infoblox. Error: network not found"
+        )
@@ -0,0 +1,219 @@
+"""Unit tests for the Nautobot DiffSync adapter."""
+import datetime
+from unittest.mock import MagicMock
+
+from diffsync.exceptions import ObjectNotFound
+from django.contrib.contenttypes.models import ContentType
+from nautobot.extras.choices import CustomFieldTypeChoices, ObjectChangeActionChoices
+from nautobot.extras.context_managers import web_request_context
+from nautobot.extras.models import CustomField, ObjectChange, Status, TaggedItem
+from nautobot.ipam.models import RIR, VLAN, Aggregate, IPAddress, Prefix
+from nautobot.utilities.testing import TestCase
+
+from nautobot_ssot_infoblox.diffsync.adapters.nautobot import NautobotAdapter, NautobotAggregateAdapter
+from nautobot_ssot_infoblox.utils.nautobot import get_prefix_vlans
+
+
+class TestNautobotAdapter(TestCase):
+    """Test NautobotAdapter."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create nested Prefixes and IP Addresses inside and outside of them."""
+        active, _ = Status.objects.get_or_create(slug="active", defaults={"name": "Active"})
+        container, _ = Status.objects.get_or_create(slug="container", defaults={"name": "Container"})
+        Prefix.objects.create(prefix="10.0.0.0/16", status=container)
+        Prefix.objects.create(prefix="10.0.1.0/24", status=active)
+        Prefix.objects.create(prefix="10.0.1.128/25", status=active)
+        for address in ["10.0.1.5/24", "10.0.1.200/24", "10.0.2.5/16", "192.168.0.1/24"]:
+            IPAddress.objects.create(address=address, status=active)
+
+    def setUp(self):
+        """Load Prefixes and IP Addresses into a NautobotAdapter."""
+        super().setUp()
+        self.job = MagicMock(kwargs={})
+        self.adapter = NautobotAdapter(job=self.job, sync=None)
+        self.adapter.load_prefixes()
+        self.adapter.load_ipaddresses()
+
+    def test_load_ipaddresses_uses_most_specific_parent(self):
+        """Validate IP Addresses are loaded with the most specific Prefix containing them."""
+        loaded = {ip.address: (ip.prefix, ip.prefix_length) for ip in self.adapter.get_all("ipaddress")}
+        self.assertEqual(loaded, {"10.0.1.5": ("10.0.1.0/24", 24), "10.0.1.200": ("10.0.1.128/25", 25)})
+
+    def test_load_ipaddresses_skips_container_and_orphan_addresses(self):
+        """Validate IP Addresses within a container Prefix or without a parent Prefix are skipped with a warning."""
+        messages = [call.kwargs["message"] for call in self.job.log_warning.call_args_list]
+        self.assertIn(
+            "IP Address 10.0.2.5's parent prefix is a container. The parent prefix status must not be 'container'.",
+            messages,
+        )
+        self.assertIn("IP Address 192.168.0.1 does not have a parent prefix and will not be synced.", messages)
+
+    def test_tag_involved_objects(self):
+        """Validate objects synced to the target are tagged and stamped once, and other objects are left alone."""
+
+        def get(modelname, unique_id):
+            if unique_id.startswith("10.0.1.200"):
+                raise ObjectNotFound(f"{modelname} {unique_id}")
+            return self.adapter.get(modelname, unique_id)
+
+        target = MagicMock(get=get)
+        self.adapter.tag_involved_objects(target=target)
+        today = datetime.date.today().isoformat()
+        synced = IPAddress.objects.get(host="10.0.1.5")
+        self.assertEqual([tag.slug for tag in synced.tags.all()], ["ssot-synced-to-infoblox"])
+        self.assertEqual(synced.cf["ssot-synced-to-infoblox"], today)
+        skipped = IPAddress.objects.get(host="10.0.1.200")
+        self.assertFalse(skipped.tags.exists())
+        self.assertNotIn("ssot-synced-to-infoblox", skipped.cf)
+        self.assertEqual(Prefix.objects.filter(tags__slug="ssot-synced-to-infoblox").count(), 3)
+        self.assertEqual(
+            Prefix.objects.filter(_custom_field_data__contains={"ssot-synced-to-infoblox": today}).count(), 3
+        )
+
+        tagged = TaggedItem.objects.count()
+        self.adapter.tag_involved_objects(target=target)
+        self.assertEqual(TaggedItem.objects.count(), tagged)
+
+    def create_objects(self):
+        """Create a VLAN Group, a VLAN, a Prefix related to the VLAN and an IP Address, then run sync_complete."""
+        self.adapter = NautobotAdapter(job=self.job, sync=None)
+        self.adapter.load()
+        self.adapter.vlangroup.create(
+            diffsync=self.adapter, ids={"name": "New VLANs"}, attrs={"description": "", "ext_attrs": {}}
+        )
+        self.adapter.vlan.create(
+            diffsync=self.adapter,
+            ids={"vid": 10, "name": "New VLAN", "vlangroup": "New VLANs"},
+            attrs={"status": "ASSIGNED", "description": "", "ext_attrs": {}},
+        )
+        self.adapter.prefix.create(
+            diffsync=self.adapter,
+            ids={"network": "10.1.0.0/24"},
+            attrs={
+                "status": "active",
+                "description": "",
+                "ext_attrs": {},
+                "vlans": {10: {"vid": 10, "name": "New VLAN", "group": "New VLANs"}},
+            },
+        )
+        self.adapter.ipaddress.create(
+            diffsync=self.adapter,
+            ids={"address": "10.1.0.5", "prefix": "10.1.0.0/24", "prefix_length": 24},
+            attrs={"status": "Active", "description": "", "dns_name": "", "ext_attrs": {}},
+        )
+        self.adapter.sync_complete(source=None)
+
+    def test_sync_complete_tags_created_objects(self):
+        """Validate objects bulk created by sync_complete are tagged as synced from Infoblox."""
+        self.create_objects()
+        for model, lookup in [
+            (VLAN, {"vid": 10}),
+            (Prefix, {"network": "10.1.0.0"}),
+            (IPAddress, {"host": "10.1.0.5"}),
+        ]:
+            created = model.objects.get(**lookup)
+            self.assertEqual([tag.slug for tag in created.tags.all()], ["ssot-synced-from-infoblox"])
+
+    def test_sync_complete_relates_created_prefixes_to_vlans(self):
+        """Validate Prefix -> VLAN Relationship Associations are created along with their Prefix."""
+        self.create_objects()
+        prefix = Prefix.objects.get(network="10.1.0.0")
+        self.assertEqual([vlan.vid for vlan in get_prefix_vlans(prefix=prefix)], [10])
+
+    def test_sync_complete_saves_valid_updates(self):
+        """Validate queued updates are saved by sync_complete, skipping objects failing validation with a warning."""
+        self.adapter.get("ipaddress", "10.0.1.5__10.0.1.0/24__24").update({"description": "Updated"})
+        self.adapter.get("ipaddress", "10.0.1.200__10.0.1.128/25__25").update({"dns_name": "not a DNS name!"})
+        self.adapter.sync_complete(source=None)
+        self.assertEqual(IPAddress.objects.get(host="10.0.1.5").description, "Updated")
+        self.assertEqual(IPAddress.objects.get(host="10.0.1.200").dns_name, "")
+        messages = [call.kwargs["message"] for call in self.job.log_warning.call_args_list]
+        self.assertTrue(any(message.startswith("Unable to update IP address 10.0.1.200/24.") for message in messages))
+
+    def test_sync_complete_runs_model_validation_on_updates(self):
+        """Validate updates are checked by the model's clean(), e.g. the values of Custom Fields."""
+        field = CustomField.objects.create(name="vlan_count", type=CustomFieldTypeChoices.TYPE_INTEGER)
+        field.content_types.add(ContentType.objects.get_for_model(IPAddress))
+        self.adapter.get("ipaddress", "10.0.1.5__10.0.1.0/24__24").update(
+            {"description": "Updated", "ext_attrs": {"vlan_count": "many"}}
+        )
+        self.adapter.sync_complete(source=None)
+        self.assertEqual(IPAddress.objects.get(host="10.0.1.5").description, "")
+        messages = [call.kwargs["message"] for call in self.job.log_warning.call_args_list]
+        self.assertTrue(any(message.startswith("Unable to update IP address 10.0.1.5/24.") for message in messages))
+
+    def test_sync_complete_logs_changes_of_updates(self):
+        """Validate updates saved in bulk are recorded in the change log of the change context."""
+        self.adapter.get("ipaddress", "10.0.1.5__10.0.1.0/24__24").update({"description": "Updated"})
+        with web_request_context(self.user):
+            self.adapter.sync_complete(source=None)
+        change = ObjectChange.objects.get(changed_object_id=IPAddress.objects.get(host="10.0.1.5").id)
+        self.assertEqual(change.action, ObjectChangeActionChoices.ACTION_UPDATE)
+        self.assertEqual(change.user, self.user)
+        self.assertEqual(change.object_data["description"], "Updated")
+        self.assertEqual(change.object_data_v2["description"], "Updated")
+        self.assertEqual(change.object_repr, "10.0.1.5/24")
+
+    def test_lookup_maps_are_per_adapter_and_released(self):
+        """Validate lookup maps are not shared between adapters and are emptied once the sync is complete."""
+        other = NautobotAdapter(job=self.job, sync=None)
+        self.assertNotEqual(self.adapter.prefix_map, {})
+        self.assertEqual(other.prefix_map, {})
+        self.assertIsNot(self.adapter.vlan_map, other.vlan_map)
+        self.adapter.sync_complete(source=None)
+        self.assertEqual(self.adapter.prefix_map, {})
+        self.assertEqual(len(self.adapter.prefix_index), 0)
+
+    def test_sync_complete_skips_objects_failing_to_save(self):
+        """Validate an object failing to save is skipped with a warning, the rest of its chunk is saved and tagged."""
+        self.adapter = NautobotAdapter(job=self.job, sync=None)
+        self.adapter.load()
+        self.adapter.vlangroup.create(
+            diffsync=self.adapter, ids={"name": "New VLANs"}, attrs={"description": "", "ext_attrs": {}}
+        )
+        for name in ["First", "Duplicate", "Second"]:
+            self.adapter.vlan.create(
+                diffsync=self.adapter,
+                ids={"vid": 20 if name == "Second" else 10, "name": name, "vlangroup": "New VLANs"},
+                attrs={"status": "ASSIGNED", "description": "", "ext_attrs": {}},
+            )
+        self.adapter.sync_complete(source=None)
+        created = VLAN.objects.filter(group__name="New VLANs", tags__slug="ssot-synced-from-infoblox")
+        self.assertEqual(sorted(created.values_list("name", flat=True)), ["First", "Second"])
+        messages = [call.kwargs["message"] for call in self.job.log_warning.call_args_list]
+        self.assertTrue(any(message.startswith("Unable to create VLAN Duplicate") for message in messages))
+
+
+class TestNautobotAggregateAdapter(TestCase):
+    """Test NautobotAggregateAdapter."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create an Aggregate."""
+        rir = RIR.objects.create(name="RFC1918", slug="rfc1918", is_private=True)
+        Aggregate.objects.create(prefix="10.0.0.0/8", rir=rir)
+
+    def setUp(self):
+        """Load the Aggregates into a NautobotAggregateAdapter."""
+        super().setUp()
+        self.job = MagicMock(kwargs={})
+        self.adapter = NautobotAggregateAdapter(job=self.job, sync=None)
+        self.adapter.load()
+
+    def test_sync_complete_creates_valid_aggregates(self):
+        """Validate created Aggregates are saved, tagged and logged, skipping overlapping ones with a warning."""
+        for network in ["172.16.0.0/12", "172.16.0.0/16", "10.1.0.0/16", "192.168.0.0/16"]:
+            self.adapter.aggregate.create(
+                diffsync=self.adapter, ids={"network": network}, attrs={"description": "New", "ext_attrs": {}}
+            )
+        with web_request_context(self.user):
+            self.adapter.sync_complete(source=None)
+        created = Aggregate.objects.filter(description="New", tags__slug="ssot-synced-from-infoblox")
+        self.assertEqual(sorted(str(aggregate) for aggregate in created), ["172.16.0.0/12", "192.168.0.0/16"])
+        changes = ObjectChange.objects.filter(user=self.user, action=ObjectChangeActionChoices.ACTION_CREATE)
+        self.assertEqual(sorted(change.object_repr for change in changes), ["172.16.0.0/12", "192.168.0.0/16"])
+        messages = [call.kwargs["message"] for call in self.job.log_warning.call_args_list]
+        for network in ["172.16.0.0/16", "10.1.0.0/16"]:
+            self.assertTrue(any(message.startswith(f"Unable to create aggregate {network}.") for message in messages))
@@ -0,0 +1,242 @@
+"""Query count tests of the Nautobot adapters and models.
+
+Every path is run on enough objects that a query per object exceeds its bound, so N+1 regressions fail. Writes are
+also run within a change context, so the ObjectChanges recorded for them are counted too.
+"""
+from unittest.mock import MagicMock
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from nautobot.extras.choices import ObjectChangeActionChoices
+from nautobot.extras.context_managers import web_request_context
+from nautobot.extras.models import ObjectChange
+from nautobot.ipam.models import RIR, VLAN, Aggregate, IPAddress, Prefix
+from nautobot.tenancy.models import Tenant
+from nautobot.utilities.testing import TestCase
+
+from nautobot_ssot_infoblox.diffsync.adapters.nautobot import NautobotAdapter, NautobotAggregateAdapter
+from nautobot_ssot_infoblox.tests.benchmarks.seed import SeededNautobot, create_items, ext_attrs
+
+NUM_OBJECTS = 30
+NUM_ATTRS = 2
+# Upper bounds on the queries of a load, tagging run, or a batch of creates or updates and their sync_complete.
+MAX_LOADER_QUERIES = 5
+MAX_LOAD_QUERIES = 25
+MAX_TAG_QUERIES = 20
+MAX_WRITE_QUERIES = 20
+# Upper bound on the further queries of a batch of creates or updates recording their ObjectChanges.
+MAX_CHANGELOG_QUERIES = 10
+
+
+class QueryCountTestCase(TestCase):
+    """TestCase asserting upper bounds on the queries issued."""
+
+    def assertQueriesAtMost(self, maximum: int, func, *args, **kwargs):  # pylint: disable=invalid-name
+        """Assert calling `func` issues at most `maximum` queries."""
+        with CaptureQueriesContext(connection) as queries:
+            func(*args, **kwargs)
+        self.assertLessEqual(len(queries), maximum, f"{func.__qualname__} issued {len(queries)} queries.")
+
+    def assertChangesRecordedAtMost(self, maximum: int, func, orm_model, action: str):  # pylint: disable=invalid-name
+        """Assert calling `func` within a change context issues at most `maximum` queries and records NUM_OBJECTS."""
+        user = get_user_model().objects.create(username="changelog")
+        with web_request_context(user):
+            self.assertQueriesAtMost(maximum, func)
+        changes = ObjectChange.objects.filter(
+            user=user, action=action, changed_object_type=ContentType.objects.get_for_model(orm_model)
+        )
+        self.assertEqual(changes.count(), NUM_OBJECTS)
+
+
+class TestNautobotAdapterQueries(QueryCountTestCase):  # pylint: disable=too-many-public-methods
+    """Test the number of queries of NautobotAdapter and its models does not grow with the number of objects."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Seed more Prefixes, IP Addresses and VLANs than any query bound."""
+        SeededNautobot(
+            containers=1,
+            subnets_per_container=NUM_OBJECTS,
+            ips_per_subnet=2,
+            vlan_groups=1,
+            vlans_per_group=NUM_OBJECTS,
+            custom_fields=NUM_ATTRS,
+        ).seed()
+
+    def setUp(self):
+        """Create a NautobotAdapter."""
+        super().setUp()
+        self.job = MagicMock(kwargs={})
+        self.adapter = NautobotAdapter(job=self.job, sync=None)
+
+    def test_load_prefixes(self):
+        """Validate load_prefixes issues a constant number of queries."""
+        self.assertQueriesAtMost(MAX_LOADER_QUERIES, self.adapter.load_prefixes)
+        self.assertEqual(len(self.adapter.get_all("prefix")), NUM_OBJECTS + 1)
+
+    def test_load_ipaddresses(self):
+        """Validate load_ipaddresses issues a constant number of queries."""
+        self.adapter.load_prefixes()
+        self.assertQueriesAtMost(MAX_LOADER_QUERIES, self.adapter.load_ipaddresses)
+        self.assertEqual(len(self.adapter.get_all("ipaddress")), 2 * NUM_OBJECTS)
+
+    def test_load_vlangroups(self):
+        """Validate load_vlangroups issues a constant number of queries."""
+        self.assertQueriesAtMost(MAX_LOADER_QUERIES, self.adapter.load_vlangroups)
+        self.assertEqual(len(self.adapter.get_all("vlangroup")), 1)
+
+    def test_load_vlans(self):
+        """Validate load_vlans issues a constant number of queries."""
+        self.assertQueriesAtMost(MAX_LOADER_QUERIES, self.adapter.load_vlans)
+        self.assertEqual(len(self.adapter.get_all("vlan")), NUM_OBJECTS)
+
+    def test_load(self):
+        """Validate load issues a constant number of queries."""
+        self.assertQueriesAtMost(MAX_LOAD_QUERIES, self.adapter.load)
+
+    def test_tag_involved_objects(self):
+        """Validate tag_involved_objects issues a constant number of queries and tags every synced object."""
+        self.adapter.load()
+        self.assertQueriesAtMost(MAX_TAG_QUERIES, self.adapter.tag_involved_objects, target=self.adapter)
+        for model in [Prefix, IPAddress]:
+            synced = model.objects.filter(tags__slug="ssot-synced-to-infoblox")
+            self.assertEqual(synced.count(), len(self.adapter.get_all(model._meta.model_name)))
+
+    def create(self, model: str, orm_model=None):
+        """Create NUM_OBJECTS new objects of a model then run sync_complete, asserting the queries issued.
+
+        With the ORM model of the objects, the objects are created within a change context and their creation must be
+        recorded.
+        """
+        self.adapter.load()
+        vlan = self.adapter.get_all("vlan")[0]
+        items = create_items(
+            model, NUM_OBJECTS, NUM_ATTRS, {"vid": vlan.vid, "name": vlan.name, "group": vlan.vlangroup}
+        )
+
+        def _create():
+            for item_model, ids, attrs in items:
+                getattr(self.adapter, item_model).create(diffsync=self.adapter, ids=ids, attrs=attrs)
+            self.adapter.sync_complete(source=None)
+
+        if orm_model:
+            self.assertChangesRecordedAtMost(
+                MAX_WRITE_QUERIES + MAX_CHANGELOG_QUERIES, _create, orm_model, ObjectChangeActionChoices.ACTION_CREATE
+            )
+        else:
+            self.assertQueriesAtMost(MAX_WRITE_QUERIES, _create)
+
+    def test_create_prefixes(self):
+        """Validate creating Prefixes issues a constant number of queries."""
+        self.create("prefix")
+
+    def test_create_ipaddresses(self):
+        """Validate creating IP Addresses issues a constant number of queries."""
+        self.create("ipaddress")
+
+    def test_create_vlangroups(self):
+        """Validate creating VLAN Groups issues a constant number of queries."""
+        self.create("vlangroup")
+
+    def test_create_vlans(self):
+        """Validate creating VLANs issues a constant number of queries."""
+        self.create("vlan")
+
+    def test_create_prefixes_changelog(self):
+        """Validate creating Prefixes and recording their changes issues a constant number of queries."""
+        self.create("prefix", Prefix)
+
+    def test_create_ipaddresses_changelog(self):
+        """Validate creating IP Addresses and recording their changes issues a constant number of queries."""
+        self.create("ipaddress", IPAddress)
+
+    def test_create_vlans_changelog(self):
+        """Validate creating VLANs and recording their changes issues a constant number of queries."""
+        self.create("vlan", VLAN)
+
+    def update(self, model: str, orm_model, changelog: bool = False):
+        """Update the description and Extensibility Attributes of loaded objects then run sync_complete.
+
+        With `changelog`, the objects are updated within a change context and their updates must be recorded.
+        """
+        self.adapter.load()
+        objects = self.adapter.get_all(model)[:NUM_OBJECTS]
+        self.assertEqual(len(objects), NUM_OBJECTS)
+
+        def _update():
+            for idx, obj in enumerate(objects):
+                obj.update({"description": f"Updated {idx}", "ext_attrs": ext_attrs(NUM_ATTRS, idx)})
+            self.adapter.sync_complete(source=None)
+
+        if changelog:
+            self.assertChangesRecordedAtMost(
+                MAX_WRITE_QUERIES + MAX_CHANGELOG_QUERIES, _update, orm_model, ObjectChangeActionChoices.ACTION_UPDATE
+            )
+        else:
+            self.assertQueriesAtMost(MAX_WRITE_QUERIES, _update)
+        updated = orm_model.objects.filter(pk__in=[obj.pk for obj in objects], description__startswith="Updated")
+        self.assertEqual(updated.count(), NUM_OBJECTS)
+
+    def test_update_prefixes(self):
+        """Validate updating Prefixes issues a constant number of queries."""
+        self.update("prefix", Prefix)
+
+    def test_update_ipaddresses(self):
+        """Validate updating IP Addresses issues a constant number of queries."""
+        self.update("ipaddress", IPAddress)
+
+    def test_update_vlans(self):
+        """Validate updating VLANs issues a constant number of queries."""
+        self.update("vlan", VLAN)
+
+    def test_update_prefixes_changelog(self):
+        """Validate updating Prefixes and recording their changes issues a constant number of queries."""
+        self.update("prefix", Prefix, changelog=True)
+
+    def test_update_ipaddresses_changelog(self):
+        """Validate updating IP Addresses and recording their changes issues a constant number of queries."""
+        self.update("ipaddress", IPAddress, changelog=True)
+
+    def test_update_vlans_changelog(self):
+        """Validate updating VLANs and recording their changes issues a constant number of queries."""
+        self.update("vlan", VLAN, changelog=True)
+
+
+class TestNautobotAggregateAdapterQueries(QueryCountTestCase):
+    """Test the number of queries of NautobotAggregateAdapter does not grow with the number of Aggregates."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create more Aggregates than the query bound."""
+        rir = RIR.objects.create(name="RFC1918", slug="rfc1918", is_private=True)
+        tenant = Tenant.objects.create(name="Infoblox", slug="infoblox")
+        for idx in range(NUM_OBJECTS):
+            Aggregate.objects.create(prefix=f"172.{16 + idx}.0.0/16", rir=rir, tenant=tenant)
+
+    def test_load(self):
+        """Validate load issues a constant number of queries."""
+        adapter = NautobotAggregateAdapter(job=MagicMock(kwargs={}), sync=None)
+        self.assertQueriesAtMost(MAX_LOADER_QUERIES, adapter.load)
+        self.assertEqual(len(adapter.get_all("aggregate")), NUM_OBJECTS)
+
+    def test_create(self):
+        """Validate creating Aggregates and recording their changes issues a constant number of queries."""
+        adapter = NautobotAggregateAdapter(job=MagicMock(kwargs={}), sync=None)
+        adapter.load()
+
+        def _create():
+            for idx in range(NUM_OBJECTS):
+                adapter.aggregate.create(
+                    diffsync=adapter,
+                    ids={"network": f"10.{idx}.0.0/16"},
+                    attrs={"description": "New", "ext_attrs": ext_attrs(NUM_ATTRS, idx)},
+                )
+            adapter.sync_complete(source=None)
+
+        self.assertChangesRecordedAtMost(
+            MAX_WRITE_QUERIES + MAX_CHANGELOG_QUERIES, _create, Aggregate, ObjectChangeActionChoices.ACTION_CREATE
+        )
+        created = Aggregate.objects.filter(description="New", tags__slug="ssot-synced-from-infoblox")
+        self.assertEqual(created.count(), NUM_OBJECTS)
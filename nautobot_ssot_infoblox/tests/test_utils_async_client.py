@@ -0,0 +1,133 @@
+"""Unit tests for the asyncio Infoblox client and concurrent adapter load."""
+import io
+import json
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+from urllib.parse import urlsplit
+
+from django.core.cache import cache
+from requests import Response
+from requests.adapters import BaseAdapter
+
+from nautobot_ssot_infoblox.constant import PLUGIN_CFG
+from nautobot_ssot_infoblox.diffsync.adapters.infoblox import InfobloxAdapter
+from nautobot_ssot_infoblox.tests.fixtures_infoblox import LOCALHOST, localhost_client_infoblox
+
+LATENCY = 0.2
+
+SUBNETS = [
+    {"_ref": "network/1:10.0.0.0/24/default", "network": "10.0.0.0/24", "network_view": "default", "comment": "net"},
+    {"_ref": "network/2:10.0.1.0/24/default", "network": "10.0.1.0/24", "network_view": "default", "comment": "net"},
+]
+CONTAINERS = [{"_ref": "networkcontainer/1:10.0.0.0/16/default", "network": "10.0.0.0/16", "network_view": "default"}]
+IPADDRS = [
+    [
+        {
+            "ip_address": "10.0.0.1",
+            "network": "10.0.0.0/24",
+            "names": ["host1.test"],
+            "objects": ["record:host/1:host1.test/default"],
+            "usage": ["DNS"],
+            "comment": "",
+        }
+    ],
+    [],
+]
+VLANVIEWS = [{"_ref": "vlanview/1:Nautobot/1/4094", "name": "Nautobot", "comment": ""}]
+VLANS = [{"_ref": "vlan/1:Nautobot/Servers/10", "id": 10, "name": "Servers", "status": "ASSIGNED", "comment": ""}]
+
+
+class FakeInfoblox(BaseAdapter):
+    """Transport adapter answering WAPI reads from canned data after LATENCY seconds, like a distant grid master.
+
+    The most requests it had to answer at once is kept in `max_in_flight`. Reads of the objects in `errors` fail.
+    """
+
+    responses = {
+        "network": {"result": SUBNETS},
+        "networkcontainer": {"result": CONTAINERS},
+        "request": IPADDRS,
+        "vlanview": VLANVIEWS,
+        "vlan": {"result": VLANS},
+    }
+
+    def __init__(self, errors=()):
+        """Initialize FakeInfoblox.
+
+        Args:
+            errors (tuple): Names of the WAPI objects whose reads return an error.
+        """
+        super().__init__()
+        self.errors = set(errors)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        """Return the canned response for the requested WAPI object."""
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(LATENCY)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+        name = urlsplit(request.url).path.rsplit("/", 1)[-1]
+        response = Response()
+        response.url = request.url
+        response.request = request
+        if name in self.errors:
+            response.status_code = 400
+            response.raw = io.BytesIO(b"Invalid request")
+            return response
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response.raw = io.BytesIO(json.dumps(self.responses[name]).encode())
+        response.cookies.set("ibapauth", "ip=127.0.0.1,client=API,user=test")
+        return response
+
+    def close(self):
+        """Nothing to close."""
+
+
+class TestAsyncLoad(unittest.TestCase):
+    """Test loading the Infoblox adapter through the asyncio client against a fake server with latency."""
+
+    def setUp(self):
+        """Set up the Infoblox client."""
+        self.conn = localhost_client_infoblox(LOCALHOST)
+
+    def load(self, async_load, errors=()):
+        """Load a new adapter from a new fake server, returning the adapter, its Job and the fake server."""
+        # Forget the IP address counts and login of other loads so every load starts from the same state.
+        cache.clear()
+        server = FakeInfoblox(errors=errors)
+        self.conn.session.mount("https://", server)
+        job = MagicMock(kwargs={})
+        adapter = InfobloxAdapter(job=job, sync=None, conn=self.conn)
+        with patch.dict(PLUGIN_CFG, {"infoblox_async_load": async_load}):
+            adapter.load()
+        return adapter, job, server
+
+    def test_async_load_matches_sequential_and_overlaps_requests(self):
+        """Validate the concurrent load returns the same models while overlapping the requests."""
+        sequential, _, sequential_server = self.load(async_load=False)
+        concurrent, _, concurrent_server = self.load(async_load=True)
+        self.assertEqual(concurrent.dict(), sequential.dict())
+        self.assertEqual(len(concurrent.get_all("prefix")), 3)
+        self.assertEqual(len(concurrent.get_all("ipaddress")), 1)
+        self.assertEqual(len(concurrent.get_all("vlan")), 1)
+        self.assertEqual(sequential_server.max_in_flight, 1)
+        self.assertGreater(concurrent_server.max_in_flight, 1)
+
+    def test_async_load_warns_of_network_errors_like_sequential(self):
+        """Validate the concurrent load logs the same warning as the sequential one when Networks can't be read."""
+        _, sequential_job, _ = self.load(async_load=False, errors=["network"])
+        concurrent, concurrent_job, _ = self.load(async_load=True, errors=["network"])
+        warning = "Unable to load Networks from Infoblox. Invalid request"
+        sequential_job.log_warning.assert_any_call(message=warning)
+        concurrent_job.log_warning.assert_any_call(message=warning)
+        self.assertEqual(len(concurrent.get_all("prefix")), 1)
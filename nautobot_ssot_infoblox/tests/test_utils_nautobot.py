@@ -1,9 +1,19 @@
 """Test utility methods for Nautobot."""
+from unittest.mock import patch
 from django.contrib.contenttypes.models import ContentType
-from nautobot.extras.models import Relationship, RelationshipAssociation, Status
-from nautobot.ipam.models import Prefix, VLAN, VLANGroup
-from nautobot.utilities.testing import TransactionTestCase
-from nautobot_ssot_infoblox.utils.nautobot import build_vlan_map_from_relations, get_prefix_vlans
+from django.core.exceptions import ValidationError
+from nautobot.extras.models import CustomField, Relationship, RelationshipAssociation, Status
+from nautobot.ipam.models import IPAddress, Prefix, VLAN, VRF, VLANGroup
+from nautobot.tenancy.models import Tenant
+from nautobot.utilities.testing import TestCase, TransactionTestCase
+from nautobot_ssot_infoblox.utils.nautobot import (
+    CustomFieldRegistry,
+    LookupCache,
+    build_vlan_map_from_relations,
+    get_prefix_vlan_map,
+    get_prefix_vlans,
+    write_with_savepoints,
+)
 
 
 class TestNautobotUtils(TransactionTestCase):
@@ -55,3 +65,120 @@ class TestNautobotUtils(TransactionTestCase):
         expected = []
         actual = get_prefix_vlans(self.test_pf)
         self.assertEqual(actual, expected)
+
+    def test_get_prefix_vlan_map(self):
+        """Validate functionality of the get_prefix_vlan_map() function."""
+        pf_vlan_rel = Relationship.objects.get(slug="prefix_to_vlan")
+        other_pf = Prefix.objects.get_or_create(prefix="192.168.2.0/24")[0]
+        for prefix, vlan in [
+            (self.test_pf, self.test_vlan2),
+            (self.test_pf, self.test_vlan1),
+            (other_pf, self.test_vlan1),
+        ]:
+            RelationshipAssociation.objects.create(
+                relationship_id=pf_vlan_rel.id,
+                source_type=ContentType.objects.get_for_model(Prefix),
+                source_id=prefix.id,
+                destination_type=ContentType.objects.get_for_model(VLAN),
+                destination_id=vlan.id,
+            )
+        with self.assertNumQueries(1):
+            actual = get_prefix_vlan_map()
+            groups = {vlan.group.name for vlans in actual.values() for vlan in vlans}
+        self.assertEqual(actual, {self.test_pf.id: [self.test_vlan1, self.test_vlan2], other_pf.id: [self.test_vlan1]})
+        self.assertEqual(groups, {"Test"})
+
+
+class TestCustomFieldRegistry(TestCase):
+    """Test CustomFieldRegistry."""
+
+    def setUp(self):
+        """Create a Custom Field applying to Prefixes."""
+        super().setUp()
+        self.existing = CustomField.objects.create(name="Existing", slug="existing", label="Existing")
+        self.existing.content_types.add(ContentType.objects.get_for_model(Prefix))
+        self.registry = CustomFieldRegistry()
+
+    def test_ensure_creates_missing_fields_and_links(self):
+        """Validate missing Custom Fields and content types are created, then found without queries."""
+        with patch("nautobot.extras.signals.provision_field") as provision_field:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(self.registry.ensure(["Existing", "New Attr"], IPAddress), {"Existing", "New Attr"})
+        new = CustomField.objects.get(name="New Attr")
+        content_type = ContentType.objects.get_for_model(IPAddress)
+        for field in [self.existing, new]:
+            provision_field.delay.assert_any_call(field.pk, {content_type.pk})
+        self.assertEqual((new.slug, new.label, new.type), ("new-attr", "New Attr", "text"))
+        for field in [self.existing, new]:
+            self.assertIn(ContentType.objects.get_for_model(IPAddress), field.content_types.all())
+        with self.assertNumQueries(0):
+            self.assertEqual(self.registry.ensure(["New Attr", "Existing"], IPAddress), {"Existing", "New Attr"})
+            self.assertEqual(self.registry.ensure(["Existing"], Prefix), {"Existing"})
+
+    def test_ensure_skips_conflicting_slug(self):
+        """Validate a Custom Field whose slug is already used by another field is left out."""
+        self.assertEqual(self.registry.ensure(["existing", "Other"], Prefix), {"Other"})
+        self.assertFalse(CustomField.objects.filter(name="existing").exists())
+
+    def test_clean(self):
+        """Validate changed Custom Field values and missing required values are checked without queries."""
+        count = CustomField.objects.create(name="Count", slug="count", type="integer", required=True)
+        count.content_types.add(ContentType.objects.get_for_model(Prefix))
+        CustomField.objects.create(name="Unlinked", slug="unlinked", type="integer")
+        self.registry.load()
+        prefix = Prefix(prefix="10.0.0.0/24", _custom_field_data={"Count": 1, "Unlinked": "ignored"})
+        with self.assertNumQueries(0):
+            self.registry.clean(prefix, names=["Count", "Unlinked"])
+            prefix.custom_field_data["Count"] = "many"
+            with self.assertRaisesRegex(ValidationError, "Invalid value for custom field 'Count'"):
+                self.registry.clean(prefix, names=["Count"])
+            del prefix.custom_field_data["Count"]
+            with self.assertRaisesRegex(ValidationError, "Missing required custom field 'Count'"):
+                self.registry.clean(prefix, names=[])
+
+
+class TestLookupCache(TestCase):
+    """Test LookupCache."""
+
+    def test_load_and_clear(self):
+        """Validate each map of related objects is loaded with one query, and cleared in place."""
+        tenant = Tenant.objects.create(name="Engineering", slug="engineering")
+        vrf = VRF.objects.create(name="Production")
+        cache = LookupCache()
+        tenant_map = cache.maps["tenant_map"]
+        with self.assertNumQueries(len(LookupCache.lookups)):
+            cache.load()
+        self.assertEqual(tenant_map, {"Engineering": tenant.id})
+        self.assertEqual(cache.maps["vrf_map"], {"Production": vrf.id})
+        cache.maps["prefix_map"]["10.0.0.0/24"] = vrf.id
+        cache.clear()
+        self.assertEqual(tenant_map, {})
+        self.assertFalse(any(cache.maps.values()))
+
+    def test_load_names(self):
+        """Validate only the maps named are loaded."""
+        Tenant.objects.create(name="Engineering", slug="engineering")
+        cache = LookupCache()
+        with self.assertNumQueries(1):
+            cache.load(names=["tenant_map"])
+        self.assertEqual(list(cache.maps["tenant_map"]), ["Engineering"])
+        self.assertEqual(cache.maps["status_map"], {})
+
+
+class TestWriteWithSavepoints(TestCase):
+    """Test write_with_savepoints."""
+
+    def test_write_all(self):
+        """Validate objects are written together when none fails."""
+        tenants = [Tenant(name=f"Tenant {idx}", slug=f"tenant-{idx}") for idx in range(3)]
+        with self.assertNumQueries(3):
+            self.assertEqual(write_with_savepoints(Tenant.objects.bulk_create, tenants), [])
+        self.assertEqual(Tenant.objects.count(), 3)
+
+    def test_skip_failing_object(self):
+        """Validate an object failing to write is returned and the others are written."""
+        Tenant.objects.create(name="Existing", slug="existing")
+        tenants = [Tenant(name="New", slug="new"), Tenant(name="Existing", slug="existing"), Tenant(name="Other")]
+        failed = write_with_savepoints(Tenant.objects.bulk_create, tenants)
+        self.assertEqual([tenant.name for tenant, _ in failed], ["Existing"])
+        self.assertEqual(sorted(Tenant.objects.values_list("name", flat=True)), ["Existing", "New", "Other"])
@@ -0,0 +1,46 @@
+"""Unit tests for the IPv4 address batch planner."""
+import unittest
+
+from nautobot_ssot_infoblox.utils.planner import IPv4BatchPlanner
+
+
+class TestIPv4BatchPlanner(unittest.TestCase):
+    """Test IPv4BatchPlanner."""
+
+    def test_batches_without_hints_use_prefix_size(self):
+        """Validate prefixes are packed by number of addresses when nothing else is known."""
+        planner = IPv4BatchPlanner(target_results=1000)
+        prefixes = [("10.0.0.0/23", "default"), ("10.0.2.0/23", "default"), ("10.1.0.0/16", "default")]
+        batches = [[query.prefix for query in batch] for batch in planner.batches(prefixes)]
+        self.assertEqual(batches, [["10.0.0.0/23"], ["10.0.2.0/23"], ["10.1.0.0/16"]])
+
+    def test_batches_use_history_before_utilization(self):
+        """Validate sparsely used prefixes are merged using history first, then network utilization."""
+        planner = IPv4BatchPlanner(
+            target_results=1000,
+            history={"default|10.0.0.0/16": 20},
+            utilization={"default|10.1.0.0/16": 1, "default|10.0.0.0/16": 90},
+        )
+        prefixes = [("10.0.0.0/16", "default"), ("10.1.0.0/16", "default"), ("10.2.0.0/24", "default")]
+        batches = list(planner.batches(prefixes))
+        self.assertEqual(len(batches), 1)
+        self.assertEqual([query.expected for query in batches[0]], [20, 656, 256])
+        self.assertEqual([query.num_addresses for query in batches[0]], [65536, 65536, 256])
+
+    def test_batches_respect_max_queries(self):
+        """Validate a batch never holds more than max_queries prefixes."""
+        planner = IPv4BatchPlanner(target_results=1000, max_queries=2)
+        prefixes = [(f"10.0.0.{host}/32", "default") for host in range(5)]
+        self.assertEqual([len(batch) for batch in planner.batches(prefixes)], [2, 2, 1])
+
+    def test_record_adjusts_target_and_observes_counts(self):
+        """Validate slow batches shrink the target, fast ones grow it, and returned counts are remembered."""
+        planner = IPv4BatchPlanner(target_results=1000, target_latency=4.0)
+        batch = next(planner.batches([("10.0.0.0/24", "default")]))
+        planner.record(batch, [[{"ip_address": "10.0.0.1"}]], elapsed=10.0)
+        self.assertEqual(planner.target.results, 500)
+        planner.record(batch, [[{"ip_address": "10.0.0.1"}]], elapsed=0.1)
+        self.assertEqual(planner.target.results, 1000)
+        self.assertEqual(planner.observed, {"default|10.0.0.0/24": 1})
+        self.assertEqual(planner.summary()["batches"], 2)
+        self.assertEqual(planner.stats[0]["returned"], 1)
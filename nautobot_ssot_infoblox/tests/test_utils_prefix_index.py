@@ -0,0 +1,37 @@
+"""Unit tests for the longest-prefix-match index."""
+import unittest
+
+from nautobot_ssot_infoblox.utils.prefix_index import PrefixIndex
+
+
+class TestPrefixIndex(unittest.TestCase):
+    """Test PrefixIndex."""
+
+    def setUp(self):
+        """Index nested IPv4 and IPv6 networks."""
+        self.index = PrefixIndex()
+        for network in ["10.0.0.0/8", "10.1.0.0/16", "10.1.1.0/24", "10.1.1.128/25", "10.1.1.5/32", "2001:db8::/32"]:
+            self.index.add(network, network)
+
+    def test_longest_match_returns_most_specific(self):
+        """Validate the most specific network containing an address is returned."""
+        self.assertEqual(self.index.longest_match("10.1.1.200"), "10.1.1.128/25")
+        self.assertEqual(self.index.longest_match("10.1.1.1"), "10.1.1.0/24")
+        self.assertEqual(self.index.longest_match("10.1.2.1"), "10.1.0.0/16")
+        self.assertEqual(self.index.longest_match("10.200.0.1"), "10.0.0.0/8")
+        self.assertEqual(self.index.longest_match("2001:db8::1"), "2001:db8::/32")
+
+    def test_longest_match_without_parent(self):
+        """Validate None is returned for addresses outside every network, and IP versions are kept apart."""
+        self.assertIsNone(self.index.longest_match("192.168.0.1"))
+        self.assertIsNone(self.index.longest_match("::ffff:10.1.1.1"))
+
+    def test_host_network_is_not_a_parent(self):
+        """Validate a host network does not contain its own address, as with Prefix.objects.net_contains()."""
+        self.assertEqual(self.index.longest_match("10.1.1.5"), "10.1.1.0/24")
+
+    def test_add_replaces_identical_network(self):
+        """Validate adding an already indexed network replaces its value."""
+        self.index.add("10.1.1.0/24", "replaced")
+        self.assertEqual(self.index.longest_match("10.1.1.1"), "replaced")
+        self.assertEqual(len(self.index), 6)
@@ -0,0 +1,56 @@
+"""Unit tests for the Infoblox write queue."""
+import unittest
+from unittest.mock import MagicMock
+
+from requests.exceptions import HTTPError
+
+from nautobot_ssot_infoblox.utils.write_queue import WriteQueue
+
+
+def network_item(prefix):
+    """Return a request item creating a network."""
+    return {"method": "POST", "object": "network", "data": {"network": prefix, "comment": ""}}
+
+
+def http_error(text):
+    """Return an HTTPError with the passed response text."""
+    return HTTPError(response=MagicMock(text=text))
+
+
+class TestWriteQueue(unittest.TestCase):
+    """Test WriteQueue."""
+
+    def setUp(self):
+        """Set up a queue on a mocked client and job."""
+        self.conn = MagicMock()
+        self.job = MagicMock()
+        self.queue = WriteQueue(conn=self.conn, job=self.job, batch_size=2)
+
+    def test_add_sends_full_batches_in_order(self):
+        """Validate operations are sent once the batch size is reached and the rest on flush."""
+        for prefix in ["10.0.0.0/24", "10.0.1.0/24", "10.0.2.0/24"]:
+            self.queue.add(item=network_item(prefix), label=f"create {prefix}")
+        self.assertEqual(self.conn.multi_request.call_count, 1)
+        self.queue.flush()
+        sent = [[item["data"]["network"] for item in call.args[0]] for call in self.conn.multi_request.call_args_list]
+        self.assertEqual(sent, [["10.0.0.0/24", "10.0.1.0/24"], ["10.0.2.0/24"]])
+        self.assertEqual(self.queue.stats, {"requests": 2, "operations": 3, "failed": 0})
+        self.job.log_warning.assert_not_called()
+
+    def test_failed_batch_is_resent_per_operation(self):
+        """Validate a failed batch is split so only the failing operation is logged."""
+        self.conn.multi_request.side_effect = [http_error("batch failed"), ["network/1"], http_error("duplicate")]
+        self.queue.add(item=network_item("10.0.0.0/24"), label="create 10.0.0.0/24")
+        self.queue.add(item=network_item("10.0.1.0/24"), label="create 10.0.1.0/24")
+        self.assertEqual(self.conn.multi_request.call_count, 3)
+        self.assertEqual(self.queue.stats, {"requests": 3, "operations": 1, "failed": 1})
+        self.job.log_warning.assert_called_once_with(message="Failed to create 10.0.1.0/24 due to duplicate")
+
+    def test_add_missing_object_is_logged(self):
+        """Validate an update of an object not found in Infoblox is logged and not sent."""
+        self.queue.add(item=None, label="update 10.0.0.0/24")
+        self.queue.flush()
+        self.conn.multi_request.assert_not_called()
+        self.job.log_warning.assert_called_once_with(
+            message="Failed to update 10.0.0.0/24 as it was not found in Infoblox."
+        )
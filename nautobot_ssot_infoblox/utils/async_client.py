@@ -0,0 +1,61 @@
+"""Asyncio interface to the read methods of the Infoblox client."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from nautobot_ssot_infoblox.constant import PLUGIN_CFG
+
+
+class AsyncInfobloxApi:
+    """Awaitable variants of the `InfobloxApi` read methods with the same return values, unless noted otherwise.
+
+    Requests are sent through the pooled session of the wrapped client on a dedicated thread pool, so the reads of a
+    load can run concurrently in a single event loop without an async HTTP dependency. At most `concurrency` requests
+    are in flight at once.
+    """
+
+    def __init__(self, conn, concurrency=PLUGIN_CFG.get("infoblox_async_concurrency", 4)):
+        """Initialize AsyncInfobloxApi.
+
+        Args:
+            conn (InfobloxApi): Client used to send the requests.
+            concurrency (int): Maximum number of requests sent to Infoblox at once.
+        """
+        self.conn = conn
+        self.concurrency = max(int(concurrency), 1)
+        self.executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="infoblox-async")
+
+    async def _call(self, func, *args, **kwargs):
+        """Run a blocking client method on the thread pool and return its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    def close(self):
+        """Shut down the thread pool once all requests are done."""
+        self.executor.shutdown(wait=True)
+
+    async def get_subnets(self, prefix: str = None):
+        """Return all Networks, or those within `prefix`, see `InfobloxApi.iter_subnets`.
+
+        Unlike `InfobloxApi.get_all_subnets`, an error returned by Infoblox is raised so the caller can report it.
+
+        Raises:
+            HTTPError: Infoblox returned an error.
+        """
+        return await self._call(lambda: [subnet for page in self.conn.iter_subnets(prefix=prefix) for subnet in page])
+
+    async def get_network_containers(self):
+        """Return all Network Containers, see `InfobloxApi.get_network_containers`."""
+        return await self._call(self.conn.get_network_containers)
+
+    async def get_all_ipv4address_networks(self, prefixes, utilization=None):
+        """Return the used IPv4 addresses of the passed prefixes, see `InfobloxApi.get_all_ipv4address_networks`."""
+        return await self._call(self.conn.get_all_ipv4address_networks, prefixes=prefixes, utilization=utilization)
+
+    async def get_vlanviews(self):
+        """Return all VLAN Views, see `InfobloxApi.get_vlanviews`."""
+        return await self._call(self.conn.get_vlanviews)
+
+    async def get_vlans(self):
+        """Return all VLANs, see `InfobloxApi.get_vlans`."""
+        return await self._call(self.conn.get_vlans)
@@ -1,21 +1,53 @@
 """All interactions with infoblox."""  # pylint: disable=too-many-lines
 
-import copy
 import json
-import ipaddress
 import logging
+import random
 import re
+import threading
+import time
 import urllib.parse
+from collections import deque
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
 from requests.compat import urljoin
+from django.core.cache import cache
+from django.core.signing import BadSignature
+from django_cryptography.utils.crypto import FernetBytes, InvalidToken
 from dns import reversename
 from nautobot.core.settings_funcs import is_truthy
 from nautobot_ssot_infoblox.constant import PLUGIN_CFG
 from nautobot_ssot_infoblox.utils.diffsync import get_ext_attr_dict
+from nautobot_ssot_infoblox.utils.planner import IPv4BatchPlanner
 
 logger = logging.getLogger(__name__)
 
+# Status codes returned by a busy or restarting grid master that are worth retrying.
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+# Read-only methods that can safely be sent again, POST is only retried for multi-object requests made of GETs.
+# Writes are never retried as a write that timed out or failed with 502/504 may still have been applied.
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+# Fields of each object type read when loading the DiffSync models in `diffsync/models/base.py`.
+DEFAULT_RETURN_FIELDS = {
+    "ipv4address": ["ip_address", "network", "names", "usage", "objects", "comment", "extattrs"],
+    "network": ["network", "network_view", "comment", "extattrs", "vlans", "utilization"],
+    "networkcontainer": ["network", "network_view", "comment", "extattrs"],
+    "vlan": ["id", "name", "status", "comment", "extattrs"],
+    "vlanview": ["name", "comment", "extattrs"],
+}
+# Fields the adapters can not load an object without, always requested whatever is configured.
+REQUIRED_RETURN_FIELDS = {
+    "ipv4address": ["ip_address", "network", "names", "usage"],
+    "network": ["network", "network_view"],
+    "networkcontainer": ["network"],
+    "vlan": ["id", "name", "status"],
+    "vlanview": ["name"],
+}
+
 
 def parse_url(address):
     """Handle outside case where protocol isn't included in URL address.
@@ -49,6 +81,25 @@ def get_default_ext_attrs(review_list: list) -> dict:
     return default_ext_attrs
 
 
+def get_return_fields(configured: dict = None) -> dict:
+    """Build the `_return_fields` value of each object type loaded from Infoblox.
+
+    Args:
+        configured (dict): Fields to return per object type, as a list or comma separated string, replacing the
+            defaults of that object type - {"vlan": ["id", "name", "status"]}
+
+    Returns:
+        dict: Comma separated fields to return keyed by object type, the required fields always included.
+    """
+    return_fields = {}
+    for object_type, default in DEFAULT_RETURN_FIELDS.items():
+        fields = (configured or {}).get(object_type, default)
+        if isinstance(fields, str):
+            fields = [field.strip() for field in fields.split(",") if field.strip()]
+        return_fields[object_type] = ",".join(dict.fromkeys([*REQUIRED_RETURN_FIELDS[object_type], *fields]))
+    return return_fields
+
+
 def get_dns_name(possible_fqdn: str) -> str:
     """Validate passed FQDN and returns if found.
 
@@ -92,6 +143,7 @@ class InvalidUrlScheme(Exception):
 class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instance-attributes
     """Representation and methods for interacting with Infoblox."""
 
+    # Takes one argument per PLUGIN_CFG tuning option, see the README, so each client can override them.
     def __init__(
         self,
         url=PLUGIN_CFG.get("NAUTOBOT_INFOBLOX_URL"),
@@ -100,8 +152,25 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         verify_ssl=is_truthy(PLUGIN_CFG.get("NAUTOBOT_INFOBLOX_VERIFY_SSL")),
         wapi_version=PLUGIN_CFG.get("NAUTOBOT_INFOBLOX_WAPI_VERSION"),
         cookie=None,
-    ):  # pylint: disable=too-many-arguments
-        """Initialize Infoblox class."""
+        pool_size=PLUGIN_CFG.get("infoblox_connection_pool_size", 10),
+        page_size=PLUGIN_CFG.get("infoblox_page_size", 1000),
+        request_workers=PLUGIN_CFG.get("infoblox_request_workers", 1),
+        max_retries=PLUGIN_CFG.get("infoblox_max_retries", 5),
+        retry_backoff=PLUGIN_CFG.get("infoblox_retry_backoff", 1.0),
+        retry_max_elapsed=PLUGIN_CFG.get("infoblox_retry_max_elapsed", 300),
+        log_payload_size=PLUGIN_CFG.get("infoblox_log_payload_size", 1000),
+        return_fields=PLUGIN_CFG.get("infoblox_return_fields"),
+        auth_cache_ttl=PLUGIN_CFG.get("infoblox_auth_cache_ttl", 600),
+    ):  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+        """Initialize Infoblox class.
+
+        A single `requests.Session` is kept for the lifetime of the client so TCP/TLS connections to the grid master
+        are pooled and kept alive, and the `ibapauth` cookie returned by the first call is reused afterwards. The
+        session is safe to share between threads and the pool is sized to fit at least `request_workers` connections.
+
+        The `ibapauth` cookie is also stored encrypted in the Django cache for `auth_cache_ttl` seconds, so clients
+        created by later jobs or other workers skip the basic auth login until Infoblox rejects the cookie.
+        """
         parsed_url = parse_url(url.strip())
         if parsed_url.scheme != "https":
             if parsed_url.scheme == "http":
@@ -115,16 +184,38 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         self.verify_ssl = verify_ssl
         self.wapi_version = wapi_version
         self.cookie = cookie
+        self.page_size = page_size
+        self.request_workers = max(int(request_workers), 1)
         if self.verify_ssl is False:
             requests.packages.urllib3.disable_warnings(  # pylint: disable=no-member
                 requests.packages.urllib3.exceptions.InsecureRequestWarning  # pylint: disable=no-member
             )  # pylint: disable=no-member
         self.headers = {"Content-Type": "application/json"}
         self.extra_vars = {}
+        self.session = requests.Session()
+        self.session.verify = self.verify_ssl
+        self.session.headers.update(self.headers)
+        pool_size = max(pool_size, self.request_workers)
+        self.session.mount("https://", HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+        self._auth_lock = threading.Lock()
+        self.ipv4_batch_stats = []
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.retry_max_elapsed = retry_max_elapsed
+        self.retry_stats = {"retries": 0, "throttled": 0, "unavailable": 0, "connection_errors": 0, "wait_seconds": 0.0}
+        self._retry_lock = threading.Lock()
+        self.log_payload_size = log_payload_size
+        self._refs = {"network": {}, "networkcontainer": {}}
+        self.return_fields = get_return_fields(return_fields)
+        self.auth_cache_ttl = auth_cache_ttl
 
     def _request(self, method, path, **kwargs):
         """Return a response object after making a request to by other methods.
 
+        Requests that are safe to repeat are retried with exponential backoff and jitter when the grid master is busy
+        (429/502/503/504 or connection errors), honoring its `Retry-After` header, until `max_retries` or the
+        `retry_max_elapsed` budget is exhausted.
+
         Args:
             method (str): Request HTTP method to call with requests.
             path (str): URL path to call.
@@ -137,15 +228,200 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         api_path = f"/wapi/{self.wapi_version}/{path}"
         url = urljoin(self.url, api_path)
 
-        if self.cookie:
-            resp = requests.request(method, url, cookies=self.cookie, **kwargs)
-        else:
-            kwargs["auth"] = requests.auth.HTTPBasicAuth(self.username, self.password)
-            resp = requests.request(method, url, **kwargs)
-            self.cookie = copy.copy(resp.cookies.get_dict("ibapauth"))
+        retryable = self._is_retryable(method, path, kwargs)
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                resp = self._send(method, url, **kwargs)
+            except requests.exceptions.ConnectionError:
+                delay = self._retry_delay(attempt=attempt)
+                if not retryable or not self._can_retry(attempt, start, delay):
+                    raise
+                self._record_retry("connection_errors", delay)
+            else:
+                if resp.status_code not in RETRY_STATUS_CODES:
+                    break
+                delay = self._retry_delay(attempt=attempt, response=resp)
+                if not retryable or not self._can_retry(attempt, start, delay):
+                    break
+                self._record_retry("throttled" if resp.status_code == 429 else "unavailable", delay)
+            logger.debug("Retrying %s %s in %.2f seconds (attempt %s).", method, path, delay, attempt + 1)
+            time.sleep(delay)
+            attempt += 1
         resp.raise_for_status()
         return resp
 
+    def _send(self, method, url, **kwargs):
+        """Send a single request with the session, logging in with basic auth if there is no ibapauth cookie yet.
+
+        A cookie rejected with 401, i.e. because the session expired on the grid master, is dropped and the request is
+        sent again with basic auth.
+        """
+        if not self.cookie:
+            # Only one thread performs the basic auth login, the others wait for and then reuse its ibapauth cookie.
+            with self._auth_lock:
+                if not self.cookie:
+                    self.cookie = self._get_cached_auth_cookie()
+                if not self.cookie:
+                    return self._login(method, url, **kwargs)
+        cookie = self.cookie
+        resp = self.session.request(method, url, cookies=cookie, **kwargs)
+        if resp.status_code != 401:
+            return resp
+        with self._auth_lock:
+            if self.cookie == cookie:
+                self.cookie = None
+                cache.delete(self._auth_cookie_key())
+                self.session.cookies.clear()
+            if not self.cookie:
+                return self._login(method, url, **kwargs)
+        return self.session.request(method, url, cookies=self.cookie, **kwargs)
+
+    def _login(self, method, url, **kwargs):
+        """Send a request with basic auth and keep the ibapauth cookie returned for the following requests."""
+        resp = self.session.request(
+            method, url, auth=requests.auth.HTTPBasicAuth(self.username, self.password), **kwargs
+        )
+        ibapauth = resp.cookies.get("ibapauth")
+        if ibapauth:
+            self.cookie = {"ibapauth": ibapauth}
+            self._set_cached_auth_cookie(ibapauth)
+        return resp
+
+    def _auth_cookie_key(self):
+        """Return the cache key holding the ibapauth cookie of this Infoblox instance and user."""
+        return f"nautobot_ssot_infoblox:ibapauth:{self.url}:{self.username}"
+
+    def _get_cached_auth_cookie(self):
+        """Return the ibapauth cookie stored by a previous client, None if there is none or it can't be decrypted."""
+        if not self.auth_cache_ttl:
+            return None
+        token = cache.get(self._auth_cookie_key())
+        if not token:
+            return None
+        try:
+            return {"ibapauth": FernetBytes().decrypt(token, ttl=self.auth_cache_ttl).decode()}
+        except (BadSignature, InvalidToken):
+            cache.delete(self._auth_cookie_key())
+            return None
+
+    def _set_cached_auth_cookie(self, ibapauth):
+        """Store the ibapauth cookie encrypted with a key derived from SECRET_KEY for the following clients."""
+        if self.auth_cache_ttl:
+            cache.set(self._auth_cookie_key(), FernetBytes().encrypt(ibapauth), timeout=self.auth_cache_ttl)
+
+    @staticmethod
+    def _is_retryable(method, path, kwargs):
+        """Determine whether a request only reads and can be sent again without side effects.
+
+        Args:
+            method (str): Request HTTP method.
+            path (str): URL path of the request.
+            kwargs (dict): Keyword arguments of the request, used to inspect multi-object request payloads.
+
+        Returns:
+            bool: True for read-only methods and for multi-object requests that only read objects.
+        """
+        if method.upper() in SAFE_METHODS:
+            return True
+        if method.upper() == "POST" and path == "request":
+            payload = kwargs.get("json")
+            if payload is None and kwargs.get("data"):
+                payload = json.loads(kwargs["data"])
+            return bool(payload) and all(item.get("method", "").upper() == "GET" for item in payload)
+        return False
+
+    def _retry_delay(self, attempt, response=None):
+        """Return the number of seconds to wait before the next attempt.
+
+        Args:
+            attempt (int): Number of attempts already retried.
+            response (requests.Response): Failed response, its `Retry-After` header takes precedence when present.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return max(float(retry_after), 0.0)
+            except ValueError:
+                try:
+                    return max((parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+                except (TypeError, ValueError):
+                    pass
+        # Full jitter spreads out the retries of concurrent workers that were throttled at the same time.
+        return random.uniform(0, self.retry_backoff * 2**attempt)  # nosec
+
+    def _can_retry(self, attempt, start, delay):
+        """Return whether another attempt fits in the retry count and elapsed time budget."""
+        return attempt < self.max_retries and time.monotonic() - start + delay <= self.retry_max_elapsed
+
+    def _record_retry(self, reason, delay):
+        """Update the retry counters in a thread-safe way."""
+        with self._retry_lock:
+            self.retry_stats["retries"] += 1
+            self.retry_stats[reason] += 1
+            self.retry_stats["wait_seconds"] += delay
+
+    def _json(self, response):
+        """Decode the JSON body of a response exactly once and log it at DEBUG level.
+
+        Args:
+            response (requests.Response): Response returned by `_request`.
+
+        Returns:
+            (dict or list): Decoded response body.
+
+        Raises:
+            json.decoder.JSONDecodeError: If the response body is not JSON.
+        """
+        payload = response.json()
+        self._log_payload(f"{response.request.method} {urllib.parse.urlsplit(response.url).path}", payload)
+        return payload
+
+    def _log_payload(self, label, payload):
+        """Log a decoded payload at DEBUG level, truncated to `log_payload_size` characters.
+
+        The payload is only formatted when DEBUG logging is enabled, as WAPI responses can be several megabytes.
+
+        Args:
+            label (str): Description of the payload, i.e. method and URL path.
+            payload (object): Decoded payload to log.
+        """
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        if isinstance(payload, dict) and isinstance(payload.get("result"), list):
+            count = len(payload["result"])
+        elif isinstance(payload, list):
+            count = len(payload)
+        else:
+            count = 1
+        text = repr(payload)
+        if self.log_payload_size and len(text) > self.log_payload_size:
+            text = f"{text[:self.log_payload_size]}... ({len(text) - self.log_payload_size} characters truncated)"
+        logger.debug("%s returned %s objects: %s", label, count, text)
+
+    def _get_pages(self, path, params=None):
+        """Yield the results of a WAPI object query one page at a time using server-side paging.
+
+        Args:
+            path (str): URL path of the WAPI object to query.
+            params (dict): Query parameters for the first page, i.e. filters and `_return_fields`.
+
+        Yields:
+            list: Records of a single page, at most `page_size` long.
+        """
+        params = {**(params or {}), "_paging": 1, "_return_as_object": 1, "_max_results": self.page_size}
+        while True:
+            response = self._json(self._request("GET", path, params=params))
+            yield response.get("result", [])
+            if not response.get("next_page_id"):
+                break
+            # Follow-up pages are identified by the page id alone, the original query is kept server-side.
+            params = {"_page_id": response["next_page_id"]}
+
     def _delete(self, resource):
         """Delete a resource from Infoblox.
 
@@ -160,10 +436,9 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         """
         response = self._request("DELETE", resource)
         try:
-            logger.info(response.json())
-            return response.json()
+            return self._json(response)
         except json.decoder.JSONDecodeError:
-            logger.info(response.text)
+            logger.debug(response.text)
             return response.text
 
     def _update(self, resource, **params):
@@ -181,10 +456,9 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         """
         response = self._request("PUT", path=resource, params=params)
         try:
-            logger.info(response.json())
-            return response.json()
+            return self._json(response)
         except json.decoder.JSONDecodeError:
-            logger.info(response.text)
+            logger.debug(response.text)
             return response.text
 
     def _get_network_ref(self, prefix):  # pylint: disable=inconsistent-return-statements
@@ -199,6 +473,8 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         Returns Response:
             "network/ZG5zLm5ldHdvcmskMTkyLjAuMi4wLzI0LzA:192.0.2.0/24/default"
         """
+        if prefix in self._refs["network"]:
+            return self._refs["network"][prefix]
         for item in self.get_all_subnets(prefix):
             if item["network"] == prefix:
                 return item["_ref"]
@@ -215,15 +491,55 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         Returns Response:
             "networkcontainer/ZG5zLm5ldHdvcmtfY29udGFpbmVyJDE5Mi4xNjguMi4wLzI0LzA:192.168.2.0/24/default"
         """
-        for item in self.get_network_containers():
+        if prefix in self._refs["networkcontainer"]:
+            return self._refs["networkcontainer"][prefix]
+        try:
+            response = self._request("GET", "networkcontainer", params={"network": prefix})
+        except HTTPError as err:
+            logger.info(err.response.text)
+            return None
+        items = self._json(response)
+        self._index_refs("networkcontainer", items)
+        for item in items:
             if item["network"] == prefix:
                 return item["_ref"]
 
-    def get_all_ipv4address_networks(self, prefixes):
+    def _index_refs(self, object_type, records):
+        """Remember the _ref of network or networkcontainer records so later updates and deletes skip the lookup.
+
+        Args:
+            object_type (str): WAPI object type of the records, `network` or `networkcontainer`.
+            records (list): Records as returned by Infoblox, each with `network` and `_ref`.
+        """
+        index = self._refs[object_type]
+        for record in records:
+            if record.get("_ref") and record.get("network"):
+                index.setdefault(record["network"], record["_ref"])
+
+    def _index_created_ref(self, object_type, prefix, response):
+        """Remember the _ref returned when creating a network or networkcontainer.
+
+        Args:
+            object_type (str): WAPI object type created, `network` or `networkcontainer`.
+            prefix (str): Prefix of the created object.
+            response (requests.Response): Response of the create request, the JSON encoded _ref.
+        """
+        try:
+            ref = response.json()
+        except ValueError:
+            return
+        if isinstance(ref, str):
+            self._refs[object_type][prefix] = ref
+
+    def get_all_ipv4address_networks(self, prefixes, utilization=None):  # pylint: disable=too-many-locals
         """Get all used / unused IPv4 addresses within the supplied network.
 
+        Prefixes are batched by `IPv4BatchPlanner` using the number of used addresses observed on the previous run, or
+        the passed network utilization, and statistics for every batch are kept in `ipv4_batch_stats`.
+
         Args:
             prefixes (List[tuple]): List of Network prefixes and associated network view - ('10.220.0.0/22', 'default')
+            utilization (dict): Optional network utilization percentage keyed by prefix and network view tuple.
 
         Returns:
             (list): IPv4 dict objects
@@ -288,17 +604,14 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
                 data (dict): The data payload query of IP Addresses.
 
             Returns:
-                list: List of dicts of IP Addresses for the specified prefixes or an empty list if no response.
+                list: List of IP Address lists, one per queried prefix, or None if the request failed.
             """
-            response = None
             try:
                 response = self._request(method="POST", path=url_path, data=data)
             except HTTPError as err:
                 logger.info(err.response.text)
-            if response and len(response.json()) > 0:
-                logger.debug(response.json()[0])
-                return response.json()[0]
-            return []
+                return None
+            return self._json(response) or []
 
         def create_payload(prefix: str, view: str) -> dict:
             """Create the payload structure for querying IP Addresses from subnets.
@@ -315,48 +628,70 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
                 "object": "ipv4address",
                 "data": {"network_view": view, "network": prefix, "status": "USED"},
                 "args": {
-                    "_return_fields": "ip_address,mac_address,names,network,objects,status,types,usage,comment,extattrs"
+                    "_return_fields": self.return_fields["ipv4address"],
                 },
             }
             return query
 
         url_path = "request"
-        payload, ipaddrs = [], []
-        num_hosts = 0
-        for prefix in prefixes:
-            view = prefix[1]
-            network = ipaddress.ip_network(prefix[0])
-            # Due to default of 1000 max_results from Infoblox we must specify a max result limit or limit response to 1000.
-            # Make individual request if it's larger than 1000 hosts and specify max result limit to be number of hosts in prefix.
-            if network.num_addresses > 1000:
-                pf_payload = create_payload(prefix=prefix[0], view=view)
-                pf_payload["args"]["_max_results"] = network.num_addresses
-                addrs = get_ipaddrs(url_path=url_path, data=json.dumps([pf_payload]))
-                if addrs:
-                    ipaddrs = ipaddrs + addrs
-                continue
+        planner = IPv4BatchPlanner(
+            target_results=PLUGIN_CFG.get("infoblox_ipaddress_batch_size", 1000),
+            target_latency=PLUGIN_CFG.get("infoblox_ipaddress_batch_latency", 5.0),
+            history=self._get_ipv4_usage_history(),
+            utilization={f"{view}|{prefix}": value for (prefix, view), value in (utilization or {}).items()},
+        )
 
-            # append payloads to list until number of hosts is 1000
-            if network.num_addresses + num_hosts <= 1000:
-                num_hosts += network.num_addresses
-                payload.append(create_payload(prefix=prefix[0], view=view))
-            else:
-                # if we can't add more hosts, make call to get IP addresses with existing payload
-                addrs = get_ipaddrs(url_path=url_path, data=json.dumps(payload))
-                if addrs:
-                    ipaddrs = ipaddrs + addrs
-                # reset payload as all addresses are processed
-                payload = []
-                payload.append(create_payload(prefix=prefix[0], view=view))
-                num_hosts = network.num_addresses
-            # check if last prefix in list, if it is, send payload otherwise keep processing
-            if prefixes[-1] == prefix:
-                addrs = get_ipaddrs(url_path=url_path, data=json.dumps(payload))
-                if addrs:
-                    ipaddrs = ipaddrs + addrs
-                payload = []
-                num_hosts = 0
-        return ipaddrs
+        def fetch_batch(batch: list) -> list:
+            """Retrieve IP addresses for a planned batch and report its outcome to the planner."""
+            payload = []
+            for query in batch:
+                pf_payload = create_payload(prefix=query.prefix, view=query.view)
+                # Due to default of 1000 max_results from Infoblox we must specify a max result limit for larger
+                # prefixes, the number of hosts in the prefix ensures the response is never truncated.
+                if query.num_addresses > 1000:
+                    pf_payload["args"]["_max_results"] = query.num_addresses
+                payload.append(pf_payload)
+            start = time.monotonic()
+            results = get_ipaddrs(url_path=url_path, data=json.dumps(payload))
+            planner.record(batch, results or [], elapsed=time.monotonic() - start, error=results is None)
+            return results or []
+
+        batch_results = []
+        if self.request_workers > 1:
+            # Keep a bounded window of batches in flight so the planner can still resize the batches that follow,
+            # results are collected in submission order so the output matches the sequential path exactly.
+            with ThreadPoolExecutor(max_workers=self.request_workers) as executor:
+                in_flight = deque()
+                for batch in planner.batches(prefixes):
+                    in_flight.append(executor.submit(fetch_batch, batch))
+                    if len(in_flight) >= self.request_workers:
+                        batch_results.append(in_flight.popleft().result())
+                batch_results.extend(future.result() for future in in_flight)
+        else:
+            for batch in planner.batches(prefixes):
+                batch_results.append(fetch_batch(batch))
+
+        self.ipv4_batch_stats = planner.stats
+        self._set_ipv4_usage_history(planner.observed)
+        logger.info("IPv4 address batches: %s", planner.summary())
+        return [addr for result in batch_results for addrs in result for addr in addrs]
+
+    def _ipv4_usage_history_key(self):
+        """Return the cache key holding the used IP address counts per prefix for this Infoblox instance."""
+        return f"nautobot_ssot_infoblox:ipv4_usage:{self.url}"
+
+    def _get_ipv4_usage_history(self):
+        """Return the used IP address counts per prefix observed on the previous run."""
+        return cache.get(self._ipv4_usage_history_key(), {})
+
+    def _set_ipv4_usage_history(self, observed):
+        """Store the used IP address counts per prefix observed on this run for the next one."""
+        if observed:
+            history = self._get_ipv4_usage_history()
+            history.update(observed)
+            cache.set(
+                self._ipv4_usage_history_key(), history, timeout=PLUGIN_CFG.get("infoblox_usage_history_ttl", 604800)
+            )
 
     def create_network(self, prefix, comment=None):
         """Create a network.
@@ -374,6 +709,7 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         api_path = "network"
         response = self._request("POST", api_path, params=params)
         logger.info(response.text)
+        self._index_created_ref("network", prefix, response)
         return response.text
 
     def delete_network(self, prefix):
@@ -392,6 +728,7 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
 
         if resource:
             self._delete(resource)
+            self._refs["network"].pop(prefix, None)
             response = {"deleted": resource}
         else:
             response = {"error": f"{prefix} not found."}
@@ -439,6 +776,7 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         api_path = "networkcontainer"
         response = self._request("POST", api_path, params=params)
         logger.info(response.text)
+        self._index_created_ref("networkcontainer", prefix, response)
         return response.text
 
     def delete_network_container(self, prefix):
@@ -457,6 +795,7 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
 
         if resource:
             self._delete(resource)
+            self._refs["networkcontainer"].pop(prefix, None)
             response = {"deleted": resource}
         else:
             response = {"error": f"{prefix} not found."}
@@ -518,8 +857,7 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         url_path = "record:host"
         params = {"name": fqdn, "_return_as_object": 1}
         response = self._request("GET", url_path, params=params)
-        logger.info(response.json)
-        return response.json().get("result")
+        return self._json(response).get("result")
 
     def get_host_record_by_ip(self, ip_address):
         """Get the host record by using IP Address.
@@ -551,8 +889,7 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         url_path = "record:host"
         params = {"ipv4addr": ip_address, "_return_as_object": 1}
         response = self._request("GET", url_path, params=params)
-        logger.info(response.json)
-        return response.json().get("result")
+        return self._json(response).get("result")
 
     def get_a_record_by_name(self, fqdn):
         """Get the A record for a FQDN.
@@ -576,8 +913,7 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         url_path = "record:a"
         params = {"name": fqdn, "_return_as_object": 1}
         response = self._request("GET", url_path, params=params)
-        logger.info(response.json)
-        return response.json().get("result")
+        return self._json(response).get("result")
 
     def get_a_record_by_ip(self, ip_address):
         """Get the A record for a IP Address.
@@ -601,8 +937,7 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         url_path = "record:a"
         params = {"ipv4addr": ip_address, "_return_as_object": 1}
         response = self._request("GET", url_path, params=params)
-        logger.info(response.json)
-        return response.json().get("result")
+        return self._json(response).get("result")
 
     def get_ptr_record_by_name(self, fqdn):
         """Get the PTR record by FQDN.
@@ -625,8 +960,7 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         url_path = "record:ptr"
         params = {"ptrdname": fqdn, "_return_as_object": 1}
         response = self._request("GET", url_path, params=params)
-        logger.info(response.json)
-        return response.json().get("result")
+        return self._json(response).get("result")
 
     def get_all_dns_views(self):
         """Get all dns views.
@@ -651,8 +985,7 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         url_path = "view"
         params = {"_return_as_object": 1}
         response = self._request("GET", url_path, params=params)
-        logger.info(response.json)
-        return response.json().get("result")
+        return self._json(response).get("result")
 
     def create_a_record(self, fqdn, ip_address):
         """Create an A record for a given FQDN.
@@ -673,8 +1006,7 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         params = {"_return_fields": "name", "_return_as_object": 1}
         payload = {"name": fqdn, "ipv4addr": ip_address}
         response = self._request("POST", url_path, params=params, json=payload)
-        logger.info(response.json)
-        return response.json().get("result")
+        return self._json(response).get("result")
 
     def get_dhcp_lease(self, lease_to_check):
         """Get a DHCP lease for the IP/hostname passed in.
@@ -724,8 +1056,7 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
             "_return_as_object": 1,
         }
         response = self._request("GET", url_path, params=params)
-        logger.info(response.json)
-        return response.json()
+        return self._json(response)
 
     def get_dhcp_lease_from_hostname(self, hostname):
         """Get a DHCP lease for the hostname passed in.
@@ -753,8 +1084,7 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
             "_return_as_object": 1,
         }
         response = self._request("GET", url_path, params=params)
-        logger.info(response.json)
-        return response.json()
+        return self._json(response)
 
     def get_all_subnets(self, prefix: str = None):
         """Get all Subnets.
@@ -785,22 +1115,28 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
             },
         ]
         """
-        url_path = "network"
-        params = {
-            "_return_as_object": 1,
-            "_return_fields": "network,network_view,comment,extattrs,rir_organization,rir,vlans",
-            "_max_results": 10000,
-        }
-
-        if prefix:
-            params.update({"network": prefix})
         try:
-            response = self._request("GET", url_path, params=params)
+            return [subnet for page in self.iter_subnets(prefix=prefix) for subnet in page]
         except HTTPError as err:
             logger.info(err.response.text)
             return []
-        logger.info(response.json())
-        return response.json().get("result")
+
+    def iter_subnets(self, prefix: str = None):
+        """Iterate over all Subnets page by page.
+
+        Args:
+            prefix (str): Network prefix - '10.220.0.0/22'
+
+        Yields:
+            list: Page of record dicts in the same format as returned by `get_all_subnets`.
+        """
+        url_path = "network"
+        params = {"_return_fields": self.return_fields["network"]}
+        if prefix:
+            params.update({"network": prefix})
+        for page in self._get_pages(url_path, params=params):
+            self._index_refs("network", page)
+            yield page
 
     def get_authoritative_zone(self):
         """Get authoritative zone to check if fqdn exists.
@@ -825,8 +1161,7 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         url_path = "zone_auth"
         params = {"_return_as_object": 1}
         response = self._request("GET", url_path, params=params)
-        logger.info(response.json())
-        return response.json().get("result")
+        return self._json(response).get("result")
 
     def _find_network_reference(self, network):
         """Find the reference for the given network.
@@ -846,8 +1181,7 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         url_path = "network"
         params = {"network": network}
         response = self._request("GET", url_path, params=params)
-        logger.info(response.json())
-        return response.json()
+        return self._json(response)
 
     def find_next_available_ip(self, network):
         """Find the next available ip address for a given network.
@@ -876,8 +1210,7 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
             params = {"_function": "next_available_ip"}
             payload = {"num": 1}
             response = self._request("POST", url_path, params=params, json=payload)
-            logger.info(response.json())
-            next_ip_avail = response.json().get("ips")[0]
+            next_ip_avail = self._json(response).get("ips")[0]
 
         return next_ip_avail
 
@@ -897,8 +1230,7 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
             params = {"_return_fields": "ipv4addr", "_return_as_object": 1}
             payload = {"ipv4addr": ip_address, "mac": mac_address}
             response = self._request("POST", url_path, params=params, json=payload)
-            logger.info(response.json())
-            return response.json().get("result").get("ipv4addr")
+            return self._json(response).get("result").get("ipv4addr")
         return False
 
     def create_fixed_address(self, ip_address, mac_address):
@@ -914,8 +1246,7 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         params = {"_return_fields": "ipv4addr", "_return_as_object": 1}
         payload = {"ipv4addr": ip_address, "mac": mac_address}
         response = self._request("POST", url_path, params=params, json=payload)
-        logger.info(response.json())
-        return response.json().get("result").get("ipv4addr")
+        return self._json(response).get("result").get("ipv4addr")
 
     def create_host_record(self, fqdn, ip_address):
         """Create a host record for a given FQDN.
@@ -941,8 +1272,9 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         except HTTPError as err:
             logger.info("Host record error: %s", err.response.text)
             return []
-        logger.info("Infoblox host record created: %s", response.json())
-        return response.json().get("result")
+        result = self._json(response).get("result")
+        logger.info("Infoblox host record created: %s", result)
+        return result
 
     def delete_host_record(self, ip_address):
         """Delete provided IP Address from Infoblox."""
@@ -981,8 +1313,9 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         ]  # infoblox does not accept the top most domain '.', so we strip it
         payload = {"name": reverse_host, "ptrdname": fqdn, "ipv4addr": ip_address}
         response = self._request("POST", url_path, params=params, json=payload)
-        logger.info("Infoblox PTR record created: %s", response.json())
-        return response.json().get("result")
+        result = self._json(response).get("result")
+        logger.info("Infoblox PTR record created: %s", result)
+        return result
 
     def search_ipv4_address(self, ip_address):
         """Find if IP address is in IPAM. Returns empty list if address does not exist.
@@ -1015,8 +1348,7 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         url_path = "search"
         params = {"address": ip_address, "_return_as_object": 1}
         response = self._request("GET", url_path, params=params)
-        logger.info(response.json())
-        return response.json().get("result")
+        return self._json(response).get("result")
 
     def get_vlan_view(self, name="Nautobot"):
         """Retrieve a specific vlanview.
@@ -1040,8 +1372,7 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         url_path = "vlanview"
         params = {"name": name}
         response = self._request("GET", path=url_path, params=params)
-        logger.info(response.json())
-        return response.json()
+        return self._json(response)
 
     def create_vlan_view(self, name, start_vid=1, end_vid=4094):
         """Create a vlan view.
@@ -1060,8 +1391,7 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         url_path = "vlanview"
         params = {"name": name, "start_vlan_id": start_vid, "end_vlan_id": end_vid}
         response = self._request("POST", path=url_path, params=params)
-        logger.info(response.json())
-        return response.json()
+        return self._json(response)
 
     def get_vlanviews(self):
         """Retrieve all VLANViews from Infoblox.
@@ -1088,10 +1418,9 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         ]
         """
         url_path = "vlanview"
-        params = {"_return_fields": "name,comment,start_vlan_id,end_vlan_id,extattrs"}
+        params = {"_return_fields": self.return_fields["vlanview"]}
         response = self._request("GET", url_path, params=params)
-        logger.info(response.json())
-        return response.json()
+        return self._json(response)
 
     def get_vlans(self):
         """Retrieve all VLANs from Infoblox.
@@ -1124,23 +1453,19 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
             }
         ]
         """
-        url_path = "request"
-        payload = json.dumps(
-            [
-                {
-                    "method": "GET",
-                    "object": "vlan",
-                    "data": {},
-                    "args": {
-                        "_max_results": 100000000,
-                        "_return_fields": "assigned_to,id,name,comment,contact,department,description,reserved,status,extattrs",
-                    },
-                }
-            ]
-        )
-        response = self._request("POST", url_path, data=payload)
-        logger.info(response.json()[0])
-        return response.json()[0]
+        return [vlan for page in self.iter_vlans() for vlan in page]
+
+    def iter_vlans(self):
+        """Iterate over all VLANs from Infoblox page by page.
+
+        Yields:
+            list: Page of VLAN dicts in the same format as returned by `get_vlans`.
+        """
+        url_path = "vlan"
+        params = {
+            "_return_fields": self.return_fields["vlan"],
+        }
+        yield from self._get_pages(url_path, params=params)
 
     def create_vlan(self, vlan_id, vlan_name, vlan_view):
         """Create a VLAN in Infoblox.
@@ -1167,8 +1492,7 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
         params = {}
         payload = {"parent": parent, "id": vlan_id, "name": vlan_name}
         response = self._request("POST", url_path, params=params, json=payload)
-        logger.info(response.json())
-        return response.json()
+        return self._json(response)
 
     @staticmethod
     def get_ipaddr_status(ip_record: dict) -> str:
@@ -1177,6 +1501,22 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
             return "DHCP"
         return "Active"
 
+    @staticmethod
+    def get_ipaddr_ref(ip_record: dict) -> str:
+        """Return the _ref of the host record or fixed address holding an IP address, None if there is none.
+
+        Args:
+            ip_record (dict): `ipv4address` record including its `objects`.
+
+        Returns:
+            str: _ref of the object to update when updating the IP address.
+        """
+        for object_type in ["record:host", "fixedaddress"]:
+            for ref in ip_record.get("objects") or []:
+                if ref.startswith(f"{object_type}/"):
+                    return ref
+        return None
+
     def _find_resource(self, resource, **params):
         """Find the resource for given parameters.
 
@@ -1187,17 +1527,18 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
             _ref: fixedaddress/ZG5zLmZpeGVkX2FkZHJlc3MkMTAuMjIwLjAuMy4wLi4:10.220.0.3/default
         """
         response = self._request("GET", resource, params=params)
-        logger.info(response.json())
-        for _resource in response.json():
+        resources = self._json(response)
+        for _resource in resources:
             return _resource.get("_ref")
-        return response.json()
+        return resources
 
     # TODO: See if we should accept params dictionary and extended to both host record and fixed address
-    def update_ipaddress(self, ip_address, **data):  # pylint: disable=inconsistent-return-statements
+    def update_ipaddress(self, ip_address, ref=None, **data):  # pylint: disable=inconsistent-return-statements
         """Update a Network object with a given prefix.
 
         Args:
             prefix (str): Valid IP prefix
+            ref (str): _ref of the host record or fixed address holding the IP address, searched for if not passed.
             data (dict): keyword args used to update the object e.g. comment="updateme"
 
         Returns:
@@ -1209,7 +1550,7 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
             "ipv4addr": "10.220.0.3"
         }
         """
-        resource = self._find_resource("search", address=ip_address)
+        resource = ref or self._find_resource("search", address=ip_address)
         if not resource:
             return
         # params = {"_return_fields": "ipv4addr", "_return_as_object": 1}
@@ -1221,8 +1562,98 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
             logger.info("Resource: %s", resource)
             logger.info("Could not update IP address: %s", err.response.text)
             return
-        logger.info("Infoblox IP Address updated: %s", response.json())
-        return response.json()
+        result = self._json(response)
+        logger.info("Infoblox IP Address updated: %s", result)
+        return result
+
+    def network_request(self, method, prefix, comment=None, network_type="network"):
+        """Build a multi-object request item to create, update or delete a network or network container.
+
+        Args:
+            method (str): `POST` to create, `PUT` to update or `DELETE` to delete the object.
+            prefix (str): IPv4 prefix of the object.
+            comment (str): Comment of the object when creating or updating it.
+            network_type (str): WAPI object type, `network` or `networkcontainer`.
+
+        Returns:
+            (dict) request item for `multi_request` or None if the object to update or delete was not found.
+
+        Return Response:
+            {"method": "PUT", "object": "network/ZG5zLm5ldHdvcmskMTkyLjAuMi4wLzI0LzA:192.0.2.0/24/default",
+             "data": {"network": "192.0.2.0/24", "comment": "updated"}}
+        """
+        if method == "POST":
+            return {"method": method, "object": network_type, "data": {"network": prefix, "comment": comment}}
+        if network_type == "networkcontainer":
+            resource = self._get_network_container_ref(prefix)
+        else:
+            resource = self._get_network_ref(prefix)
+        if not resource:
+            return None
+        if method == "DELETE":
+            return {"method": method, "object": resource}
+        return {"method": method, "object": resource, "data": {"network": prefix, "comment": comment}}
+
+    @staticmethod
+    def host_record_request(fqdn, ip_address):
+        """Build a multi-object request item to create a host record, see `create_host_record`.
+
+        Args:
+            fqdn (str): FQDN of the host record.
+            ip_address (str): IPv4 address of the host record.
+
+        Returns:
+            (dict) request item for `multi_request`.
+        """
+        return {
+            "method": "POST",
+            "object": "record:host",
+            "data": {"name": fqdn, "configure_for_dns": False, "ipv4addrs": [{"ipv4addr": ip_address}]},
+        }
+
+    def ipaddress_request(self, ip_address, data, ref=None):
+        """Build a multi-object request item to update the object holding an IP address, see `update_ipaddress`.
+
+        Args:
+            ip_address (str): IPv4 address to update.
+            data (dict): Fields to update, e.g. {"comment": "updateme"}
+            ref (str): _ref of the host record or fixed address holding the IP address, searched for if not passed.
+
+        Returns:
+            (dict) request item for `multi_request` or None if no object holds the IP address.
+        """
+        resource = ref or self._find_resource("search", address=ip_address)
+        if not resource:
+            return None
+        return {"method": "PUT", "object": resource, "data": data}
+
+    def multi_request(self, items):
+        """Send several create, update or delete operations in a single WAPI multi-object request.
+
+        Infoblox processes the items in order within a single transaction, so either all of them are applied or the
+        whole request fails. Network and network container _refs created or deleted are kept in the _ref index.
+
+        Args:
+            items (list): Request items as built by `network_request`, `host_record_request` or `ipaddress_request`.
+
+        Returns:
+            list: Result of each item in order, the _ref of the object created, updated or deleted.
+
+        Return Response:
+            ["network/ZG5zLm5ldHdvcmskMTkyLjAuMi4wLzI0LzA:192.0.2.0/24/default"]
+        """
+        response = self._request("POST", "request", json=items)
+        results = self._json(response)
+        for item, result in zip(items, results):
+            object_type = item["object"].split("/", 1)[0]
+            if object_type not in self._refs or not isinstance(result, str):
+                continue
+            if item["method"] == "POST":
+                self._refs[object_type][item["data"]["network"]] = result
+            elif item["method"] == "DELETE":
+                for prefix in [prefix for prefix, ref in self._refs[object_type].items() if ref == result]:
+                    del self._refs[object_type][prefix]
+        return results
 
     def get_network_containers(self):
         """Get all Network Containers.
@@ -1242,16 +1673,18 @@ class InfobloxApi:  # pylint: disable=too-many-public-methods,  too-many-instanc
             }
         ]
         """
+        return [container for page in self.iter_network_containers() for container in page]
+
+    def iter_network_containers(self):
+        """Iterate over all Network Containers page by page.
+
+        Yields:
+            list: Page of record dicts in the same format as returned by `get_network_containers`.
+        """
         url_path = "networkcontainer"
-        params = {
-            "_return_as_object": 1,
-            "_return_fields": "network,comment,network_view,extattrs,rir_organization,rir",
-            "_max_results": 100000,
-        }
-        response = self._request("GET", url_path, params=params)
-        response = response.json()
-        logger.info(response)
-        results = response.get("result", [])
-        for res in results:
-            res.update({"status": "container"})
-        return results
+        params = {"_return_fields": self.return_fields["networkcontainer"]}
+        for page in self._get_pages(url_path, params=params):
+            self._index_refs("networkcontainer", page)
+            for res in page:
+                res.update({"status": "container"})
+            yield page
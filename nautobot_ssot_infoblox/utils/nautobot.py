@@ -1,6 +1,45 @@
 """Utility functions for working with Nautobot."""
-from nautobot.extras.models import Relationship
-from nautobot.ipam.models import Prefix
+import json
+from collections import defaultdict
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+from django.db.models import F, Func, JSONField, Value, prefetch_related_objects
+from django.utils.text import slugify
+from nautobot.dcim.models import Site
+from nautobot.extras.choices import CustomFieldTypeChoices
+from nautobot.extras.constants import CHANGELOG_MAX_CHANGE_CONTEXT_DETAIL, CHANGELOG_MAX_OBJECT_REPR
+from nautobot.extras.models import CustomField, ObjectChange, Relationship, Status, Tag, TaggedItem
+from nautobot.extras.signals import change_context_state
+from nautobot.ipam.models import Prefix, Role, VLAN, VRF
+from nautobot.tenancy.models import Tenant
+from nautobot.utilities.api import get_serializer_for_model
+from nautobot.utilities.utils import is_taggable, serialize_object
+
+BULK_CHUNK_SIZE = 1000
+
+
+class MergeJSON(Func):  # pylint: disable=abstract-method
+    """Merge a dict into the top level keys of a JSON field in the database."""
+
+    arg_joiner = " || "
+    template = "(%(expressions)s::jsonb)"
+    output_field = JSONField()
+
+    def __init__(self, field: str, data: dict):
+        """Initialize MergeJSON."""
+        super().__init__(F(field), Value(json.dumps(data)))
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        """Merge with JSON_MERGE_PATCH on MySQL."""
+        return super().as_sql(
+            compiler,
+            connection,
+            function="JSON_MERGE_PATCH",
+            template="%(function)s(%(expressions)s)",
+            arg_joiner=", ",
+            **extra_context,
+        )
 
 
 def build_vlan_map_from_relations(vlans: list):
@@ -33,3 +72,297 @@ def get_prefix_vlans(prefix: Prefix) -> list:
         vlan_list = [x.destination for x in pf_relations["source"][pf_vlan_relationship]]
         vlan_list.sort(key=lambda x: x.vid)
     return vlan_list
+
+
+def get_prefix_vlan_map() -> dict:
+    """Get the VLANs with a RelationshipAssociation to every Prefix in a single query.
+
+    Returns:
+        dict: Map of Prefix ID to the list of VLAN objects with a RelationshipAssociation to it, sorted by VLAN ID,
+            with their VLAN Group loaded.
+    """
+    vlans = (
+        VLAN.objects.filter(destination_for_associations__relationship__name="Prefix -> VLAN")
+        .select_related("group")
+        .annotate(prefix_id=F("destination_for_associations__source_id"))
+        .order_by("vid")
+    )
+    prefix_vlans = defaultdict(list)
+    for vlan in vlans:
+        prefix_vlans[vlan.prefix_id].append(vlan)
+    return prefix_vlans
+
+
+def chunked(items: list, size: int = BULK_CHUNK_SIZE):
+    """Yield successive chunks of at most `size` items from a list."""
+    for start in range(0, len(items), size):
+        end = start + size
+        yield items[start:end]
+
+
+def write_with_savepoints(write, objects: list) -> list:
+    """Write objects with one call in a savepoint, retrying them one at a time in savepoints if it fails.
+
+    A failing object only rolls back its own savepoint, so the others are written in the enclosing transaction.
+
+    Args:
+        write (callable): Called with a list of objects to write them, e.g. `Prefix.objects.bulk_create`.
+        objects (list): Objects to write.
+
+    Returns:
+        list: `(object, error)` of the objects that could not be written.
+    """
+    try:
+        with transaction.atomic():
+            write(objects)
+        return []
+    except DatabaseError:
+        failed = []
+        for obj in objects:
+            try:
+                with transaction.atomic():
+                    write([obj])
+            except DatabaseError as err:
+                failed.append((obj, err))
+        return failed
+
+
+def set_related_objects(instances: list, names: list):
+    """Fetch the objects related by foreign keys with one query per field, instead of one per object accessing them.
+
+    Related objects already fetched, e.g. with `select_related`, are kept.
+
+    Args:
+        instances (list): Objects of a single model, e.g. updated ones whose foreign keys changed.
+        names (list): Names of the fields to fetch the related objects of, other fields are ignored.
+    """
+    if not instances:
+        return
+    for name in names:
+        field = instances[0]._meta.get_field(name)
+        if not field.many_to_one or not field.concrete:
+            continue
+        missing = [instance for instance in instances if not field.is_cached(instance)]
+        pks = {getattr(instance, field.attname) for instance in missing} - {None}
+        if not pks:
+            continue
+        related = field.related_model.objects.in_bulk(pks)
+        for instance in missing:
+            related_object = related.get(getattr(instance, field.attname))
+            if related_object is not None:
+                setattr(instance, name, related_object)
+
+
+def bulk_record_changes(instances: list, action: str, prefetch: list = ()) -> int:
+    """Record the ObjectChanges of objects written in bulk, as Nautobot does for each object saved.
+
+    The ObjectChanges hold the same data as built by `to_objectchange()`, but a single API serializer is used for all
+    objects so its Custom Fields are fetched once, and the related objects and Tags not fetched yet are fetched with a
+    query each for all objects. As when saving objects, nothing is recorded for models not change logged, e.g.
+    RelationshipAssociation, or outside of a change context, e.g. when not run by a Job.
+
+    Args:
+        instances (list): Objects of a single model written.
+        action (str): ObjectChangeActionChoices of the write, e.g. `ObjectChangeActionChoices.ACTION_UPDATE`.
+        prefetch (list): Other relations read by the API serializer of the model, e.g. `nat_outside_list`.
+
+    Returns:
+        int: Number of ObjectChanges recorded.
+    """
+    context = change_context_state.get()
+    if context is None or not instances or not hasattr(instances[0], "to_objectchange"):
+        return 0
+    set_related_objects(instances, [field.name for field in instances[0]._meta.concrete_fields])
+    prefetch_related_objects(instances, *(["tags"] if is_taggable(instances[0]) else []), *prefetch)
+    user = context.get_user()
+    serializer = get_serializer_for_model(type(instances[0]))(context={"request": None})
+    changes = []
+    for instance in instances:
+        change = ObjectChange(
+            changed_object=instance,
+            object_repr=str(instance)[:CHANGELOG_MAX_OBJECT_REPR],
+            action=action,
+            object_data=serialize_object(instance),
+            object_data_v2=serializer.to_representation(instance),
+            # IP Addresses are annotated with the object they are assigned to, as by `IPAddress.to_objectchange()`.
+            related_object=getattr(instance, "assigned_object", None),
+            user=user if user.is_authenticated else None,
+            user_name=user.username if user.is_authenticated else "Undefined",
+            request_id=context.change_id,
+            change_context=context.context,
+            change_context_detail=context.context_detail[:CHANGELOG_MAX_CHANGE_CONTEXT_DETAIL],
+        )
+        changes.append(change)
+    ObjectChange.objects.bulk_create(changes, batch_size=BULK_CHUNK_SIZE)
+    return len(changes)
+
+
+def bulk_add_tag(model, pks: list, tag: Tag, chunk_size: int = BULK_CHUNK_SIZE) -> int:
+    """Apply a Tag to objects of a model with one insert per chunk, skipping objects already tagged or missing.
+
+    Args:
+        model (Model): Model of the objects to tag.
+        pks (list): Primary keys of the objects to tag.
+        tag (Tag): Tag to apply.
+        chunk_size (int): Number of objects handled per query.
+
+    Returns:
+        int: Number of objects tagged.
+    """
+    content_type = ContentType.objects.get_for_model(model)
+    tagged = 0
+    for chunk in chunked(list(pks), chunk_size):
+        existing = set(model.objects.filter(pk__in=chunk).values_list("pk", flat=True))
+        existing -= set(
+            TaggedItem.objects.filter(content_type=content_type, tag=tag, object_id__in=existing).values_list(
+                "object_id", flat=True
+            )
+        )
+        TaggedItem.objects.bulk_create(
+            [TaggedItem(content_type=content_type, object_id=pk, tag=tag) for pk in existing], ignore_conflicts=True
+        )
+        tagged += len(existing)
+    return tagged
+
+
+def bulk_set_custom_field(model, pks: list, name: str, value, chunk_size: int = BULK_CHUNK_SIZE) -> int:
+    """Set a Custom Field of objects of a model with one UPDATE per chunk, skipping objects already set to the value.
+
+    Objects are updated in the database only, neither their `last_updated` time nor the change log are touched.
+
+    Args:
+        model (Model): Model of the objects to update.
+        pks (list): Primary keys of the objects to update.
+        name (str): Name of the Custom Field.
+        value (object): JSON serializable value to set.
+        chunk_size (int): Number of objects handled per query.
+
+    Returns:
+        int: Number of objects updated.
+    """
+    updated = 0
+    for chunk in chunked(list(pks), chunk_size):
+        updated += (
+            model.objects.filter(pk__in=chunk)
+            .exclude(_custom_field_data__contains={name: value})
+            .update(_custom_field_data=MergeJSON("_custom_field_data", {name: value}))
+        )
+    return updated
+
+
+class CustomFieldRegistry:
+    """Custom Fields and the content types they apply to, loaded once per sync.
+
+    Extensibility Attributes are stored as text Custom Fields named after the attribute. `ensure` creates the fields
+    missing for a model in bulk the first time they are seen, so processing further objects needs no queries.
+    """
+
+    def __init__(self):
+        """Initialize CustomFieldRegistry, Custom Fields are loaded on first use."""
+        self._fields = None
+        self._content_types = defaultdict(set)
+
+    def load(self):
+        """Load every Custom Field and the IDs of the content types it applies to."""
+        self._fields = {field.name: field for field in CustomField.objects.all()}
+        self._content_types.clear()
+        through = CustomField.content_types.through
+        for field_id, content_type_id in through.objects.values_list("customfield_id", "contenttype_id"):
+            self._content_types[field_id].add(content_type_id)
+
+    def ensure(self, names: list, model) -> set:
+        """Ensure text Custom Fields exist with the given names and apply to a model.
+
+        Args:
+            names (list): Names of the Custom Fields.
+            model (Model): Model the Custom Fields must apply to.
+
+        Returns:
+            set: Names of the Custom Fields applying to the model, a field conflicting with an existing slug is left out.
+        """
+        if self._fields is None:
+            self.load()
+        missing = [name for name in dict.fromkeys(names) if name not in self._fields]
+        if missing:
+            CustomField.objects.bulk_create(
+                [
+                    CustomField(name=name, slug=slugify(name), type=CustomFieldTypeChoices.TYPE_TEXT, label=name)
+                    for name in missing
+                ],
+                ignore_conflicts=True,
+            )
+            # Fields created concurrently or conflicting are not created, fetch what is actually stored.
+            self._fields.update({field.name: field for field in CustomField.objects.filter(name__in=missing)})
+        content_type = ContentType.objects.get_for_model(model)
+        fields = [self._fields[name] for name in names if name in self._fields]
+        for field in fields:
+            if content_type.id not in self._content_types[field.id]:
+                # Linked one field at a time so Nautobot provisions the default value on the existing objects.
+                field.content_types.add(content_type)
+                self._content_types[field.id].add(content_type.id)
+        return {field.name for field in fields}
+
+    def clean(self, instance, names: list):
+        """Validate the Custom Field data of an object like Nautobot's CustomFieldModel, without querying the fields.
+
+        Args:
+            instance (Model): Object whose Custom Field data changed.
+            names (list): Names of the Custom Fields whose value changed, the other values were validated when saved.
+
+        Raises:
+            ValidationError: A value is invalid or a required value is missing.
+        """
+        if self._fields is None:
+            self.load()
+        content_type_id = ContentType.objects.get_for_model(instance).id
+        fields = [field for field in self._fields.values() if content_type_id in self._content_types[field.id]]
+        data = instance.custom_field_data
+        for field in fields:
+            if field.name in names and field.name in data:
+                try:
+                    field.validate(data[field.name])
+                except ValidationError as err:
+                    raise ValidationError(f"Invalid value for custom field '{field.name}': {err.message}") from err
+            elif field.name not in data:
+                if field.default is not None:
+                    data[field.name] = field.default
+                elif field.required:
+                    raise ValidationError(f"Missing required custom field '{field.name}'.")
+
+
+class LookupCache:
+    """Name to ID maps of the Nautobot objects a sync looks up, owned by one adapter and released after its sync.
+
+    The maps of related objects are loaded with a `values_list` query each. The maps of synced objects are filled as
+    they are loaded or created. Maps are cleared and refilled in place, so references held by an adapter stay valid.
+    """
+
+    lookups = {
+        "relationship_map": (Relationship, "name"),
+        "status_map": (Status, "slug"),
+        "site_map": (Site, "name"),
+        "tenant_map": (Tenant, "name"),
+        "role_map": (Role, "name"),
+        "vrf_map": (VRF, "name"),
+    }
+    synced = ("prefix_map", "ipaddr_map", "vlangroup_map", "vlan_map")
+
+    def __init__(self):
+        """Initialize LookupCache with empty maps."""
+        self.maps = {name: {} for name in [*self.lookups, *self.synced]}
+
+    def load(self, names: list = None):
+        """Load the maps of related objects.
+
+        Args:
+            names (list, optional): Names of the maps to load, e.g. `["tenant_map"]`. Defaults to every map.
+        """
+        for name in names or self.lookups:
+            model, field = self.lookups[name]
+            self.maps[name].clear()
+            self.maps[name].update(model.objects.values_list(field, "id"))
+
+    def clear(self):
+        """Empty every map, releasing their memory once the sync is done."""
+        for lookup in self.maps.values():
+            lookup.clear()
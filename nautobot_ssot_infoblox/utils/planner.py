@@ -0,0 +1,170 @@
+"""Batch planning for IPv4 address queries sent to the Infoblox multi-object request endpoint."""
+import ipaddress
+import math
+import threading
+
+
+class PlannedQuery:  # pylint: disable=too-few-public-methods
+    """Single `ipv4address` query for one prefix within a planned batch.
+
+    Attributes:
+        prefix (str): Network prefix to query IP addresses for - '10.220.0.0/22'
+        view (str): Network View of the prefix.
+        num_addresses (int): Number of addresses in the prefix, used as the server-side result limit.
+        expected (int): Expected number of used IP addresses returned for the prefix.
+    """
+
+    def __init__(self, prefix: str, view: str, num_addresses: int, expected: int):
+        """Initialize PlannedQuery."""
+        self.prefix = prefix
+        self.view = view
+        self.num_addresses = num_addresses
+        self.expected = expected
+
+    @property
+    def key(self) -> str:
+        """Return the key used to remember the observed result count of this prefix between runs."""
+        return f"{self.view}|{self.prefix}"
+
+
+class BatchTarget:
+    """Number of IP addresses targeted per batch, adjusted within bounds derived from its initial value.
+
+    Attributes:
+        results (int): Number of IP addresses expected per batch.
+        minimum (int): Lowest `results` is halved down to, a tenth of its initial value.
+        maximum (int): Highest `results` is doubled up to, ten times its initial value.
+        latency (float): Number of seconds a single batch is expected to take at most.
+        max_queries (int): Maximum number of prefixes queried in a single batch.
+    """
+
+    def __init__(self, results: int, latency: float, max_queries: int):
+        """Initialize BatchTarget."""
+        self.results = results
+        self.minimum = max(results // 10, 1)
+        self.maximum = results * 10
+        self.latency = latency
+        self.max_queries = max_queries
+
+    def shrink(self):
+        """Halve the number of IP addresses targeted per batch."""
+        self.results = max(self.results // 2, self.minimum)
+
+    def grow(self):
+        """Double the number of IP addresses targeted per batch."""
+        self.results = min(self.results * 2, self.maximum)
+
+
+class IPv4BatchPlanner:
+    """Group prefixes into `request` batches by the number of IP addresses each prefix is expected to return.
+
+    The expected size of a prefix is, in order of preference, the number of used addresses observed for it on a
+    previous run, its network utilization as reported by Infoblox, or its total number of addresses. Batches are
+    generated lazily and the target batch size is halved when a batch is slower than `target_latency` or returns far
+    more results than planned, and doubled again while batches are fast, so later batches are split or merged based
+    on how the grid master responds.
+    """
+
+    def __init__(
+        self,
+        target_results: int = 1000,
+        target_latency: float = 5.0,
+        max_queries: int = 100,
+        history: dict = None,
+        utilization: dict = None,
+    ):  # pylint: disable=too-many-arguments
+        """Initialize IPv4BatchPlanner.
+
+        Args:
+            target_results (int): Initial number of IP addresses expected per batch.
+            target_latency (float): Number of seconds a single batch is expected to take at most.
+            max_queries (int): Maximum number of prefixes queried in a single batch.
+            history (dict): Used IP address counts observed on a previous run, keyed by `PlannedQuery.key`.
+            utilization (dict): Network utilization percentage reported by Infoblox, keyed by `PlannedQuery.key`.
+        """
+        self.target = BatchTarget(results=target_results, latency=target_latency, max_queries=max_queries)
+        self.history = history or {}
+        self.utilization = utilization or {}
+        self.observed = {}
+        self.stats = []
+        self._lock = threading.Lock()
+
+    def expected_results(self, key: str, num_addresses: int) -> int:
+        """Return the number of IP addresses a prefix is expected to return.
+
+        Args:
+            key (str): Key of the prefix, see `PlannedQuery.key`.
+            num_addresses (int): Number of addresses in the prefix.
+
+        Returns:
+            int: Expected number of used IP addresses, at least 1 and at most `num_addresses`.
+        """
+        if key in self.history:
+            expected = self.history[key]
+        elif self.utilization.get(key) is not None:
+            expected = math.ceil(num_addresses * self.utilization[key] / 100)
+        else:
+            expected = num_addresses
+        return min(max(expected, 1), num_addresses)
+
+    def batches(self, prefixes: list):
+        """Generate batches of queries for the passed prefixes, in prefix order.
+
+        Args:
+            prefixes (List[tuple]): List of Network prefixes and associated network view - ('10.220.0.0/22', 'default')
+
+        Yields:
+            list: List of `PlannedQuery` to send in a single request.
+        """
+        batch, expected = [], 0
+        for prefix, view in prefixes:
+            num_addresses = ipaddress.ip_network(prefix).num_addresses
+            query = PlannedQuery(prefix=prefix, view=view, num_addresses=num_addresses, expected=0)
+            query.expected = self.expected_results(key=query.key, num_addresses=num_addresses)
+            if batch and (expected + query.expected > self.target.results or len(batch) >= self.target.max_queries):
+                yield batch
+                batch, expected = [], 0
+            batch.append(query)
+            expected += query.expected
+        if batch:
+            yield batch
+
+    def record(self, batch: list, results: list, elapsed: float, error: bool = False):
+        """Record the outcome of a batch and adjust the target size of the following batches.
+
+        Args:
+            batch (list): List of `PlannedQuery` that were sent.
+            results (list): List of IP address lists returned, one per query.
+            elapsed (float): Number of seconds the request took.
+            error (bool): Whether the request failed.
+        """
+        returned = 0
+        with self._lock:
+            for query, addrs in zip(batch, results):
+                self.observed[query.key] = len(addrs)
+                returned += len(addrs)
+            expected = sum(query.expected for query in batch)
+            self.stats.append(
+                {
+                    "queries": len(batch),
+                    "expected": expected,
+                    "returned": returned,
+                    "elapsed": round(elapsed, 3),
+                    "target": self.target.results,
+                    "error": error,
+                }
+            )
+            if error or elapsed > self.target.latency or returned > 2 * max(expected, self.target.results):
+                self.target.shrink()
+            elif elapsed < self.target.latency / 4 and returned <= self.target.results:
+                self.target.grow()
+
+    def summary(self) -> dict:
+        """Return totals over all recorded batches."""
+        return {
+            "batches": len(self.stats),
+            "queries": sum(stat["queries"] for stat in self.stats),
+            "returned": sum(stat["returned"] for stat in self.stats),
+            "elapsed": round(sum(stat["elapsed"] for stat in self.stats), 3),
+            "errors": sum(1 for stat in self.stats if stat["error"]),
+        }
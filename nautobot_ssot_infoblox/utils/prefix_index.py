@@ -0,0 +1,53 @@
+"""In-memory longest-prefix-match index used to find the parent prefix of IP addresses."""
+import ipaddress
+
+
+class PrefixIndex:
+    """Index of networks by prefix length, resolving the most specific network containing an address.
+
+    Networks are kept in one dict per IP version and prefix length, keyed by their network address as an integer. A
+    lookup masks the address to every indexed prefix length, longest first, so it costs at most one dict lookup per
+    prefix length in use. Matches the parents of `Prefix.objects.net_contains()`, a network of the same length as an
+    address, i.e. a /32 for an IPv4 host, does not contain it.
+    """
+
+    def __init__(self):
+        """Initialize PrefixIndex."""
+        self._networks = {4: {}, 6: {}}
+        self._lengths = {4: [], 6: []}
+
+    def __len__(self):
+        """Return the number of networks indexed."""
+        return sum(len(networks) for version in self._networks.values() for networks in version.values())
+
+    def add(self, network: str, value):
+        """Index a network, replacing the value of an already indexed identical network.
+
+        Args:
+            network (str): Network to index - '10.0.0.0/24'
+            value (object): Value returned by `longest_match` for addresses within the network.
+        """
+        network = ipaddress.ip_network(network, strict=False)
+        lengths = self._networks[network.version]
+        if network.prefixlen not in lengths:
+            lengths[network.prefixlen] = {}
+            self._lengths[network.version] = sorted(lengths, reverse=True)
+        lengths[network.prefixlen][int(network.network_address)] = value
+
+    def longest_match(self, address: str):
+        """Return the value of the most specific network containing an address, None if there is none.
+
+        Args:
+            address (str): IP address without prefix length - '10.0.0.1'
+        """
+        address = ipaddress.ip_address(address)
+        max_length = address.max_prefixlen
+        networks = self._networks[address.version]
+        for length in self._lengths[address.version]:
+            if length >= max_length:
+                continue
+            mask = ((1 << length) - 1) << (max_length - length)
+            value = networks[length].get(int(address) & mask)
+            if value is not None:
+                return value
+        return None
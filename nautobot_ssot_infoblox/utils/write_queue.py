@@ -0,0 +1,81 @@
+"""Queue of write operations sent to Infoblox through the multi-object request endpoint."""
+from requests.exceptions import HTTPError
+
+
+class QueuedWrite:  # pylint: disable=too-few-public-methods
+    """Single create, update or delete operation waiting to be sent to Infoblox.
+
+    Attributes:
+        item (dict): Request item as built by the `InfobloxApi` request helpers.
+        label (str): Description of the operation used when logging a failure - 'create 10.0.0.0/24'
+    """
+
+    def __init__(self, item: dict, label: str):
+        """Initialize QueuedWrite."""
+        self.item = item
+        self.label = label
+
+
+class WriteQueue:
+    """Collect the writes made by DiffSync models and send them to Infoblox in batches.
+
+    Operations are sent in order as WAPI `request` multi-object calls of up to `batch_size` items, either once the
+    queue is full or when `flush` is called at the end of the sync. Infoblox applies a multi-object request as a
+    single transaction, so when a batch fails its operations are resent one at a time and each failure is logged
+    against the object it belongs to.
+    """
+
+    def __init__(self, conn, job, batch_size: int = 100):
+        """Initialize WriteQueue.
+
+        Args:
+            conn (InfobloxApi): Client used to send the requests.
+            job (object): Job to log failures to.
+            batch_size (int): Maximum number of operations sent in a single request.
+        """
+        self.conn = conn
+        self.job = job
+        self.batch_size = max(int(batch_size), 1)
+        self.pending = []
+        self.stats = {"requests": 0, "operations": 0, "failed": 0}
+
+    def add(self, item: dict, label: str):
+        """Queue an operation, sending the queued batch once it reaches `batch_size`.
+
+        Args:
+            item (dict): Request item, None if the object to update or delete could not be found in Infoblox.
+            label (str): Description of the operation - 'update 10.0.0.0/24'
+        """
+        if item is None:
+            self.stats["failed"] += 1
+            self.job.log_warning(message=f"Failed to {label} as it was not found in Infoblox.")
+            return
+        self.pending.append(QueuedWrite(item=item, label=label))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Send all queued operations."""
+        batch, self.pending = self.pending, []
+        if not batch:
+            return
+        if not self._send(batch) and len(batch) > 1:
+            for write in batch:
+                self._send([write])
+
+    def _send(self, batch: list) -> bool:
+        """Send a batch of operations in a single request, logging a failure of a single operation.
+
+        Returns:
+            bool: Whether the request succeeded.
+        """
+        self.stats["requests"] += 1
+        try:
+            self.conn.multi_request([write.item for write in batch])
+        except HTTPError as err:
+            if len(batch) == 1:
+                self.stats["failed"] += 1
+                self.job.log_warning(message=f"Failed to {batch[0].label} due to {err.response.text}")
+            return False
+        self.stats["operations"] += len(batch)
+        return True
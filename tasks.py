@@ -357,6 +357,21 @@ def unittest(context, keepdb=False, label="nautobot_ssot_infoblox", failfast=Fal
     run_command(context, command)
 
 
+@task(
+    help={
+        "keepdb": "save and re-use test database between benchmark runs.",
+        "label": "specify a benchmark module, class or method to run instead of all benchmarks",
+    }
+)
+def benchmark(context, keepdb=False, label="nautobot_ssot_infoblox.tests.benchmarks"):
+    """Run the performance benchmarks, results are written as JSON files to the benchmark-results directory."""
+    command = f"nautobot-server test {label} --pattern 'bench_*.py'"
+
+    if keepdb:
+        command += " --keepdb"
+    run_command(context, command)
+
+
 @task
 def unittest_coverage(context):
     """Report on code test coverage as measured by 'invoke unittest'."""